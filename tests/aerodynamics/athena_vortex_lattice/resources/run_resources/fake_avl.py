@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+stand in for the avl executable, shows the avl prompts and answers the result
+commands with the files in this folder so the process handling can be tested
+without avl
+"""
+import os
+import sys
+
+this_directory = os.path.dirname(os.path.abspath(__file__))
+
+prompts = {'top': ' AVL   c>  ',
+           'oper': ' OPER (AVL)c>  ',
+           'c1': ' Enter parameter, value  (or  # - + N )      c>  ',
+           'file': ' Enter filename, or <return> for screen output   s>  '}
+
+
+def result(command):
+    file_name = os.path.join(this_directory, f'{command}.txt')
+    if not os.path.exists(file_name):
+        return f' {command} output\n'
+    with open(file_name) as open_file:
+        return open_file.read()
+
+
+menu = 'top'
+# result command waiting for a file name
+pending = None
+sys.stdout.write(' Athena Vortex Lattice\n\n' + prompts[menu])
+sys.stdout.flush()
+
+for line in sys.stdin:
+    command, _, argument = line.strip().partition(' ')
+    command = command.lower()
+
+    if menu == 'top':
+        if command in ('load', 'case', 'mass') and not os.path.exists(argument):
+            sys.stdout.write(f'\n ** File OPEN error on {argument}\n')
+        elif command == 'oper':
+            menu = 'oper'
+        elif command == 'quit':
+            break
+    elif menu == 'oper':
+        if command == 'c1':
+            menu = 'c1'
+        elif command == '':
+            menu = 'top'
+        elif command == 'x':
+            sys.stdout.write('\n Converged\n')
+        elif argument:
+            with open(argument, 'w') as open_file:
+                open_file.write(result(command))
+        else:
+            pending = command
+            menu = 'file'
+    elif menu == 'file':
+        file_name = line.strip()
+        if file_name:
+            with open(file_name, 'w') as open_file:
+                open_file.write(result(pending))
+        else:
+            sys.stdout.write(result(pending))
+        menu = 'oper'
+    elif menu == 'c1' and command == '':
+        menu = 'oper'
+
+    sys.stdout.write('\n' + prompts[menu])
+    sys.stdout.flush()
@@ -0,0 +1,90 @@
+from os.path import dirname, abspath
+from pathlib import Path
+import sys
+import unittest
+import shutil
+
+this_directory = Path(dirname(abspath(__file__)))
+sys.path.append(str(this_directory) + '/../../../')  # so uggo thanks to atom runner
+from uav_design_system.aerodynamics.athena_vortex_lattice import (AVLRunner,
+                                                                  AVLCache,
+                                                                  AVLResults)
+
+
+resources_folder = this_directory / 'resources' / 'run_resources'
+fake_avl = str(resources_folder / 'fake_avl.py')
+
+
+class CountingRunner(AVLRunner):
+
+    runs = 0
+
+    def __init__(self):
+        super().__init__(fake_avl, timeout = 5)
+        CountingRunner.runs += 1
+
+
+class TestAVLCache(unittest.TestCase):
+
+    def setUp(self):
+        CountingRunner.runs = 0
+        self.directory = this_directory / 'avl_cache'
+        self.input_files = [str(resources_folder / 'allegro.avl'),
+                            str(resources_folder / 'allegro.mass'),
+                            str(resources_folder / 'bd2.run')]
+
+    def tearDown(self):
+        if self.directory.exists():
+            shutil.rmtree(str(self.directory))
+
+    def write_variant(self, content_change):
+        """
+        copy of the avl file with its content changed
+        """
+        self.directory.mkdir(exist_ok = True)
+        with open(self.input_files[0]) as open_file:
+            content = open_file.read()
+        file_path = self.directory / 'variant.avl'
+        with open(file_path, 'w') as open_file:
+            open_file.write(content_change(content))
+        return str(file_path)
+
+    def test_run_once(self):
+        cache = AVLCache()
+        first = cache(CountingRunner, *self.input_files)
+        second = cache(CountingRunner, *self.input_files)
+        self.assertEqual(CountingRunner.runs, 1)
+        self.assertIsInstance(second, AVLResults)
+        self.assertEqual(second.alpha, first.alpha)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_key_ignores_title_and_comments(self):
+        cache = AVLCache()
+        variant = self.write_variant(lambda content: 'renamed\n# comment\n' +
+                                     content.split('\n', 1)[1])
+        self.assertEqual(cache.key(*self.input_files),
+                         cache.key(variant, *self.input_files[1:]))
+
+    def test_key_geometry(self):
+        cache = AVLCache()
+        variant = self.write_variant(lambda content: content + '\nYDUPLICATE\n0.0')
+        self.assertNotEqual(cache.key(*self.input_files),
+                            cache.key(variant, *self.input_files[1:]))
+
+    def test_memory_evicted(self):
+        cache = AVLCache(max_entries = 1)
+        cache(CountingRunner, *self.input_files)
+        cache.put('other', AVLResults({}))
+        cache(CountingRunner, *self.input_files)
+        self.assertEqual(CountingRunner.runs, 2)
+
+    def test_shared_on_disk(self):
+        AVLCache(directory = self.directory)(CountingRunner, *self.input_files)
+        cache = AVLCache(directory = self.directory)
+        cache(CountingRunner, *self.input_files)
+        self.assertEqual(CountingRunner.runs, 1)
+        self.assertEqual(cache.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
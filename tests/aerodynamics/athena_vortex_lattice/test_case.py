@@ -5,6 +5,7 @@ import sys
 sys.path.append(this_directory + "/../../../")  # so uggo thanks to atom runner
 import unittest
 import uav_design_system.aerodynamics.athena_vortex_lattice as avl
+from uav_design_system import layout
 
 
 def get_resource_content(file_name):
@@ -79,11 +80,48 @@ class TestCase(unittest.TestCase):
         trim_case = avl.TrimCase(1, velocity = 1, mass = 1, gravity = 1, density = 1)
         self.assertEqual(trim_case["cl"], 2)
 
+    def test_cases_independent(self):
+        """
+        test that setting a parameter of one case does not change another
+        """
+        trim_case = avl.TrimCase(1, velocity = 1, mass = 1, gravity = 1, density = 1)
+        avl.TrimCase(1, velocity = 2, mass = 1, gravity = 1, density = 1)
+        self.assertEqual(trim_case["velocity"], 1)
+        self.assertEqual(trim_case["cl"], 2)
+
+    def test_from_arrangement(self):
+        """
+        test the mass properties of an arrangement are set on the case
+        """
+        mass1 = layout.MassObject(layout.Cuboid(1, 2, 3), 1)
+        mass2 = layout.MassObject(layout.Cuboid(1, 2, 3), 1)
+        mass2.location = layout.Point(2, 2, 0)
+        arrangement = layout.Arrangement("arrangement", mass1, mass2)
+
+        trim_case = avl.TrimCase.from_arrangement(1, arrangement, velocity = 1,
+                                                  gravity = 1, density = 1)
+        self.assertEqual(trim_case["mass"], 12)
+        self.assertEqual(trim_case["x cg"], 1.5)
+        self.assertEqual(trim_case["y cg"], 2)
+        self.assertEqual(trim_case["izz"], 29)
+        self.assertEqual(trim_case["ixy"], 12)
+        self.assertEqual(trim_case["cl"], 24)
+
+    def test_from_arrangement_kwargs(self):
+        """
+        test key word arguments override the arrangement's properties
+        """
+        mass = layout.MassObject(layout.Cuboid(1, 2, 3), 1)
+        trim_case = avl.TrimCase.from_arrangement(1, layout.Arrangement("", mass),
+                                                  mass = 2)
+        self.assertEqual(trim_case["mass"], 2)
+        self.assertEqual(trim_case["ixx"], 6.5)
 
     def test_to_file_exists(self):
 
         file_name = join(this_directory, "test_file.txt")
-        trim_case = avl.TrimCase(1)
+        trim_case = avl.TrimCase(1, velocity = 5, density = 1, gravity = 1,
+                                 mass = 1)
         trim_case.to_file(file_name)
         self.assertTrue(exists(file_name))
 
@@ -92,7 +130,8 @@ class TestCase(unittest.TestCase):
     def test_to_file_content(self):
 
         file_name = join(this_directory, "test_file.txt")
-        trim_case = avl.TrimCase(1)
+        trim_case = avl.TrimCase(1, velocity = 5, density = 1, gravity = 1,
+                                 mass = 1)
         trim_case.to_file(file_name)
 
         expected_string = get_resource_content("case_to_file.txt")
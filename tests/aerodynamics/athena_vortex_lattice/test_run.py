@@ -7,7 +7,10 @@ import shutil
 
 this_directory = Path(dirname(abspath(__file__)))
 sys.path.append(str(this_directory) + '/../../../')  # so uggo thanks to atom runner
-from uav_design_system.aerodynamics.athena_vortex_lattice import AVLRunner, AVLResults
+from uav_design_system.aerodynamics.athena_vortex_lattice import (AVLRunner,
+                                                                  AVLResults,
+                                                                  AVLError,
+                                                                  AVLTimeoutError)
 
 
 resources_folder = this_directory / 'resources' / 'run_resources'
@@ -32,6 +35,64 @@ class CustomAssertions():
     def assertPathExists(self, path_object):
         self.assertTrue(path_object.exists())
 
+class TestRunProtocol(unittest.TestCase, CustomAssertions):
+    """
+    tests the command handling against a stand in for avl
+    """
+
+    def setUp(self):
+        self.results_dir = this_directory / 'protocol_results_dir'
+        makedirs(self.results_dir)
+        self.avl_runner = AVLRunner(str(resources_folder / 'fake_avl.py'), timeout = 5)
+
+    def tearDown(self):
+        self.avl_runner.close()
+        shutil.rmtree(str(self.results_dir))
+
+    def setup_analysis(self):
+        self.avl_runner.setup_analysis(str(resources_folder / 'allegro.avl'),
+                                       str(resources_folder / 'allegro.mass'),
+                                       str(resources_folder / 'bd2.run'))
+
+    def test_results(self):
+        self.setup_analysis()
+        results = self.avl_runner.generate_results(str(self.results_dir))
+        self.assertFilesSame(resources_folder / 'ft.txt',
+                             self.results_dir / 'total_forces.txt')
+        self.assertEqual(results._total_forces,
+                         self.read_file(resources_folder / 'ft.txt'))
+
+    def test_results_in_memory(self):
+        self.setup_analysis()
+        results = self.avl_runner.generate_results()
+        self.assertEqual(list(self.results_dir.iterdir()), [])
+        self.assertFalse((Path(self.avl_runner.run_time_directory) / 'total_forces.txt').exists())
+        self.assertIn(self.read_file(resources_folder / 'ft.txt'), results._total_forces)
+        self.assertEqual(results.alpha, 8.23428)
+
+    def test_capture_answers_file_prompt(self):
+        """
+        avl asks for a file name before printing a result to the screen
+        """
+        self.setup_analysis()
+        self.avl_runner._request('OPER', AVLRunner.OPER_PROMPT)
+        content = self.avl_runner._capture_results('ft')
+        self.assertIn(self.read_file(resources_folder / 'ft.txt'), content)
+        self.assertNotIn('Enter filename', content)
+
+    def test_error_text_captured(self):
+        self.setup_analysis()
+        with self.assertRaises(AVLError) as context:
+            self.avl_runner._request('LOAD missing.avl', AVLRunner.TOP_PROMPT)
+        self.assertIn('File OPEN error on missing.avl', context.exception.output)
+
+    def test_timeout(self):
+        self.setup_analysis()
+        with self.assertRaises(AVLTimeoutError):
+            self.avl_runner.timeout = 0.2
+            self.avl_runner._request('OPER', 'never shown')
+
+
 class TestRun(unittest.TestCase, CustomAssertions):
 
     def setUp(self):
@@ -7,6 +7,8 @@ import unittest
 import uav_design_system.aerodynamics.athena_vortex_lattice as avl
 from uav_design_system import aerofoil
 import shutil
+import io
+import tempfile
 
 
 def get_resource_content(file_name):
@@ -167,6 +169,18 @@ class TestSurfaceWrite(unittest.TestCase):
         self.assertEqual(self.surface._to_avl_string().strip(),
                          expected_string.strip())
 
+    def test_aerofoil_files_default(self):
+        """
+        aerofoil files are written with the aerofoil's own defaults unless
+        the surface asks for others
+        """
+        expected = io.StringIO()
+        self.aerofoil.write(expected)
+        with tempfile.TemporaryDirectory() as directory:
+            files = self.surface._write_aerofoil_files(directory)
+            with open(files[0]) as open_file:
+                self.assertEqual(open_file.read(), expected.getvalue())
+
     def test_avl_write_no_duplicate(self):
         """
         tests the avl file is correctl written from the surface class
@@ -0,0 +1,51 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../../")  # so uggo thanks to atom runner
+import unittest
+import numpy as np
+from uav_design_system.aerodynamics.panel_method import boundary_layer
+
+
+class TestFlatPlate(unittest.TestCase):
+
+    def march(self, reynolds):
+        distance = 0.5 * (1 - np.cos(np.linspace(0, np.pi, 121)[1:]))[None, :]
+        return boundary_layer.march(distance, np.ones_like(distance), reynolds)
+
+    def test_laminar(self):
+        theta, shape, transition = self.march(1e5)
+        self.assertEqual(transition[0], 120)
+        # blasius
+        self.assertAlmostEqual(theta[0, -1] / (0.664 / np.sqrt(1e5)), 1, places = 1)
+        self.assertAlmostEqual(shape[0, -1], 2.61)
+
+    def test_turbulent(self):
+        theta, shape, transition = self.march(1e7)
+        self.assertLess(transition[0], 120)
+        self.assertAlmostEqual(theta[0, -1] / (0.036 * 1e7 ** -0.2), 1, delta = 0.2)
+        self.assertLess(shape[0, -1], 1.5)
+
+    def test_rows_independent(self):
+        distance = 0.5 * (1 - np.cos(np.linspace(0, np.pi, 121)[1:]))
+        distance = np.stack([distance, distance])
+        speed = np.stack([np.ones(120), np.linspace(1.2, 0.8, 120)])
+        theta, _, _ = boundary_layer.march(distance, speed, 1e6)
+        single, _, _ = boundary_layer.march(distance[1:], speed[1:], 1e6)
+        np.testing.assert_allclose(theta[1], single[0])
+
+
+class TestCorrelations(unittest.TestCase):
+
+    def test_head_shape_factor(self):
+        for shape in [1.3, 1.4, 1.5]:
+            entrainment = boundary_layer.head_entrainment_shape_factor(shape)
+            self.assertAlmostEqual(boundary_layer.head_shape_factor(entrainment),
+                                   shape, delta = 0.05)
+
+    def test_squire_young(self):
+        self.assertAlmostEqual(boundary_layer.squire_young(0.001, 1.4, 1), 0.002)
+
+
+if __name__ == "__main__":
+    unittest.main()
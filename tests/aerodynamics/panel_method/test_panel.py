@@ -0,0 +1,76 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../../")  # so uggo thanks to atom runner
+import unittest
+import numpy as np
+from uav_design_system.aerodynamics.panel_method import (PanelGeometry, PanelError,
+                                                         close_trailing_edge,
+                                                         read_coordinates, repanel)
+
+
+def naca(code):
+    """
+    coordinates of a naca four digit aerofoil from the upper trailing edge
+    """
+    return read_coordinates(f"{this_directory}/resources/naca{code}.txt")
+
+
+class TestGeometry(unittest.TestCase):
+
+    def test_read_coordinates(self):
+        x, y = read_coordinates(this_directory
+                                + "/../xfoil/resources/test_aerofoil.txt")
+        self.assertEqual(len(x), 200)
+        self.assertEqual((x[0], y[0]), (1.0, 0.0))
+
+    def test_close_trailing_edge(self):
+        x, y = close_trailing_edge(*naca("0012"))
+        self.assertAlmostEqual(y[0], y[-1])
+        self.assertAlmostEqual(np.min(x), 0)
+
+    def test_repanel(self):
+        x, y = repanel(*naca("0012"), number_panels = 40)
+        self.assertEqual(len(x), 41)
+        lengths = np.hypot(np.diff(x), np.diff(y))
+        # small panels at the leading edge
+        self.assertLess(lengths[20], lengths[10])
+        self.assertAlmostEqual(x[20], 0)
+
+    def test_too_few_panels(self):
+        with self.assertRaises(PanelError):
+            PanelGeometry([1, 0, 1], [0, 0, 0])
+
+
+class TestInviscid(unittest.TestCase):
+
+    def setUp(self):
+        self.alphas = np.array([-4, 0, 4, 8])
+
+    def forces(self, code):
+        geometry = PanelGeometry(*repanel(*naca(code)))
+        return geometry.forces(self.alphas, geometry.solve(self.alphas))
+
+    def test_symmetric(self):
+        cl, cm = self.forces("0012")
+        # thin aerofoil theory plus the thickness effect, as xfoil gives
+        np.testing.assert_allclose(cl, [-0.4829, 0, 0.4829, 0.9632], atol = 2e-3)
+        np.testing.assert_allclose(cl[2], -cl[0])
+        self.assertAlmostEqual(cm[1], 0)
+
+    def test_cambered(self):
+        cl, cm = self.forces("2412")
+        self.assertAlmostEqual(cl[1], 0.259, places = 2)
+        self.assertAlmostEqual(cm[1], -0.055, places = 2)
+
+    def test_surface_speed(self):
+        geometry = PanelGeometry(*repanel(*naca("0012")))
+        vorticity = geometry.solve([0])[0]
+        # flow goes back along both surfaces at the same speed
+        np.testing.assert_allclose(vorticity, -vorticity[::-1], atol = 1e-9)
+        self.assertLess(vorticity[10], 0)
+        self.assertGreater(np.max(np.abs(vorticity)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
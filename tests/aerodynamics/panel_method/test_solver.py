@@ -0,0 +1,91 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../../")  # so uggo thanks to atom runner
+import unittest
+import numpy as np
+from uav_design_system.aerodynamics.panel_method import (PanelSolver, PanelRunner,
+                                                         read_coordinates)
+from uav_design_system import aerofoil
+
+AEROFOIL_FILE = this_directory + "/../xfoil/resources/test_aerofoil.txt"
+
+
+class TestPolar(unittest.TestCase):
+
+    def setUp(self):
+        self.solver = PanelSolver(*read_coordinates(this_directory
+                                                    + "/resources/naca0012.txt"))
+        self.alphas = np.arange(-4, 8.1, 2)
+
+    def test_structure(self):
+        results = self.solver.polar(1e6, self.alphas, "naca 0012")
+        self.assertEqual(results.get_value_list("alpha"), list(self.alphas))
+        self.assertEqual(results.unconverged_alphas, [])
+        self.assertEqual(results.get_closest_alpha(0)["alpha"], 0)
+        self.assertAlmostEqual(results.get_closest_alpha(0)["cl"], 0)
+        self.assertEqual(results.to_dict()["results"]["xfoil"]["analysis"]["name"],
+                         "naca 0012")
+
+    def test_transition(self):
+        results = self.solver.polar(1e6, self.alphas)
+        _, transition = self.solver.profile_drag(self.alphas, 1e6)
+        self.assertEqual(results.get_value_list("transition_top"),
+                         list(transition[:, 0]))
+        self.assertEqual(results.get_value_list("transition_bottom"),
+                         list(transition[:, 1]))
+        self.assertLess(min(results.get_value_list("transition_top")), 1)
+        parameters = results.to_dict()["results"]["xfoil"]["analysis"][
+            "analysis_parameters"]
+        self.assertIsNone(parameters["Ncrit"])
+        self.assertNotIn("xtrf_top", parameters)
+
+    def test_drag(self):
+        cd, transition = self.solver.profile_drag(self.alphas, 1e6)
+        # within the range of xfoil and wind tunnel results
+        self.assertGreater(cd[2], 0.005)
+        self.assertLess(cd[2], 0.01)
+        self.assertEqual(np.argmin(cd), 2)
+        np.testing.assert_allclose(cd[:5], cd[4::-1])
+        # transition moves forward on the upper surface with angle of attack
+        self.assertTrue(np.all(np.diff(transition[:, 0]) <= 0))
+
+    def test_reynolds_number(self):
+        low, _ = self.solver.profile_drag([0], 1e5)
+        high, _ = self.solver.profile_drag([0], 3e6)
+        self.assertGreater(low[0], high[0])
+
+    def test_batch_matches_single(self):
+        cd, _ = self.solver.profile_drag(self.alphas, 1e6)
+        single, _ = self.solver.profile_drag([self.alphas[3]], 1e6)
+        self.assertAlmostEqual(cd[3], single[0])
+
+
+class TestFromAerofoil(unittest.TestCase):
+
+    def test_develop_aerofoil(self):
+        aero = aerofoil.Aerofoil.develop_aerofoil(0.1, -0.1, 0.2, 0.5, 0.05)
+        results = PanelSolver.from_aerofoil(aero).polar(2e5, [0, 2])
+        self.assertGreater(results.get_closest_alpha(0)["cl"], 0)
+        self.assertGreater(results.lift_slope, 0.08)
+
+
+class TestPanelRunner(unittest.TestCase):
+
+    def test_call(self):
+        with PanelRunner() as runner:
+            results = runner(AEROFOIL_FILE, 2e5, -2, 2, 0.5)
+        self.assertEqual(len(results.get_value_list("alpha")), 9)
+        self.assertAlmostEqual(results.get_max("alpha")["alpha"], 2)
+        self.assertGreater(results.lift_slope, 0.08)
+
+    def test_flap(self):
+        runner = PanelRunner()
+        clean = runner(AEROFOIL_FILE, 2e5, 0, 0, 1)
+        flapped = runner(AEROFOIL_FILE, 2e5, 0, 0, 1, flap_info = (0.75, 0, 5))
+        self.assertGreater(flapped.get_closest_alpha(0)["cl"],
+                           clean.get_closest_alpha(0)["cl"])
+
+
+if __name__ == "__main__":
+    unittest.main()
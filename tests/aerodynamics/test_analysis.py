@@ -9,6 +9,8 @@ from uav_design_system import aerofoil, layout
 import uav_design_system.aerodynamics.athena_vortex_lattice as avl
 import tempfile
 import shutil
+import time
+import threading
 
 class TestAnalysis(unittest.TestCase):
 
@@ -81,6 +83,132 @@ class TestAnalysis(unittest.TestCase):
         self.assertAlmostEqual(self.result.total_drag_coefficient, 0.4620, 4)
 
 
+class StubAerofoil():
+
+    def write(self, open_file, num_points = 100, distribution = None):
+        open_file.write("stub")
+
+
+class StubXfoilPool():
+    """
+    records the polars requested and how many run at once, taking a fixed
+    time for each. with a barrier each call waits until that many calls
+    have started
+    """
+
+    def __init__(self, run_time, barrier = None):
+        self.run_time = run_time
+        self.barrier = barrier
+        self.calls = []
+        self.running = 0
+        self.most_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, aerofoil_file, reynolds_number, start, stop, step,
+                 results_dir = None, flap_info = None):
+        with self.lock:
+            self.calls.append(aerofoil_file)
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        if self.barrier is not None:
+            self.barrier.wait()
+        time.sleep(self.run_time)
+        with self.lock:
+            self.running -= 1
+        return aero.xfoil.XfoilResults({"xfoil": {"analysis": {"results":
+                    [{"alpha": start + 4, "cd": reynolds_number}]}}})
+
+    def close(self):
+        pass
+
+
+class TestParallelXfoil(unittest.TestCase):
+
+    def create_plane(self):
+        plane = avl.Plane("UAV")
+        for i in range(3):
+            surface = plane.add_surface(f"surface{i}")
+            for j in range(2):
+                section = surface.add_section(0.1 * (j + 1))
+                section.aerofoil = StubAerofoil()
+        return plane
+
+    def setUp(self):
+        self.plane = self.create_plane()
+        self.case = avl.TrimCase(1, velocity = 22)
+        self.pool = StubXfoilPool(0.2)
+
+    def run_plane(self, max_workers):
+        analysis = aero.AerodynamicAnalysis(self.plane, self.case,
+                                            layout.Arrangement("arrangement"),
+                                            self.pool, max_workers)
+        return analysis._run_xfoil_plane(2)
+
+    def test_result_structure(self):
+        results = self.run_plane(4)
+        self.assertEqual(list(results), [0, 1, 2])
+        for i in range(3):
+            self.assertEqual(list(results[i]), [0, 1])
+            # the stub returns the reynolds number as the drag
+            self.assertAlmostEqual(results[i][1]["cd"], 2 * results[i][0]["cd"])
+
+    def test_sections_run_together(self):
+        """
+        every section waits for the others to start, which only finishes if
+        they all run at once
+        """
+        self.pool = StubXfoilPool(0, threading.Barrier(6, timeout = 10))
+        self.run_plane(6)
+        self.assertEqual(self.pool.most_running, 6)
+        self.assertEqual(len(self.pool.calls), 6)
+
+    def test_max_workers(self):
+        self.run_plane(2)
+        self.assertLessEqual(self.pool.most_running, 2)
+        self.assertEqual(len(self.pool.calls), 6)
+
+    def test_polar_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            cache = aero.xfoil.PolarCache(cache_dir)
+            analysis = aero.AerodynamicAnalysis(self.plane, self.case,
+                                                layout.Arrangement("arrangement"),
+                                                self.pool, 1, cache)
+            first = analysis._run_xfoil_plane(2)
+            second = analysis._run_xfoil_plane(2.01)
+        finally:
+            shutil.rmtree(cache_dir)
+
+        # sections share aerofoils, so only the two reynolds numbers are run
+        self.assertEqual(len(self.pool.calls), 2)
+        self.assertEqual(cache.hits, 10)
+        self.assertEqual(second[2][1]["cd"], first[2][1]["cd"])
+
+
+class TestNativeBackend(unittest.TestCase):
+
+    def test_run_avl(self):
+        plane = avl.Plane("UAV")
+        surface = plane.add_surface("wing")
+        surface.define_mesh(4, 8, 1.0, 1.0)
+        surface.reflect_surface = True
+        surface.add_section(0.3)
+        surface.add_section(0.2).translation_bias(0.05, 1, 0)
+        case = avl.TrimCase(plane.reference_area, velocity = 22, mass = 5)
+
+        analysis = aero.AerodynamicAnalysis(plane, case,
+                                            layout.Arrangement("arrangement"),
+                                            StubXfoilPool(0),
+                                            backend = aero.VortexLatticeBackend.NATIVE)
+        results = analysis._run_avl()
+        self.assertAlmostEqual(results.cl, case["cl"])
+        self.assertGreater(results.alpha, 0)
+
+    def test_panel_method(self):
+        analysis = aero.AerodynamicAnalysis(avl.Plane("UAV"), avl.TrimCase(1),
+                                            layout.Arrangement("arrangement"),
+                                            aerofoil_backend = aero.AerofoilBackend.PANEL)
+        self.assertIsInstance(analysis.xfoil_pool, aero.panel_method.PanelRunner)
 
 
 if __name__ == "__main__":
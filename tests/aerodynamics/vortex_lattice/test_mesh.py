@@ -0,0 +1,93 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../../")  # so uggo thanks to atom runner
+import unittest
+import numpy as np
+import uav_design_system.aerodynamics.athena_vortex_lattice as avl
+from uav_design_system.aerodynamics.vortex_lattice import (Lattice, LatticeError,
+                                                           spacing)
+
+
+def create_plane():
+    plane = avl.Plane("uav")
+    wing = plane.add_surface("wing")
+    wing.define_mesh(4, 6, 3.0, 3.0)
+    wing.reflect_surface = True
+    wing.add_section(1.0)
+    section = wing.add_section(0.5)
+    section.translation_bias(0.25, 2, 0)
+    section.twist_angle = -3
+
+    control_surface = avl.ControlSurface("elevator", 0.75, [0, 1, 0],
+                                         avl.ControlDeflectionType.SYMMETRIC)
+    wing.add_control_surface(control_surface, 0, 1)
+    return plane
+
+
+class TestSpacing(unittest.TestCase):
+
+    def test_equal(self):
+        np.testing.assert_allclose(spacing(4, 3.0), [0, 0.25, 0.5, 0.75, 1])
+        np.testing.assert_allclose(spacing(4, 0), [0, 0.25, 0.5, 0.75, 1])
+
+    def test_cosine(self):
+        edges = spacing(4, 1.0)
+        np.testing.assert_allclose(edges, 0.5 * (1 - np.cos(np.pi * edges * 0 +
+                                   np.pi * np.linspace(0, 1, 5))))
+
+    def test_sine_bunching(self):
+        start, end = np.diff(spacing(10, 2.0)), np.diff(spacing(10, -2.0))
+        self.assertLess(start[0], start[-1])
+        self.assertGreater(end[0], end[-1])
+
+
+class TestLattice(unittest.TestCase):
+
+    def setUp(self):
+        self.lattice = Lattice(create_plane())
+
+    def test_panel_count(self):
+        # mirror image doubles the panels
+        self.assertEqual(len(self.lattice), 2 * 4 * 6)
+        self.assertEqual(self.lattice.number_strips, 12)
+
+    def test_mirror(self):
+        y = self.lattice.strip_leading_edges[:, 1]
+        np.testing.assert_allclose(np.sort(y[:6]), np.sort(-y[6:]))
+        # bound vortices always run towards positive y
+        self.assertTrue(np.all(self.lattice.bound_b[:, 1] > self.lattice.bound_a[:, 1]))
+
+    def test_quarter_cord(self):
+        # first panel of a four panel equal spaced root strip
+        cord = self.lattice.strip_cords[0]
+        leading_edge = self.lattice.strip_leading_edges[0]
+        self.assertAlmostEqual(self.lattice.bound_midpoints[0, 0] - leading_edge[0],
+                               cord / 16)
+        self.assertAlmostEqual(self.lattice.control_points[0, 0] - leading_edge[0],
+                               3 * cord / 16)
+
+    def test_twist_tilts_normal(self):
+        # washout tilts the tip normals back
+        self.assertAlmostEqual(self.lattice.normals[0, 2], 1, 2)
+        self.assertLess(self.lattice.normals[4 * 5, 0], 0)
+
+    def test_area(self):
+        self.assertAlmostEqual(self.lattice.strip_areas.sum(), 3)
+
+    def test_control(self):
+        control_normals = self.lattice.control_normals["elevator"]
+        deflected = np.any(control_normals != 0, axis = 1)
+        # last chordwise panel of each strip is behind the hinge
+        self.assertEqual(deflected.sum(), 12)
+        self.assertTrue(np.all(control_normals[deflected, 0] > 0))
+
+    def test_single_section(self):
+        plane = avl.Plane("uav")
+        plane.add_surface("wing").add_section(1)
+        with self.assertRaises(LatticeError):
+            Lattice(plane)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../../")  # so uggo thanks to atom runner
+import unittest
+import math
+import numpy as np
+import uav_design_system.aerodynamics.athena_vortex_lattice as avl
+from uav_design_system.aerodynamics.vortex_lattice import (VortexLatticeSolver,
+                                                           VortexLatticeResults,
+                                                           VortexLatticeResultSet,
+                                                           horseshoe_velocities)
+
+
+def create_wing(aspect_ratio = 8):
+    plane = avl.Plane("wing")
+    wing = plane.add_surface("wing")
+    wing.define_mesh(8, 20, 1.0, 1.0)
+    wing.reflect_surface = True
+    wing.add_section(1.0)
+    wing.add_section(1.0).translation_bias(0, aspect_ratio / 2, 0)
+    return plane
+
+
+def create_plane():
+    plane = create_wing()
+    tail = plane.add_surface("tail")
+    tail.define_mesh(6, 10, 1.0, 1.0)
+    tail.reflect_surface = True
+    tail.define_translation_bias(4, 0, 0.3)
+    tail.add_section(0.6)
+    tail.add_section(0.4).translation_bias(0.1, 1, 0)
+    control_surface = avl.ControlSurface("elevator", 0.7, [0, 1, 0],
+                                         avl.ControlDeflectionType.SYMMETRIC)
+    tail.add_control_surface(control_surface, 0, 1)
+    return plane
+
+
+class TestHorseshoe(unittest.TestCase):
+
+    def test_downwash_behind(self):
+        velocity = horseshoe_velocities(np.array([[1.0, 0, 0]]),
+                                        np.array([[0, -1.0, 0]]),
+                                        np.array([[0, 1.0, 0]]))
+        self.assertLess(velocity[0, 0, 2], 0)
+        self.assertAlmostEqual(velocity[0, 0, 1], 0)
+
+    def test_on_vortex(self):
+        velocity = horseshoe_velocities(np.array([[0, 0, 0.0]]),
+                                        np.array([[0, -1.0, 0]]),
+                                        np.array([[0, 1.0, 0]]))
+        self.assertTrue(np.all(np.isfinite(velocity)))
+
+
+class TestVortexLatticeSolver(unittest.TestCase):
+
+    def test_lift_slope(self):
+        # lifting surface theory for a rectangular aspect ratio 8 wing
+        plane = create_wing()
+        solver = VortexLatticeSolver(plane, avl.TrimCase(plane.reference_area),
+                                     (0.25, 0, 0))
+        solution = solver.solve(5)
+        self.assertAlmostEqual(solution["cl"] / math.radians(5), 4.6, delta = 0.2)
+        self.assertAlmostEqual(solution["cm"], 0, delta = 0.01)
+
+    def test_induced_drag(self):
+        plane = create_wing()
+        solver = VortexLatticeSolver(plane, avl.TrimCase(plane.reference_area))
+        solution = solver.solve(5)
+        cl, cd = solver.trefftz(solution)
+        self.assertAlmostEqual(cd, solution["cd"], delta = 1e-4)
+        efficiency = cl ** 2 / (math.pi * 8 * cd)
+        self.assertGreater(efficiency, 0.95)
+        self.assertLess(efficiency, 1.01)
+
+    def test_trim(self):
+        plane = create_plane()
+        case = avl.TrimCase(plane.reference_area, velocity = 22, mass = 60)
+        solver = VortexLatticeSolver(plane, case, (0.4, 0, 0))
+        results = solver()
+
+        self.assertIsInstance(results, VortexLatticeResults)
+        self.assertAlmostEqual(results.cl, case["cl"])
+        self.assertAlmostEqual(results.cm, 0)
+        self.assertGreater(results.alpha, 0)
+        # centre of gravity is ahead of the neutral point so trim is tail down
+        self.assertGreater(results.neutral_point, 0.4)
+        self.assertLess(results.elevator_deflection, 0)
+
+    def test_elevator_pitches_down(self):
+        plane = create_plane()
+        solver = VortexLatticeSolver(plane, avl.TrimCase(plane.reference_area),
+                                     (0.6, 0, 0))
+        self.assertLess(solver.solve(2, {"elevator": 1})["cm"],
+                        solver.solve(2)["cm"])
+
+    def test_strip_distributions(self):
+        plane = create_plane()
+        case = avl.TrimCase(plane.reference_area, velocity = 22, mass = 60)
+        results = VortexLatticeSolver(plane, case, (0.6, 0, 0))()
+
+        self.assertEqual(len(results.y_distribution), 60)
+        self.assertEqual(len(results.cl_distribution), 60)
+        self.assertAlmostEqual(sum(results.area_distribution),
+                               plane.reference_area + 1.0)
+        # symmetric flight gives a symmetric lift distribution
+        np.testing.assert_allclose(results.cl_distribution[:20],
+                                   results.cl_distribution[20:40])
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.plane = create_plane()
+        self.solver = VortexLatticeSolver(self.plane,
+                                          avl.TrimCase(self.plane.reference_area),
+                                          (0.4, 0, 0))
+
+    def test_sweep(self):
+        alphas = np.linspace(-2, 8, 6)
+        results = self.solver.sweep(alphas, {"elevator": 1})
+        self.assertIsInstance(results, VortexLatticeResultSet)
+        self.assertEqual(len(results), 6)
+        self.assertEqual(np.shape(results.cl_distribution), (6, 60))
+        for alpha, cl in zip(alphas, results.cl):
+            self.assertAlmostEqual(self.solver.solve(alpha, {"elevator": 1})["cl"], cl)
+
+    def test_solve_cases(self):
+        cases = [avl.TrimCase(self.plane.reference_area, velocity = velocity,
+                              mass = 60) for velocity in [15, 20, 25]]
+        results = self.solver.solve_cases(cases)
+        np.testing.assert_allclose(results.cl, [case["cl"] for case in cases])
+        np.testing.assert_allclose(results.cm, 0, atol = 1e-9)
+
+        single = VortexLatticeSolver(self.plane, cases[1], (0.4, 0, 0))()
+        self.assertAlmostEqual(results[1].alpha, single.alpha)
+        self.assertAlmostEqual(results[1].elevator_deflection,
+                               single.elevator_deflection)
+        np.testing.assert_allclose(results[1].cl_distribution,
+                                   single.cl_distribution)
+
+
+if __name__ == "__main__":
+    unittest.main()
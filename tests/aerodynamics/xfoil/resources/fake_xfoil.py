@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+stand in for the xfoil executable, answers every ASEQ with the polar in
+aerofoil_results.txt so the process handling can be tested without xfoil
+"""
+import os
+import sys
+
+this_directory = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(this_directory, 'aerofoil_results.txt')) as open_file:
+    polar = open_file.read()
+
+polar_file = None
+previous = ''
+for line in sys.stdin:
+    command = line.strip()
+    if command.upper() == 'SYNC':
+        print(' SYNC command not recognized.  Type a "?" for list', flush = True)
+    elif previous.upper() == 'PACC' and command:
+        polar_file = command
+    elif command.upper().startswith('ASEQ') and polar_file:
+        with open(polar_file, 'w') as open_file:
+            open_file.write(polar)
+        print('   a =  0.000      CL =  0.0000', flush = True)
+    previous = command
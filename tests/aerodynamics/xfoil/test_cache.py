@@ -0,0 +1,118 @@
+import os
+from os.path import join
+this_directory = os.path.dirname(os.path.abspath(__file__))
+import sys
+sys.path.append(this_directory + '/../../../')
+import unittest
+import shutil
+from uav_design_system.aerodynamics.xfoil import (PolarCache, XfoilWorker,
+                                                  XfoilResults)
+from uav_design_system.aerodynamics.panel_method import PanelRunner
+
+fake_xfoil = join(this_directory, 'resources', 'fake_xfoil.py')
+aerofoil_file = join(this_directory, 'resources', 'test_aerofoil.txt')
+
+
+class CountingRunner():
+
+    def __init__(self, runner):
+        self.runner = runner
+        self.SOLVER = runner.SOLVER
+        self.reynolds_numbers = []
+
+    def __call__(self, aerofoil_file, reynolds_number, *args, **kwargs):
+        self.reynolds_numbers.append(reynolds_number)
+        return self.runner(aerofoil_file, reynolds_number, *args, **kwargs)
+
+
+class TestPolarCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = join(this_directory, 'polar_cache')
+        self.cache = PolarCache(self.directory)
+        self.worker = XfoilWorker(fake_xfoil, timeout = 5)
+        self.runner = CountingRunner(self.worker)
+
+    def tearDown(self):
+        self.worker.close()
+        shutil.rmtree(self.directory)
+
+    def test_quantise_reynolds(self):
+        self.assertEqual(self.cache.quantise_reynolds(123456), 123000)
+        self.assertEqual(self.cache.quantise_reynolds(0.0012345), 0.00123)
+        self.assertEqual(PolarCache(self.directory, None).quantise_reynolds(1234), 1234)
+
+    def test_key_ignores_title(self):
+        renamed_file = join(self.directory, 'renamed.txt')
+        with open(aerofoil_file) as open_file:
+            lines = open_file.read().split('\n', 1)
+        with open(renamed_file, 'w') as open_file:
+            open_file.write('another name\n' + lines[1])
+        self.assertEqual(self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5),
+                         self.cache.key(renamed_file, 1e6, 0, 5, 0.5))
+
+    def test_key_settings(self):
+        key = self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertEqual(key, self.cache.key(aerofoil_file, 1.0001e6, 0, 5, 0.5))
+        self.assertNotEqual(key, self.cache.key(aerofoil_file, 1.1e6, 0, 5, 0.5))
+        self.assertNotEqual(key, self.cache.key(aerofoil_file, 1e6, 0, 5, 1))
+        self.assertNotEqual(key, self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5,
+                                                (0.7, 0, 5)))
+
+    def test_run_once(self):
+        first = self.cache(self.runner, aerofoil_file, 1.00012e6, 0, 5, 0.5)
+        second = self.cache(self.runner, aerofoil_file, 1.00034e6, 0, 5, 0.5)
+        self.assertEqual(self.runner.reynolds_numbers, [1e6])
+        self.assertIsInstance(second, XfoilResults)
+        self.assertEqual(second.get_value_list('cl'), first.get_value_list('cl'))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_mach_ncrit(self):
+        key = self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertEqual(key, self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5,
+                                             mach = 0, ncrit = 9))
+        self.assertNotEqual(key, self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5,
+                                                mach = 0.3))
+        self.assertNotEqual(key, self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5,
+                                                ncrit = 5))
+        other = PolarCache(self.directory, mach = 0.3, ncrit = 5)
+        self.assertNotEqual(key, other.key(aerofoil_file, 1e6, 0, 5, 0.5))
+
+    def test_other_settings_not_returned(self):
+        """
+        a cache for other settings does not return the polar xfoil reports
+        was run at mach 0 and ncrit 9, and does not store it as its own
+        """
+        self.cache(self.runner, aerofoil_file, 1e6, 0, 5, 0.5)
+        other = PolarCache(self.directory, mach = 0.3, ncrit = 5)
+        other(self.runner, aerofoil_file, 1e6, 0, 5, 0.5)
+        other(self.runner, aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertEqual(len(self.runner.reynolds_numbers), 3)
+        self.assertEqual(other.hits, 0)
+
+    def test_key_solver(self):
+        key = self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertEqual(key, self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5,
+                                             solver = XfoilWorker.SOLVER))
+        self.assertNotEqual(key, self.cache.key(aerofoil_file, 1e6, 0, 5, 0.5,
+                                                solver = PanelRunner.SOLVER))
+
+    def test_solvers_not_shared(self):
+        """
+        polars of xfoil and the panel method are stored apart in one cache
+        """
+        panel = CountingRunner(PanelRunner())
+        xfoil = self.cache(self.runner, aerofoil_file, 1e6, 0, 5, 0.5)
+        first = self.cache(panel, aerofoil_file, 1e6, 0, 5, 0.5)
+        second = self.cache(panel, aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertEqual(panel.reynolds_numbers, [1e6])
+        self.assertEqual(second.get_value_list('cd'), first.get_value_list('cd'))
+        self.assertNotEqual(first.get_value_list('cd'), xfoil.get_value_list('cd'))
+        self.assertEqual(self.cache(self.runner, aerofoil_file, 1e6, 0, 5,
+                                    0.5).get_value_list('cd'),
+                         xfoil.get_value_list('cd'))
+        self.assertEqual(len(self.runner.reynolds_numbers), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
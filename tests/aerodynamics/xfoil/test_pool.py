@@ -0,0 +1,97 @@
+import os
+from os.path import join
+this_directory = os.path.dirname(os.path.abspath(__file__))
+import sys
+sys.path.append(this_directory + '/../../../')
+import unittest
+from uav_design_system.aerodynamics.xfoil import (XfoilPool, XfoilWorker,
+                                                  XfoilResults, XfoilTimeoutError)
+
+fake_xfoil = join(this_directory, 'resources', 'fake_xfoil.py')
+aerofoil_file = join(this_directory, 'resources', 'test_aerofoil.txt')
+
+
+class RecordingWorker(XfoilWorker):
+    """
+    worker that records the commands sent to its xfoil process
+    """
+
+    def _disable_x11_plot(self):
+        # the first commands sent to a new process
+        self.commands = []
+        command = self.process.command
+
+        def record(line):
+            self.commands.append(line)
+            command(line)
+
+        self.process.command = record
+        super()._disable_x11_plot()
+
+
+class TestXfoilWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.worker = XfoilWorker(fake_xfoil, max_jobs = 2, timeout = 5)
+
+    def tearDown(self):
+        del self.worker
+
+    def test_process_reused(self):
+        self.worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        process = self.worker.process
+        results = self.worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertIs(self.worker.process, process)
+        self.assertIsInstance(results, XfoilResults)
+        self.assertEqual(self.worker.jobs_run, 2)
+
+    def test_same_commands_each_job(self):
+        """
+        commands that toggle xfoil settings are not sent again by a reused
+        process
+        """
+        worker = RecordingWorker(fake_xfoil, timeout = 5)
+        worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        first = len(worker.commands)
+        worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        second = len(worker.commands)
+        worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        jobs = [worker.commands[first:second], worker.commands[second:]]
+        self.assertEqual(jobs[0], jobs[1])
+        self.assertNotIn('SEQP', jobs[0])
+        self.assertEqual(worker.commands.count('SEQP'), 1)
+        worker.close()
+
+    def test_recycled_after_max_jobs(self):
+        self.worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        self.worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        process = self.worker.process
+        self.worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertIsNot(self.worker.process, process)
+        self.assertEqual(self.worker.jobs_run, 1)
+
+    def test_hang_stops_process(self):
+        worker = XfoilWorker('tail', timeout = 0.5)
+        with self.assertRaises(XfoilTimeoutError):
+            worker(aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertIsNone(worker.process)
+
+
+class TestXfoilPool(unittest.TestCase):
+
+    def test_size(self):
+        with XfoilPool(fake_xfoil, size = 3) as pool:
+            self.assertEqual(len(pool), 3)
+
+    def test_default_size(self):
+        with XfoilPool(fake_xfoil) as pool:
+            self.assertEqual(len(pool), os.cpu_count())
+
+    def test_run(self):
+        with XfoilPool(fake_xfoil, size = 2) as pool:
+            results = pool(aerofoil_file, 1e6, 0, 5, 0.5)
+            self.assertEqual(results.get_closest_alpha(1)['alpha'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
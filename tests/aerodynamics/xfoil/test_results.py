@@ -44,6 +44,13 @@ class TestCase(unittest.TestCase):
     def test_lift_slope(self):
         self.assertEqual(self.aerofoil_results.lift_slope, 0.0828)
 
+    def test_dict_round_trip(self):
+        results = XfoilResults.from_dict(json.loads(json.dumps(
+            XfoilResults(self.expected_json, [5.5]).to_dict())))
+        self.assertEqual(results.get_value_list('cl'),
+                         self.aerofoil_results.get_value_list('cl'))
+        self.assertEqual(results.unconverged_alphas, [5.5])
+
     def test_get_value_list(self):
         actual_list = self.aerofoil_results.get_value_list('alpha')
         self.assertEqual(actual_list, [0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5])
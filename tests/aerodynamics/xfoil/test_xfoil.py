@@ -4,7 +4,7 @@ this_directory = os.path.dirname(os.path.abspath(__file__))
 import sys
 sys.path.append(this_directory + '/../../../')
 import unittest
-from uav_design_system.aerodynamics.xfoil import XfoilRunner
+from uav_design_system.aerodynamics.xfoil import XfoilRunner, XfoilResults
 import shutil
 import json
 from pathlib import Path
@@ -17,6 +17,31 @@ def get_resource_content(file_name):
     with open(join(resources_directory, file_name)) as open_file:
         return open_file.read()
 
+class TestXfoilRunnerOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.aerofoil_file = os.path.join(this_directory, 'resources', 'test_aerofoil.txt')
+        fake_xfoil = os.path.join(this_directory, 'resources', 'fake_xfoil.py')
+        self.xfoil_runner = XfoilRunner(fake_xfoil, timeout = 5)
+
+    def tearDown(self):
+        del self.xfoil_runner
+
+    def test_run_finishes_on_sentinel(self):
+        results = self.xfoil_runner(self.aerofoil_file, 1e6, 0, 5, 0.5)
+        self.assertIsInstance(results, XfoilResults)
+        self.assertEqual(results.unconverged_alphas, [])
+
+    def test_find_unconverged(self):
+        output = "\n".join(["   a =  1.000      CL =  0.3000",
+                            "  Cm = -0.0100     CD =  0.00600",
+                            "   a =  2.000      CL =  0.4000",
+                            " VISCAL:  Convergence failed",
+                            "   a = -1.500      CL = -0.1000",
+                            " VISCAL:  Convergence failed"])
+        self.assertEqual(self.xfoil_runner._find_unconverged(output), [2, -1.5])
+
+
 class TestXfoilRunner(unittest.TestCase):
 
     def setUp(self):
@@ -34,8 +59,9 @@ class TestXfoilRunner(unittest.TestCase):
         shutil.rmtree(self.results_dir)
 
     def test_temp_file_location(self):
-        temp_folder = Path.home() / 'xfoil_temp'
+        temp_folder = self.xfoil_runner.temp_folder
         self.assertTrue(temp_folder.exists())
+        self.assertEqual(temp_folder.parent, Path.home())
 
     def test_del(self):
         file_location = self.xfoil_runner.temp_folder
@@ -81,7 +107,5 @@ class TestXfoilRunner(unittest.TestCase):
                          'content in xfoil result is not correct')
 
 
-
-
 if __name__ == "__main__":
     unittest.main()
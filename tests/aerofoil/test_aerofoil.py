@@ -39,14 +39,14 @@ class TestAerofoil(unittest.TestCase):
         test function returns the upper surface y and lower surface y from a
         x coordinate
         """
-        y_pressure, y_suction = self.aerofoil.get_maxmin_y(0.5, x0 = np.float(0.2))
+        y_pressure, y_suction = self.aerofoil.get_maxmin_y(0.5, x0 = 0.2)
         self.assertEqual(y_pressure, 0)
         self.assertEqual(y_suction, 0.5)
 
     def test_get_top_bottom_dev(self):
 
         aero = aerofoil.Aerofoil.develop_aerofoil(0.2, 0.2, 0.2, 0.2, 0.2)
-        y_pressure, y_suction = aero.get_maxmin_y(0.5, x0 = np.float(0.2))
+        y_pressure, y_suction = aero.get_maxmin_y(0.5, x0 = 0.2)
         self.assertAlmostEqual(y_pressure, 0.0712798523671)
         self.assertAlmostEqual(y_suction, 0.156091116794)
 
@@ -154,6 +154,94 @@ class TestAerofoilWrite(unittest.TestCase):
         self.assertEqual(content, expected_content)
 
 
+class TestCoordinates(unittest.TestCase):
+
+    def setUp(self):
+        self.aerofoil = aerofoil.Aerofoil.develop_aerofoil(0.1, -0.1, 0.2, 0.5, 0)
+
+    def test_cached(self):
+        coordinates = self.aerofoil.coordinates(50)
+        self.assertIs(self.aerofoil.coordinates(50), coordinates)
+        self.assertIsNot(self.aerofoil.coordinates(60), coordinates)
+        self.assertEqual(coordinates.shape, (100, 2))
+        self.assertFalse(coordinates.flags.writeable)
+
+    def test_order(self):
+        coordinates = self.aerofoil.coordinates(50)
+        np.testing.assert_allclose(coordinates[0], [1, 0])
+        np.testing.assert_allclose(coordinates[49], [0, 0])
+        self.assertGreater(coordinates[25, 1], 0)
+        self.assertLess(coordinates[75, 1], 0)
+
+    def test_nodes_changed(self):
+        coordinates = self.aerofoil.coordinates(50)
+        surface = self.aerofoil.suction_surface
+        surface.nodes = [[0, 0], [0, 0.2], [0.5, 0.2], [1, 0]]
+        new_coordinates = self.aerofoil.coordinates(50)
+        self.assertIsNot(new_coordinates, coordinates)
+        self.assertGreater(new_coordinates[25, 1], coordinates[25, 1])
+        np.testing.assert_allclose(new_coordinates[50:], coordinates[50:])
+
+    def test_write_matches_coordinates(self):
+        file_path = join(this_directory, "test_coordinates.txt")
+        try:
+            for _ in range(2):
+                with open(file_path, "w") as open_file:
+                    self.aerofoil.write(open_file, 50)
+            with open(file_path) as open_file:
+                lines = open_file.read().split("\n")
+        finally:
+            remove(file_path)
+        self.assertEqual(lines[0], "Name: Not Specified")
+        written = np.array([line.split() for line in lines[1:] if line], dtype = float)
+        np.testing.assert_array_equal(written, self.aerofoil.coordinates(50))
+
+
+class TestPointDistribution(unittest.TestCase):
+
+    def setUp(self):
+        self.surface = aerofoil.Aerofoil.develop_aerofoil(0.1, -0.1, 0.2, 0.5, 0).suction_surface
+
+    def spacing(self, distribution):
+        points = self.surface.coordinates(41, distribution)
+        return np.hypot(*np.diff(points, axis = 0).T)
+
+    def test_ends(self):
+        for distribution in aerofoil.PointDistribution:
+            points = self.surface.coordinates(41, distribution)
+            np.testing.assert_allclose(points[0], [0, 0], atol = 1e-12)
+            np.testing.assert_allclose(points[-1], [1, 0], atol = 1e-12)
+            self.assertTrue(np.all(np.diff(points[:, 0]) > 0))
+
+    def test_cosine(self):
+        x = self.surface.coordinates(41, aerofoil.PointDistribution.COSINE)[:, 0]
+        np.testing.assert_allclose(x, 0.5 * (1 - np.cos(np.linspace(0, np.pi, 41))),
+                                   atol = 1e-10)
+
+    def test_arc_length(self):
+        spacing = self.spacing(aerofoil.PointDistribution.ARC_LENGTH)
+        # chords are a little shorter than the arc where the surface bends
+        np.testing.assert_allclose(spacing, spacing.mean(), rtol = 3e-2)
+
+    def test_curvature(self):
+        # the leading edge bends most so has the smallest spacing
+        spacing = self.spacing(aerofoil.PointDistribution.CURVATURE)
+        uniform = self.spacing(aerofoil.PointDistribution.ARC_LENGTH)
+        self.assertLess(spacing[0], uniform[0])
+        self.assertLess(np.argmin(spacing[:20]), 5)
+
+    def test_cached_separately(self):
+        cosine = self.surface.coordinates(41, aerofoil.PointDistribution.COSINE)
+        self.assertIsNot(cosine, self.surface.coordinates(41))
+        self.assertIs(cosine, self.surface.coordinates(41,
+                                                       aerofoil.PointDistribution.COSINE))
+
+    def test_curvature_of_parabola(self):
+        # quadratic through three points of a parabola y = x ** 2
+        curve = aerofoil.BezierCurve([[0, 0], [0.5, 0], [1, 1]])
+        self.assertAlmostEqual(curve.curvature([0])[0], 2)
+
+
 class TestSurface(unittest.TestCase):
 
     def setUp(self):
@@ -201,5 +289,62 @@ class TestSurface(unittest.TestCase):
     def test_equal(self):
         self.assertEqual(self.p_surface, aerofoil.Surface(*[[0, 0], [0.5, 0], [1, 0]], degree = 1))
 
+class TestBezierCurve(unittest.TestCase):
+
+    def setUp(self):
+        self.nodes = [[0, 0], [0, 0.2], [0.2, 0.3], [1, 0]]
+        self.curve = aerofoil.BezierCurve(self.nodes)
+
+    def test_evaluate(self):
+        s = np.linspace(0, 1, 11)
+        nodes = np.array(self.nodes)
+        expected = ((1 - s) ** 3)[:, None] * nodes[0] + \
+                   (3 * s * (1 - s) ** 2)[:, None] * nodes[1] + \
+                   (3 * s ** 2 * (1 - s))[:, None] * nodes[2] + \
+                   (s ** 3)[:, None] * nodes[3]
+        np.testing.assert_allclose(self.curve.evaluate(s), expected, atol = 1e-15)
+        np.testing.assert_allclose(self.curve._power(self.curve.coefficients, s),
+                                   expected, atol = 1e-15)
+
+    def test_derivative(self):
+        s = np.array([0.1, 0.5, 0.9])
+        step = 1e-6
+        expected = (self.curve.evaluate(s + step) - self.curve.evaluate(s - step)) / (2 * step)
+        np.testing.assert_allclose(self.curve.derivative(s), expected, atol = 1e-8)
+
+    def test_get_y_array(self):
+        x = np.linspace(0, 1, 50)
+        y, s = self.curve.get_y(x)
+        np.testing.assert_allclose(self.curve.evaluate(s)[:, 0], x, atol = 1e-12)
+        surface = aerofoil.Surface(*self.nodes)
+        self.assertAlmostEqual(surface.get_y(x[20])[0], y[20])
+
+    def test_get_y_newton_arguments(self):
+        surface = aerofoil.Surface(*self.nodes)
+        y, s = surface.get_y(0.4, x0 = 0.3, tol = 1e-14, maxiter = 100)
+        self.assertAlmostEqual(self.curve.evaluate(s)[0, 0], 0.4, places = 12)
+        # one step from the guess does not reach the curve
+        _, rough = surface.get_y(0.4, x0 = 0.0, maxiter = 1)
+        self.assertNotAlmostEqual(rough, s, places = 6)
+
+    def test_get_y_unsupported_argument(self):
+        surface = aerofoil.Surface(*self.nodes)
+        with self.assertRaises(TypeError):
+            surface.get_y(0.4, fprime = lambda s: 1)
+
+    def test_get_y_quadratic(self):
+        curve = aerofoil.BezierCurve([[0, 0], [0.2, 0.1], [1, 0]])
+        x = np.linspace(0, 1, 11)
+        y, s = curve.get_y(x)
+        self.assertTrue(np.all((s > -1e-12) & (s < 1 + 1e-12)))
+        np.testing.assert_allclose(curve.evaluate(s)[:, 0], x, atol = 1e-12)
+
+    def test_get_maxmin_y_array(self):
+        aero = aerofoil.Aerofoil.develop_aerofoil(0.2, 0.2, 0.2, 0.2, 0.2)
+        y_pressure, y_suction = aero.get_maxmin_y(np.array([0.25, 0.5]))
+        self.assertAlmostEqual(y_pressure[1], 0.0712798523671)
+        self.assertAlmostEqual(y_suction[1], 0.156091116794)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,145 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../")  # so uggo thanks to atom runner
+import unittest
+from uav_design_system import aerofoil, layout
+from uav_design_system.aerofoil import AerofoilFamily, AerofoilFamilyError, \
+    PointDistribution
+import numpy as np
+
+
+class TestAerofoilFamily(unittest.TestCase):
+
+    def setUp(self):
+        self.parameters = np.array([[0.1, -0.1, 0.12, 0.4, 0.02],
+                                    [0.05, -0.15, 0.2, 0.3, 0.0],
+                                    [0.15, -0.03, 0.08, 0.5, 0.06]])
+        self.family = AerofoilFamily.from_parameters(self.parameters)
+        self.aerofoils = [aerofoil.Aerofoil.develop_aerofoil(*row)
+                          for row in self.parameters]
+
+    def test_len(self):
+        self.assertEqual(len(self.family), 3)
+
+    def test_bad_parameters(self):
+        with self.assertRaises(AerofoilFamilyError):
+            AerofoilFamily.from_parameters(np.zeros((3, 4)))
+
+    def test_mismatched_nodes(self):
+        with self.assertRaises(AerofoilFamilyError):
+            AerofoilFamily(np.zeros((3, 4, 2)), np.zeros((2, 4, 2)))
+
+    def test_item(self):
+        for i, expected in enumerate(self.aerofoils):
+            self.assertIsInstance(self.family[i], aerofoil.Aerofoil)
+            np.testing.assert_allclose(self.family[i].suction_surface.nodes,
+                                       expected.suction_surface.nodes)
+            np.testing.assert_allclose(self.family[i].pressure_surface.nodes,
+                                       expected.pressure_surface.nodes)
+
+    def test_slice(self):
+        family = self.family[1:]
+        self.assertIsInstance(family, AerofoilFamily)
+        self.assertEqual(len(family), 2)
+        np.testing.assert_allclose(family[0].pressure_surface.nodes,
+                                   self.aerofoils[1].pressure_surface.nodes)
+
+    def test_coordinates(self):
+        coordinates = self.family.coordinates(30)
+        self.assertEqual(coordinates.shape, (3, 60, 2))
+        for i, expected in enumerate(self.aerofoils):
+            np.testing.assert_allclose(coordinates[i], expected.coordinates(30),
+                                       atol = 1e-12)
+
+    def test_cosine_coordinates(self):
+        coordinates = self.family.coordinates(30, PointDistribution.COSINE)
+        for i, expected in enumerate(self.aerofoils):
+            np.testing.assert_allclose(
+                coordinates[i], expected.coordinates(30, PointDistribution.COSINE),
+                atol = 1e-10)
+
+    def test_arc_length_coordinates(self):
+        coordinates = self.family.coordinates(30, PointDistribution.ARC_LENGTH)
+        np.testing.assert_allclose(
+            coordinates[2],
+            self.aerofoils[2].coordinates(30, PointDistribution.ARC_LENGTH))
+
+    def test_get_s(self):
+        x = np.linspace(0, 1, 11)
+        s = self.family.get_s("suction", x)
+        for i, expected in enumerate(self.aerofoils):
+            np.testing.assert_allclose(
+                expected.suction_surface.bezier.evaluate(s[i])[:, 0], x, atol = 1e-12)
+
+    def test_thickness(self):
+        x = np.array([0.1, 0.35, 0.8])
+        thickness = self.family.thickness(x)
+        for i, expected in enumerate(self.aerofoils):
+            bottom, top = expected.get_maxmin_y(x)
+            np.testing.assert_allclose(thickness[i], top - bottom, atol = 1e-12)
+
+    def test_camber(self):
+        x = np.array([0.1, 0.35, 0.8])
+        camber = self.family.camber(x)
+        for i, expected in enumerate(self.aerofoils):
+            bottom, top = expected.get_maxmin_y(x)
+            np.testing.assert_allclose(camber[i], 0.5 * (top + bottom), atol = 1e-12)
+
+    def test_camber_point(self):
+        # the thickness is centred on the camber node
+        np.testing.assert_allclose(self.family.camber([0.0, 1.0]), 0, atol = 1e-12)
+
+
+class TestValidity(unittest.TestCase):
+
+    def setUp(self):
+        self.family = AerofoilFamily.from_parameters(
+            [[0.1, -0.1, 0.12, 0.4, 0.02],
+             # surfaces cross towards the trailing edge
+             [0.1, -0.1, -0.05, 0.4, 0.0],
+             # the middle nodes are behind the trailing edge
+             [0.1, -0.1, 0.1, 1.4, 0.0]])
+
+    def test_is_closed(self):
+        self.assertTrue(np.all(self.family.is_closed()))
+        suction_nodes = self.family.suction_nodes.copy()
+        suction_nodes[0, -1, 1] = 0.01
+        family = AerofoilFamily(suction_nodes, self.family.pressure_nodes)
+        np.testing.assert_array_equal(family.is_closed(), [False, True, True])
+
+    def test_is_single_valued(self):
+        np.testing.assert_array_equal(self.family.is_single_valued(),
+                                      [True, True, False])
+
+    def test_thickness_distribution(self):
+        thickness = self.family.thickness_distribution(10)
+        self.assertEqual(thickness.shape, (3, 10))
+        self.assertTrue(np.all(thickness[0] > 0))
+        self.assertTrue(np.any(thickness[1] < 0))
+
+    def test_is_valid(self):
+        np.testing.assert_array_equal(self.family.is_valid(), [True, False, False])
+
+    def test_is_valid_minimum_thickness(self):
+        np.testing.assert_array_equal(self.family.is_valid(0.2), [False, False, False])
+
+    def test_fits(self):
+        boxes = [[0.3, 0.5, -0.02, 0.02],
+                 [0.3, 0.5, -0.02, 0.02],
+                 [1.5, 2.0, -0.02, 0.02]]
+        np.testing.assert_array_equal(self.family.fits(boxes), [True, False, False])
+
+    def test_fits_matches_check_fits(self):
+        rectangle = layout.Rectangle(0.2, 0.04)
+        rectangle.location = layout.Point2D(0.3, -0.02)
+        self.assertEqual(self.family[0].check_fits(rectangle),
+                         self.family[:1].fits([[0.3, 0.5, -0.02, 0.02]])[0])
+        rectangle = layout.Rectangle(0.2, 0.2)
+        rectangle.location = layout.Point2D(0.3, -0.1)
+        self.assertEqual(self.family[0].check_fits(rectangle),
+                         self.family[:1].fits([[0.3, 0.5, -0.1, 0.1]])[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+from os.path import dirname, abspath
+from pathlib import Path
+import sys
+import unittest
+import shutil
+import time
+
+this_directory = Path(dirname(abspath(__file__)))
+sys.path.append(str(this_directory) + '/../../')  # so uggo thanks to atom runner
+from uav_design_system.common import MemoryCache, DiskCache, hash_content
+
+
+class TestHashContent(unittest.TestCase):
+
+    def test_same_parts(self):
+        self.assertEqual(hash_content('a', b'b', '1'), hash_content('a', 'b', '1'))
+
+    def test_parts_separated(self):
+        self.assertNotEqual(hash_content('ab', 'c'), hash_content('a', 'bc'))
+
+
+class TestMemoryCache(unittest.TestCase):
+
+    def test_put_get(self):
+        cache = MemoryCache()
+        cache.put('key', [1])
+        self.assertEqual(cache.get('key'), [1])
+        self.assertIsNone(cache.get('other'))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evict_least_recently_used(self):
+        cache = MemoryCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = this_directory / 'cache'
+        self.cache = DiskCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(str(self.directory))
+
+    def test_put_get(self):
+        value = {'results': [{'alpha': 1.0, 'cl': 0.5}]}
+        self.cache.put('key', value)
+        self.assertEqual(self.cache.get('key'), value)
+        self.assertIn('key', self.cache)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.get('key', 1), 1)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(self.cache.hit_rate, 0)
+
+    def test_shared_directory(self):
+        self.cache.put('key', [1, 2])
+        self.assertEqual(DiskCache(self.directory).get('key'), [1, 2])
+
+    def test_evict_least_recently_used(self):
+        cache = DiskCache(self.directory, max_entries = 2)
+        cache.put('a', 1)
+        time.sleep(0.01)
+        cache.put('b', 2)
+        time.sleep(0.01)
+        cache.get('a')
+        time.sleep(0.01)
+        cache.put('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+
+    def test_evict_size(self):
+        cache = DiskCache(self.directory, max_size = 1)
+        cache.put('a', 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear(self):
+        self.cache.put('a', 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
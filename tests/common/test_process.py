@@ -1,5 +1,5 @@
 from os.path import join, exists, dirname, abspath
-from os import makedirs, getenv
+from os import makedirs, getenv, environ
 from pathlib import Path
 import sys
 import unittest
@@ -7,7 +7,9 @@ import shutil
 
 this_directory = Path(dirname(abspath(__file__)))
 sys.path.append(str(this_directory) + '/../../')  # so uggo thanks to atom runner
-from uav_design_system.common import Runner
+from uav_design_system.common import (Runner, Process, ProcessTimeoutError,
+                                      ProcessExitedError, RuntimeDirectoryError,
+                                      create_runtime_directory)
 
 class CustomFileAssertions():
 
@@ -35,35 +37,96 @@ class CustomFileAssertions():
 class TestRunner(unittest.TestCase, CustomFileAssertions):
 
     def setUp(self):
-        self.temp_folder = Path(getenv('HOME')) / 'temp'
+        self.root = this_directory / 'runtime_root'
 
     def tearDown(self):
-        pass
+        if self.root.exists():
+            shutil.rmtree(str(self.root))
 
     def test_temp_file_created(self):
         runner = Runner('test file')
+        self.temp_folder = Path(runner.run_time_directory)
         self.assertPathExists(self.temp_folder)
+        self.assertEqual(self.temp_folder.parent, Path.home())
 
     def test_runtimedir_property(self):
-        runner = Runner('test file')
-        self.assertEqual(str(self.temp_folder), runner.run_time_directory)
-
-    def test_temp_file_replaced(self):
-        self.temp_folder.mkdir()
+        runner = Runner('test file', self.root)
+        self.assertEqual(str(runner._temp_folder), runner.run_time_directory)
+
+    def test_runtimedir_unique(self):
+        runner1 = Runner('test file', self.root)
+        runner2 = Runner('test file', self.root)
+        self.assertNotEqual(runner1.run_time_directory,
+                            runner2.run_time_directory)
+        self.assertPathExists(Path(runner1.run_time_directory))
+
+    def test_root(self):
+        runner = Runner('test file', self.root)
+        self.assertEqual(Path(runner.run_time_directory).parent, self.root)
+
+    def test_root_environment_variable(self):
+        environ['UAV_RUNTIME_ROOT'] = str(self.root)
         try:
             runner = Runner('test file')
-        except FileExistsError:
-            self.fail('file not replaced')
-
-        self.assertPathExists(self.temp_folder)
+        finally:
+            del environ['UAV_RUNTIME_ROOT']
+        self.assertEqual(Path(runner.run_time_directory).parent, self.root)
 
     def test_move_to_runtime(self):
-        runner = Runner('test_file')
+        runner = Runner('test_file', self.root)
+        moved_file = runner.move_to_runtime(__file__)
+        self.assertFilesSame(moved_file, __file__)
 
     def test_delete(self):
-        runner = Runner('test_file')
+        runner = Runner('test_file', self.root)
+        temp_folder = Path(runner.run_time_directory)
         del runner
-        self.assertPathNotExists(self.temp_folder)
+        self.assertPathNotExists(temp_folder)
+
+    def test_context_manager(self):
+        with Runner('test_file', self.root) as runner:
+            temp_folder = Path(runner.run_time_directory)
+            self.assertPathExists(temp_folder)
+        self.assertPathNotExists(temp_folder)
+
+    def test_path_too_long(self):
+        with self.assertRaises(RuntimeDirectoryError):
+            create_runtime_directory('run', self.root, 10)
+        self.assertEqual(list(self.root.iterdir()), [])
+
+class TestProcess(unittest.TestCase):
+
+    def setUp(self):
+        self.process = Process.initialise_process('cat')
+
+    def tearDown(self):
+        self.process.close()
+
+    def test_read_until(self):
+        self.process.command('first line')
+        self.process.command('second line')
+        self.assertEqual(self.process.read_until('first', 5), 'first')
+        self.assertEqual(self.process.read_until('line', 5), ' line')
+        self.process.read_until('second line', 5)
+        self.assertEqual(self.process.output, '\n')
+
+    def test_read_until_timeout(self):
+        self.process.command('some text')
+        with self.assertRaises(ProcessTimeoutError) as context:
+            self.process.read_until('missing', 0.2)
+        self.assertEqual(context.exception.output, 'some text\n')
+
+    def test_read_until_exited(self):
+        process = Process.initialise_process('true')
+        with self.assertRaises(ProcessExitedError):
+            process.read_until('missing', 5)
+        process.close()
+
+    def test_clear_output(self):
+        self.process.command('some text')
+        self.process.read_until('text', 5)
+        self.process.clear_output()
+        self.assertEqual(self.process.output, '')
 
 
 if __name__ == '__main__':
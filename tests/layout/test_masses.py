@@ -6,6 +6,7 @@ sys.path.append(this_directory + "/../../")  # so uggo thanks to atom runner
 import unittest
 from uav_design_system import layout
 import copy
+import pickle
 
 class DummyMass(layout.IsArrangeable):
     pass
@@ -165,6 +166,50 @@ class TestArrangement(unittest.TestCase):
 
         self.assertEqual(arrangement3.mass, 66)
 
+    def test_total_mass_alias(self):
+        arrangement = layout.Arrangement("arrangement1", *self.mass_list)
+        self.assertEqual(arrangement.total_mass, arrangement.mass)
+
+    def test_create_mass_list_nested(self):
+        """
+        tests the mass list includes the locations of parent arrangements
+        """
+        sub_arrangement = layout.Arrangement("arrangement1", self.mass1)
+        sub_arrangement.location = layout.Point(1, 1, 1)
+        arrangement = layout.Arrangement("arrangement2", sub_arrangement)
+        self.assertEqual(arrangement.avl_mass_list,
+                         ["6   1.5   2.0   2.5    6.5   5.0   2.5"])
+
+    def test_inertia_tensor(self):
+        """
+        tests the inertia tensor includes the parallel axis shift of each mass
+        """
+        self.mass2.location = layout.Point(0, 3, 0)
+        arrangement = layout.Arrangement("arrangement1", self.mass1, self.mass2)
+        # masses 6 and 12, 2 and 1 from the center of gravity in y
+        expected = [[6.5 + 13 + 24 + 12, 0, 0],
+                    [0, 5 + 10, 0],
+                    [0, 0, 2.5 + 5 + 24 + 12]]
+        for row, expected_row in zip(arrangement.inertia_tensor.tolist(), expected):
+            for value, expected_value in zip(row, expected_row):
+                self.assertAlmostEqual(value, expected_value)
+
+    def test_avl_case_parameters(self):
+        self.mass2.location = layout.Point(2, 2, 0)
+        arrangement = layout.Arrangement("arrangement1", self.mass2, self.mass3)
+        parameters = arrangement.avl_case_parameters
+        self.assertEqual(parameters["mass"], 30)
+        self.assertAlmostEqual(parameters["x cg"], 1.3)
+        # the masses are offset along x = y so the xy product is positive
+        self.assertGreater(parameters["ixy"], 0)
+        self.assertEqual(parameters["iyz"], 0)
+        self.assertEqual(parameters["izx"], 0)
+
+    def test_avl_lumped_mass_string(self):
+        arrangement = layout.Arrangement("arrangement1", self.mass1)
+        self.assertEqual(arrangement.avl_lumped_mass_string,
+                         "6.0   0.5   1.0   1.5   6.5   5.0   2.5   0.0   0.0   0.0")
+
     def test_clone(self):
         """
         test clone method
@@ -306,6 +351,285 @@ class TestArrangement(unittest.TestCase):
         self.assertEqual(mass_list[3].location, layout.Point(-4, 7 , 12))
         self.assertEqual(mass_list[4].location, layout.Point(5, 2, 6))
 
+    def test_flatten_views(self):
+        """
+        tests flatten does not copy the masses, moving an original moves its
+        flattened view
+        """
+        arrangement = layout.Arrangement("arrangement1", *self.mass_list)
+        arrangement.location = layout.Point(1, 0, 0)
+        flattened_arrangement = arrangement.flatten()
+        self.mass1.location = layout.Point(0, 5, 0)
+        self.assertIs(flattened_arrangement.objects[0].geometry, self.mass1.geometry)
+        self.assertEqual(flattened_arrangement.objects[0].location,
+                         layout.Point(1, 5, 0))
+
+    def test_clone_independent(self):
+        """
+        tests moving the masses of a clone does not move the originals
+        """
+        arrangement = layout.Arrangement("arrangement1", *self.mass_list)
+        arrangement_clone = arrangement.clone(reflect_y = True)
+        for mass in arrangement_clone.all_mass_objects:
+            mass.location = layout.Point(0, 10, 0)
+
+        self.assertEqual(arrangement.center_of_gravity, layout.Point(0.5, 1, 1.5))
+        self.assertEqual(arrangement_clone.center_of_gravity,
+                         layout.Point(0.5, 9, 1.5))
+
+    def test_clone_nested(self):
+        """
+        tests cloning keeps nested arrangements and their locations
+        """
+        sub_arrangement = layout.Arrangement("arrangement1", *self.mass_list[:2])
+        sub_arrangement.location = layout.Point(0, 0, 1)
+        arrangement = layout.Arrangement("arrangement2", sub_arrangement,
+                                                          self.mass3)
+        arrangement_clone = arrangement.clone(reflect_y = True)
+
+        self.assertIsInstance(arrangement_clone.objects[0], layout.Arrangement)
+        self.assertEqual(arrangement_clone.objects[0].location, layout.Point(0, 0, 1))
+        self.assertEqual(arrangement_clone.mass, arrangement.mass)
+        self.assertEqual(arrangement_clone.center_of_gravity.y,
+                         -1 * arrangement.center_of_gravity.y)
+
+    def test_materialise(self):
+        """
+        tests materialise copies the masses
+        """
+        arrangement = layout.Arrangement("arrangement1", *self.mass_list)
+        arrangement.location = layout.Point(0, 0, 1)
+        copied = arrangement.clone(reflect_y = True).materialise()
+        for mass in copied.all_mass_objects:
+            self.assertIs(type(mass), layout.MassObject)
+            self.assertEqual(mass.geometry.y_size, -2)
+        self.assertEqual(copied.location, layout.Point(0, 0, 1))
+        self.assertEqual(copied.center_of_gravity, layout.Point(0.5, -1, 1.5))
+
+
+class TestTracking(unittest.TestCase):
+    """
+    tests the mass properties of an arrangement follow changes to it
+    """
+
+    def setUp(self):
+        geometry = layout.Cuboid(1, 2, 3)
+        self.mass1 = layout.MassObject(geometry, 1, "name1")
+        self.mass2 = layout.MassObject(geometry, 2, "name2")
+        self.mass3 = layout.MassObject(geometry, 3, "name3")
+        self.sub_arrangement = layout.Arrangement("sub", self.mass2, self.mass3)
+        self.arrangement = layout.Arrangement("arrangement", self.mass1,
+                                              self.sub_arrangement)
+
+    def assertMatchesRebuilt(self, arrangement):
+        """
+        compares the tracked properties to properties built from scratch
+        """
+        tracked = arrangement.mass_properties()
+        rebuilt = layout.MassProperties.from_arrangement(arrangement)
+        self.assertAlmostEqual(tracked.mass, rebuilt.mass)
+        for actual, expected in zip(tracked.center_of_gravity.as_tuple(),
+                                    rebuilt.center_of_gravity.as_tuple()):
+            self.assertAlmostEqual(actual, expected)
+        for actual, expected in zip(tracked.inertia_tensor().flat,
+                                    rebuilt.inertia_tensor().flat):
+            self.assertAlmostEqual(actual, expected)
+
+    def test_cached(self):
+        self.assertIs(self.arrangement.mass_properties(),
+                      self.arrangement.mass_properties())
+
+    def test_move_mass(self):
+        self.arrangement.mass_properties()
+        self.mass3.location = layout.Point(2, -1, 4)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_objects_read_only(self):
+        with self.assertRaises(AttributeError):
+            self.arrangement.objects.append(self.mass1)
+        self.assertEqual(len(self.arrangement.objects), 2)
+
+    def test_replace_objects(self):
+        self.arrangement.mass_properties()
+        self.sub_arrangement.objects = [self.mass2]
+        self.assertEqual(self.arrangement.mass_properties().mass, 18)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_change_density(self):
+        self.arrangement.mass_properties()
+        self.mass3.density = 10
+        self.assertEqual(self.arrangement.mass_properties().mass, 78)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_change_geometry(self):
+        self.arrangement.mass_properties()
+        self.mass1.geometry = layout.Cuboid(2, 2, 2)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_resize_geometry(self):
+        """
+        the geometry is shared by all three masses
+        """
+        self.arrangement.mass_properties()
+        self.mass1.geometry.x_size = 4
+        self.assertEqual(self.arrangement.mass_properties().mass, 144)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_replaced_geometry_not_observed(self):
+        geometry = self.mass1.geometry
+        self.mass1.geometry = layout.Cuboid(2, 2, 2)
+        properties = self.arrangement.mass_properties()
+        geometry.x_size = 4
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_materialised_geometry(self):
+        """
+        a full copy listens to its own geometry, not the original
+        """
+        copied = self.arrangement.materialise()
+        copied.mass_properties()
+        copied.objects[0].geometry.x_size = 4
+        self.assertMatchesRebuilt(copied)
+        self.assertEqual(self.arrangement.mass_properties().mass, 36)
+
+    def test_deepcopy(self):
+        """
+        a copy is tracked on its own once a mass in it moves
+        """
+        self.arrangement.mass_properties()
+        copied = copy.deepcopy(self.arrangement)
+        copied.objects[0].location = layout.Point(4, 0, 0)
+        self.assertEqual(copied.objects[0].center_of_gravity_global,
+                         layout.Point(4.5, 1, 1.5))
+        self.assertMatchesRebuilt(copied)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_pickle(self):
+        self.arrangement.mass_properties()
+        unpickled = pickle.loads(pickle.dumps(self.arrangement))
+        unpickled.mass_properties()
+        unpickled.objects[0].location = layout.Point(4, 0, 0)
+        self.assertMatchesRebuilt(unpickled)
+
+    def test_move_arrangement(self):
+        self.arrangement.mass_properties()
+        self.sub_arrangement.location = layout.Point(0, 5, 1)
+        self.assertMatchesRebuilt(self.arrangement)
+        self.assertEqual(self.arrangement.center_of_gravity_global,
+                         layout.Point(0.5, 1 + 25 / 6, 1.5 + 5 / 6))
+
+    def test_append(self):
+        properties = self.arrangement.mass_properties()
+        mass4 = layout.MassObject(layout.Cuboid(1, 1, 1), 6, "name4")
+        self.sub_arrangement.append(mass4)
+        self.assertIs(self.arrangement.mass_properties(), properties)
+        self.assertEqual(self.arrangement.mass, 42)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_append_arrangement(self):
+        self.arrangement.mass_properties()
+        nested = layout.Arrangement("nested", self.mass1)
+        nested.location = layout.Point(1, 1, 1)
+        self.arrangement.append(nested)
+        self.assertEqual(self.arrangement.mass, 42)
+        nested.location = layout.Point(2, 0, 0)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_remove(self):
+        self.arrangement.mass_properties()
+        self.sub_arrangement.remove(self.mass3)
+        self.assertEqual(self.arrangement.mass, 18)
+        self.mass3.location = layout.Point(5, 5, 5)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_remove_not_rebuilt(self):
+        properties = self.arrangement.mass_properties()
+        self.sub_arrangement.remove(self.mass2)
+        self.assertIs(self.arrangement.mass_properties(), properties)
+        self.assertEqual(self.arrangement.mass, 24)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_remove_arrangement(self):
+        properties = self.arrangement.mass_properties()
+        self.arrangement.remove(self.sub_arrangement)
+        self.assertIs(self.arrangement.mass_properties(), properties)
+        self.assertEqual(self.arrangement.mass, 6)
+        self.sub_arrangement.location = layout.Point(5, 5, 5)
+        self.mass2.location = layout.Point(5, 5, 5)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_replace_not_rebuilt(self):
+        properties = self.arrangement.mass_properties()
+        mass4 = layout.MassObject(layout.Cuboid(1, 1, 1), 6, "name4")
+        self.arrangement.objects = [self.sub_arrangement, mass4]
+        self.assertIs(self.arrangement.mass_properties(), properties)
+        self.assertEqual(self.arrangement.mass, 36)
+        self.mass1.location = layout.Point(5, 5, 5)
+        mass4.location = layout.Point(1, 2, 3)
+        self.sub_arrangement.location = layout.Point(0, 1, 0)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_remove_repeated(self):
+        """
+        an arrangement in two places is built again when changed
+        """
+        self.arrangement.append(self.sub_arrangement)
+        self.arrangement.mass_properties()
+        self.sub_arrangement.remove(self.mass2)
+        self.assertEqual(self.arrangement.mass, 42)
+        self.arrangement.remove(self.sub_arrangement)
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_many_changes(self):
+        """
+        rows stay matched to their masses through many appends and removes
+        """
+        self.arrangement.mass_properties()
+        masses = []
+        for number in range(50):
+            mass = layout.MassObject(layout.Cuboid(1, 1, 1), number + 1)
+            mass.location = layout.Point(number, -number, 2 * number)
+            masses.append(mass)
+            parent = self.sub_arrangement if number % 2 else self.arrangement
+            parent.append(mass)
+        for mass in masses[::3]:
+            parent = self.sub_arrangement if masses.index(mass) % 2 else self.arrangement
+            parent.remove(mass)
+        for mass in masses:
+            mass.location = mass.location + layout.Point(1, 2, 3)
+        self.assertEqual(len(self.arrangement.mass_properties()),
+                         len(self.arrangement.all_mass_objects))
+        self.assertMatchesRebuilt(self.arrangement)
+
+    def test_remove_missing(self):
+        with self.assertRaises(KeyError):
+            self.arrangement.remove(self.mass2)
+
+    def test_view_follows(self):
+        """
+        moving a mass moves the clones of it in another arrangement
+        """
+        arrangement = layout.Arrangement("mirror", self.arrangement.clone(reflect_y = True))
+        arrangement.mass_properties()
+        self.mass1.location = layout.Point(0, 4, 0)
+        self.assertMatchesRebuilt(arrangement)
+        self.assertEqual(arrangement.objects[0].objects[0].location,
+                         layout.Point(0, -4, 0))
+
+    def test_observers_weak(self):
+        """
+        observing the masses does not keep an arrangement alive
+        """
+        import gc, weakref
+        arrangement = layout.Arrangement("temporary", self.mass1)
+        arrangement.mass_properties()
+        reference = weakref.ref(arrangement)
+        del arrangement
+        gc.collect()
+        self.assertIsNone(reference())
+        self.mass1.location = layout.Point(1, 1, 1)
+
+
 class TestMassObject(unittest.TestCase):
 
     def setUp(self):
@@ -368,6 +692,41 @@ class TestMassObject(unittest.TestCase):
 
         self.assertEqual(mass_object.center_of_gravity, layout.Point(0.5, 1, 1.5))
 
+    def test_geometry_not_copied(self):
+        """
+        test mass objects can share a geometry and still have their own
+        locations
+        """
+        mass1 = layout.MassObject(self.geometry, 1, "name")
+        mass2 = layout.MassObject(self.geometry, 1, "name")
+        mass1.location = layout.Point(1, 2, 3)
+        self.assertIs(mass1.geometry, self.geometry)
+        self.assertEqual(mass2.location, layout.Point(0, 0, 0))
+
+    def test_clone_view(self):
+        """
+        test a clone follows the object it was cloned from, and can be moved
+        without moving it
+        """
+        mass_object = layout.MassObject(self.geometry, 1, "name")
+        cloned_mass = mass_object.clone(reflect_y = True)
+        mass_object.location = layout.Point(1, 2, 3)
+        self.assertEqual(cloned_mass.location, layout.Point(1, -2, 3))
+
+        cloned_mass.location = layout.Point(0, 0, 0)
+        self.assertEqual(mass_object.location, layout.Point(1, 2, 3))
+        self.assertEqual(cloned_mass.center_of_gravity_global,
+                         layout.Point(0.5, -1, 1.5))
+
+    def test_materialise(self):
+        mass_object = layout.MassObject(self.geometry, 1, "name")
+        mass_object.location = layout.Point(1, 2, 3)
+        copied = mass_object.clone(reflect_y = True).materialise()
+        self.assertIsNot(copied.geometry, self.geometry)
+        self.assertEqual(copied.geometry.y_size, -2)
+        self.assertEqual(copied.location, layout.Point(1, -2, 3))
+        self.assertEqual(copied.mass, mass_object.mass)
+
     def test_clone_reflect_y(self):
         self.geometry = layout.Cuboid(1,2,3)
         mass_object = layout.MassObject(self.geometry, 1, "name")
@@ -0,0 +1,150 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../")  # so uggo thanks to atom runner
+import unittest
+from uav_design_system import layout
+import numpy as np
+
+
+class TestMassProperties(unittest.TestCase):
+
+    def setUp(self):
+        geometry = layout.Cuboid(1, 2, 3)
+        self.mass1 = layout.MassObject(geometry, 1, "name1")
+        self.mass2 = layout.MassObject(geometry, 2, "name2")
+        self.mass3 = layout.MassObject(geometry, 3, "name3")
+        self.mass1.location = layout.Point(6, 5, 4)
+        self.sub_arrangement = layout.Arrangement("sub", self.mass2, self.mass3)
+        self.sub_arrangement.location = layout.Point(1, 2, 3)
+        self.arrangement = layout.Arrangement("arrangement", self.mass1,
+                                              self.sub_arrangement)
+        self.arrangement.location = layout.Point(0, 0, 1)
+
+    def test_from_arrangement(self):
+        properties = self.arrangement.mass_properties()
+        self.assertEqual(len(properties), 3)
+        self.assertIs(properties.mass_objects[0], self.mass1)
+        np.testing.assert_array_equal(properties.offsets,
+                                      [[0, 0, 1], [1, 2, 4], [1, 2, 4]])
+
+    def test_mass(self):
+        self.assertEqual(self.arrangement.mass_properties().mass, 36)
+
+    def test_centers_of_gravity(self):
+        np.testing.assert_array_equal(
+            self.arrangement.mass_properties().centers_of_gravity,
+            [[6.5, 6, 6.5], [1.5, 3, 5.5], [1.5, 3, 5.5]])
+
+    def test_center_of_gravity(self):
+        """
+        matches the center of gravity of the flattened arrangement
+        """
+        flat = self.arrangement.flatten()
+        mass = sum(mass.mass for mass in flat)
+        expected = [sum(mass.mass * getattr(mass.center_of_gravity_global, axis)
+                        for mass in flat) / mass for axis in "xyz"]
+        center = self.arrangement.mass_properties().center_of_gravity
+        np.testing.assert_allclose(center.as_tuple(), expected)
+
+    def test_inertia_tensor_single(self):
+        """
+        the inertia of a single mass about its center of gravity
+        """
+        properties = layout.MassProperties([self.mass1], [(0, 0, 0)])
+        np.testing.assert_allclose(properties.inertia_tensor(),
+                                   np.diag([6.5, 5.0, 2.5]))
+
+    def test_inertia_tensor_parallel_axis(self):
+        """
+        two equal masses either side of their center of gravity in x and y
+        """
+        mass1 = layout.MassObject(layout.Cuboid(1, 2, 3), 1)
+        mass2 = layout.MassObject(layout.Cuboid(1, 2, 3), 1)
+        mass2.location = layout.Point(2, 2, 0)
+        properties = layout.Arrangement("", mass1, mass2).mass_properties()
+        expected = np.diag([13, 10, 5]) + 12 * np.array([[1, -1, 0],
+                                                         [-1, 1, 0],
+                                                         [0, 0, 2]])
+        np.testing.assert_allclose(properties.inertia_tensor(), expected)
+
+    def test_inertia_tensor_about(self):
+        properties = layout.MassProperties([self.mass1], [(0, 0, 0)])
+        tensor = properties.inertia_tensor(layout.Point(6.5, 6, 4.5))
+        np.testing.assert_allclose(tensor, np.diag([6.5 + 6, 5.0 + 6, 2.5]))
+
+    def test_update(self):
+        properties = self.arrangement.mass_properties()
+        self.mass1.location = layout.Point(0, 0, 0)
+        properties.update(0)
+        np.testing.assert_array_equal(properties.centers_of_gravity[0],
+                                      [0.5, 1, 2.5])
+        self.assertEqual(properties.center_of_gravity,
+                         self.arrangement.center_of_gravity_global)
+
+    def test_append(self):
+        properties = layout.MassProperties([self.mass1], [(0, 0, 0)])
+        index = properties.append(self.mass2, (1, 1, 1))
+        self.assertEqual(index, 1)
+        self.assertEqual(properties.mass, 18)
+        np.testing.assert_array_equal(properties.centers_of_gravity[1],
+                                      [1.5, 2, 2.5])
+        expected = layout.MassProperties([self.mass1, self.mass2],
+                                         [(0, 0, 0), (1, 1, 1)])
+        np.testing.assert_allclose(properties.inertia_tensor(),
+                                   expected.inertia_tensor(), atol = 1e-12)
+
+    def test_append_many(self):
+        properties = layout.MassProperties()
+        for number in range(10):
+            properties.append(self.mass1, (number, 0, 0))
+        self.assertEqual(len(properties), 10)
+        self.assertEqual(properties.offsets.shape, (10, 3))
+        self.assertEqual(properties.mass, 60)
+        np.testing.assert_array_equal(properties.offsets[:, 0], range(10))
+
+    def test_remove(self):
+        properties = self.arrangement.mass_properties()
+        moved = properties.remove(0)
+        self.assertEqual(moved, 2)
+        self.assertIs(properties.mass_objects[0], self.mass3)
+        self.assertEqual(properties.mass, 30)
+        expected = layout.MassProperties([self.mass3, self.mass2],
+                                         [(1, 2, 4), (1, 2, 4)])
+        np.testing.assert_array_equal(properties.centers_of_gravity,
+                                      expected.centers_of_gravity)
+        np.testing.assert_allclose(properties.inertia_tensor(),
+                                   expected.inertia_tensor(), atol = 1e-12)
+
+    def test_remove_last(self):
+        properties = layout.MassProperties([self.mass1], [(0, 0, 0)])
+        self.assertIsNone(properties.remove(0))
+        self.assertEqual(len(properties), 0)
+        self.assertEqual(properties.mass, 0)
+
+    def test_move(self):
+        properties = self.arrangement.mass_properties()
+        properties.move([1, 2], [1, 0, 0])
+        np.testing.assert_array_equal(properties.offsets[1:], [[2, 2, 4], [2, 2, 4]])
+        np.testing.assert_allclose(properties.first_moment,
+                                   properties.masses @ properties.centers_of_gravity)
+
+    def test_refresh(self):
+        """
+        the running sums match the sums of every row after many updates
+        """
+        properties = self.arrangement.mass_properties()
+        for x in np.linspace(-100, 100, 1001):
+            self.mass1.location = layout.Point(x, 3 * x, 1)
+        tensor = properties.inertia_tensor()
+        properties.refresh()
+        np.testing.assert_allclose(tensor, properties.inertia_tensor(), atol = 1e-9)
+
+    def test_empty(self):
+        properties = layout.Arrangement("empty").mass_properties()
+        self.assertEqual(len(properties), 0)
+        self.assertEqual(properties.mass, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
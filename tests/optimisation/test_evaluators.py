@@ -0,0 +1,150 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../")  # so uggo thanks to atom runner
+import os
+import math
+import threading
+import unittest
+import uav_design_system.optimisation as opt
+
+
+def square(child):
+    return child.inputs["x"] ** 2
+
+
+def failing(child):
+    if child.inputs["x"] == 3:
+        raise ValueError("analysis failed")
+    return child.inputs["x"] ** 2
+
+
+def crashing(child):
+    # kills the worker process running it
+    if child.inputs["x"] == 3:
+        os._exit(1)
+    return child.inputs["x"] ** 2
+
+
+class TestEvaluators(unittest.TestCase):
+
+    def setUp(self):
+        self.children = [opt.Child({"x": x}) for x in range(6)]
+        self.expected = [x ** 2 for x in range(6)]
+
+    def check(self, evaluator):
+        with evaluator:
+            self.assertEqual(evaluator.evaluate(square, self.children),
+                             self.expected)
+            expected = list(self.expected)
+            expected[3] = math.inf
+            self.assertEqual(evaluator.evaluate(failing, self.children), expected)
+            self.assertEqual(evaluator.failures, 1)
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            opt.Evaluator()
+
+    def test_serial(self):
+        self.check(opt.SerialEvaluator())
+
+    def test_process_pool(self):
+        self.check(opt.ProcessPoolEvaluator(2))
+
+    def test_task_queue(self):
+        self.check(opt.TaskQueueEvaluator(3))
+
+    def test_submit(self):
+        with opt.TaskQueueEvaluator(2) as evaluator:
+            future = evaluator.submit(square, self.children[2])
+            self.assertEqual(future.result(), 4)
+
+    def test_failure_fitness(self):
+        evaluator = opt.SerialEvaluator(retries = 0, failure_fitness = 1e6)
+        self.assertEqual(evaluator.evaluate(failing, self.children)[3], 1e6)
+
+    def test_worker_crash(self):
+        """
+        the pool is started again after a worker dies, and only the child
+        that kills it is failed
+        """
+        with opt.ProcessPoolEvaluator(2) as evaluator:
+            fitnesses = evaluator.evaluate(crashing, self.children)
+            self.assertEqual(fitnesses[3], math.inf)
+            self.assertEqual(fitnesses[:3] + fitnesses[4:],
+                             self.expected[:3] + self.expected[4:])
+            self.assertEqual(evaluator.evaluate(square, self.children),
+                             self.expected)
+
+    def test_stale_failure(self):
+        """
+        a failure from a pool that has already been replaced leaves the
+        current pool running
+        """
+        with opt.ProcessPoolEvaluator(2) as evaluator:
+            stale = evaluator.submit(crashing, self.children[3])
+            error = stale.exception()
+            evaluator.failed(error, stale)
+            fresh = evaluator.submit(square, self.children[2])
+            executor = evaluator._executor
+            evaluator.failed(error, stale)
+            self.assertIs(evaluator._executor, executor)
+            self.assertEqual(fresh.result(), 4)
+
+
+class TestGeneticEvaluation(unittest.TestCase):
+
+    class CountingGenetic(opt.Genetic):
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.evaluations = 0
+            # fitness runs on the evaluators threads
+            self.lock = threading.Lock()
+
+        def fitness(self, child):
+            with self.lock:
+                self.evaluations += 1
+            return child.inputs["name1"]
+
+    def setUp(self):
+        schema = opt.Schema.from_dict({"name1": {"max": 5, "min": 4}})
+        self.genetic = self.CountingGenetic(opt.GeneticFactory(), schema,
+                                            opt.TaskQueueEvaluator(4))
+
+    def tearDown(self):
+        self.genetic.evaluator.close()
+
+    def test_filter_population(self):
+        population = self.genetic.generate_initial_population(10)
+        best = self.genetic.filter_population(population)
+        self.assertEqual(len(best), 5)
+        fitnesses = [child.fitness for child in best]
+        self.assertEqual(fitnesses, sorted(fitnesses))
+        self.assertEqual(fitnesses, [child.inputs["name1"] for child in best])
+
+    def test_fitness_cached(self):
+        # distinct inputs, random children can match
+        population = [opt.Child({"name1": 4 + i / 10}) for i in range(10)]
+        self.genetic.filter_population(population)
+        self.genetic.filter_population(population)
+        self.assertEqual(self.genetic.evaluations, 10)
+
+    def test_duplicates_evaluated_once(self):
+        population = [opt.Child({"name1": 4.5}) for _ in range(4)]
+        self.genetic.evaluate_population(population)
+        self.assertEqual(self.genetic.evaluations, 1)
+        self.assertEqual([child.fitness for child in population], [4.5] * 4)
+        self.assertEqual(self.genetic.cache.hits, 3)
+
+    def test_cache_between_populations(self):
+        self.genetic.evaluate_population([opt.Child({"name1": 4.5})])
+        self.genetic.evaluate_population([opt.Child({"name1": 4.5}),
+                                          opt.Child({"name1": 4.6})])
+        self.assertEqual(self.genetic.evaluations, 2)
+        self.assertEqual(self.genetic.cache.hits, 1)
+        self.assertEqual(self.genetic.cache.misses, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../")  # so uggo thanks to atom runner
+import pickle
+import unittest
+import uav_design_system.optimisation as opt
+
+
+class TestFitnessCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = opt.FitnessCache()
+        self.cache.put({"a": 1.0, "b": 2.0}, 5.0)
+
+    def test_get(self):
+        self.assertEqual(self.cache.get({"b": 2.0, "a": 1.0}), 5.0)
+        self.assertIsNone(self.cache.get({"a": 1.0, "b": 2.00001}))
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hit_rate, 0.5)
+
+    def test_contains(self):
+        self.assertIn({"a": 1.0, "b": 2.0}, self.cache)
+        self.assertNotIn({"a": 1.0}, self.cache)
+
+    def test_resolution(self):
+        cache = opt.FitnessCache(resolution = 0.01)
+        cache.put({"a": 1.0, "b": 2.0}, 5.0)
+        self.assertEqual(cache.get({"a": 1.001, "b": 1.998}), 5.0)
+        self.assertIsNone(cache.get({"a": 1.01, "b": 2.0}))
+
+    def test_max_entries(self):
+        cache = opt.FitnessCache(max_entries = 2)
+        for a in range(3):
+            cache.put({"a": a}, a)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn({"a": 0}, cache)
+
+    def test_pickle(self):
+        cache = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual(cache.get({"a": 1.0, "b": 2.0}), 5.0)
+        cache.put({"a": 0}, 1.0)
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
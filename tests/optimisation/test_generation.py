@@ -0,0 +1,40 @@
+from os.path import dirname, abspath
+this_directory = dirname(abspath(__file__))
+import sys
+sys.path.append(this_directory + "/../../")  # so uggo thanks to atom runner
+import os
+import tempfile
+import unittest
+import uav_design_system.optimisation as opt
+
+
+class TestGeneration(unittest.TestCase):
+
+    def setUp(self):
+        self.population = []
+        for fitness in (3.0, 1.0, 2.0):
+            child = opt.Child({"x": fitness * 10})
+            child.fitness = fitness
+            self.population.append(child)
+        self.generation = opt.Generation(4, self.population)
+
+    def test_best(self):
+        self.assertIs(self.generation.best, self.population[1])
+
+    def test_summary(self):
+        self.assertEqual(self.generation.summary(),
+                         {"generation": 4, "size": 3, "best": 1.0, "mean": 2.0,
+                          "worst": 3.0, "best_inputs": {"x": 10.0}})
+
+    def test_summary_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            sink = opt.SummaryFile(os.path.join(directory, "summaries.jsonl"))
+            sink(self.generation.summary())
+            sink(self.generation.summary())
+            summaries = sink.read()
+        self.assertEqual(len(summaries), 2)
+        self.assertEqual(summaries[1], self.generation.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,10 @@ from os import makedirs
 this_directory = dirname(abspath(__file__))
 import sys
 sys.path.append(this_directory + "/../../")  # so uggo thanks to atom runner
+import math
+import tempfile
+import threading
+import time
 import unittest
 import uav_design_system.optimisation as opt
 
@@ -86,8 +90,19 @@ class TestCase(unittest.TestCase):
         self.assertEqual(self.genetic._confine(7, 4, 6), 6)
 
     def test_run(self):
-        children = self.genetic()
-        self.assertEqual(len(children), 100)
+        summaries = []
+        children = self.genetic(sink = summaries.append)
+        self.assertEqual(len(children), self.genetic.ELITES)
+        self.assertIs(children, self.genetic.elites)
+        self.assertEqual(len(summaries), 10)
+        self.assertEqual(self.genetic.history[-1].number, 9)
+
+    def test_run_genetic_deprecated(self):
+        population = self.genetic.generate_initial_population(6)
+        with self.assertWarns(DeprecationWarning):
+            children = self.genetic.run_genetic(population, 0, 3)
+        self.assertEqual(len(children), self.genetic.ELITES)
+        self.assertEqual(len(self.genetic.history), 3)
 
     def test_generate_next_population(self):
         initial_population = []
@@ -98,6 +113,294 @@ class TestCase(unittest.TestCase):
         new_population = self.genetic.generate_next_population(initial_population)
         self.assertEqual(len(new_population), 10)
 
+    def test_next_population_unique(self):
+        parents = [opt.Child({"name1": 4.5, "name2": 4}),
+                   opt.Child({"name1": 4.2, "name2": 3})]
+        population = self.genetic.generate_next_population(parents * 3)
+        self.assertEqual(len(population), 12)
+        inputs = [tuple(child.inputs.items()) for child in population + parents]
+        self.assertEqual(len(set(inputs)), len(inputs))
+        self.assertGreater(self.genetic.duplicates, 0)
+
+    def test_generations(self):
+        population = self.genetic.generate_initial_population(6)
+        generations = list(self.genetic.generations(population, 4))
+        self.assertEqual([generation.number for generation in generations],
+                         [0, 1, 2, 3])
+        for generation in generations:
+            self.assertEqual(len(generation), 6)
+            self.assertNotIn(None, generation.fitnesses)
+
+    def test_generations_unbounded(self):
+        population = self.genetic.generate_initial_population(4)
+        for generation in self.genetic.generations(population):
+            if generation.number == 5:
+                break
+        self.assertEqual(generation.number, 5)
+
+    def test_run_bounded(self):
+        summaries = []
+        elites = self.genetic.run(6, 2000, summaries.append)
+        self.assertEqual(len(elites), self.genetic.ELITES)
+        fitnesses = [child.fitness for child in elites]
+        self.assertEqual(fitnesses, sorted(fitnesses))
+        self.assertEqual(len(self.genetic.history), self.genetic.HISTORY)
+        self.assertEqual(self.genetic.history[-1].number, 1999)
+        self.assertEqual(len(summaries), 2000)
+        self.assertEqual(summaries[0]["generation"], 0)
+
+class TestCheckpoint(unittest.TestCase):
+
+    class SumGenetic(opt.Genetic):
+
+        def fitness(self, child):
+            return sum(child.inputs.values())
+
+    def setUp(self):
+        self.schema = opt.Schema.from_dict({"name1": {"max": 5, "min": 4},
+                                            "name2": {"max": 7, "min": 2}})
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = join(directory.name, "run.checkpoint")
+
+    def genetic(self, seed = 7):
+        return self.SumGenetic(opt.GeneticFactory(), self.schema, seed = seed)
+
+    def record(self, genetic):
+        return ([(child.inputs, child.fitness) for child in genetic.elites],
+                [generation.summary() for generation in genetic.history])
+
+    def test_seed(self):
+        self.genetic().run(6, 5)
+        first, second = self.genetic(), self.genetic()
+        first.run(6, 5)
+        second.run(6, 5)
+        self.assertEqual(self.record(first), self.record(second))
+
+    def test_save_checkpoint(self):
+        genetic = self.genetic()
+        genetic.run(6, 3, checkpoint = self.path)
+        self.assertTrue(exists(self.path))
+        generation = self.genetic(seed = 1).load_checkpoint(self.path)
+        self.assertEqual(generation.number, 2)
+        self.assertEqual(generation.fitnesses, genetic.history[-1].fitnesses)
+
+    def test_checkpoint_cache(self):
+        genetic = self.genetic()
+        genetic.run(6, 3, checkpoint = self.path)
+        resumed = self.genetic(seed = 1)
+        resumed.load_checkpoint(self.path)
+        self.assertEqual(len(resumed.cache), len(genetic.cache))
+        self.assertEqual(resumed.cache.misses, genetic.cache.misses)
+
+    def test_resume(self):
+        """
+        a run stopped after a checkpoint and resumed matches one that ran
+        without stopping
+        """
+        uninterrupted = self.genetic()
+        uninterrupted.run(6, 30)
+
+        self.genetic().run(6, 12, checkpoint = self.path, checkpoint_every = 4)
+        resumed = self.genetic(seed = 1)
+        summaries = []
+        resumed.resume(self.path, 30, summaries.append)
+        self.assertEqual(summaries[0]["generation"], 12)
+        self.assertEqual(self.record(resumed), self.record(uninterrupted))
+
+    def test_resume_finished(self):
+        finished = self.genetic()
+        finished.run(6, 3, checkpoint = self.path)
+        genetic = self.genetic(seed = 1)
+        genetic.resume(self.path, 3)
+        self.assertEqual(self.record(genetic), self.record(finished))
+
+
+class TestSteadyState(unittest.TestCase):
+
+    class SlowGenetic(opt.Genetic):
+        """
+        evaluations take varying times
+        """
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.lock = threading.Lock()
+            self.evaluations = 0
+
+        def fitness(self, child):
+            with self.lock:
+                self.evaluations += 1
+            time.sleep(0.002 * (child.inputs["name1"] - 4))
+            return sum(child.inputs.values())
+
+    class BlockedGenetic(SlowGenetic):
+        """
+        the first child evaluated is held until others have been evaluated
+        after it, which a run waiting for every child of a generation
+        never does
+        """
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.release = threading.Event()
+            self.released = None
+
+        def fitness(self, child):
+            with self.lock:
+                self.evaluations += 1
+                first = self.evaluations == 1
+                if self.evaluations == 20:
+                    self.release.set()
+            if first:
+                self.released = self.release.wait(10)
+            return sum(child.inputs.values())
+
+    class FlakyGenetic(SlowGenetic):
+        """
+        every child fails the first time it is evaluated
+        """
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.attempted = set()
+
+        def fitness(self, child):
+            with self.lock:
+                first = id(child) not in self.attempted
+                self.attempted.add(id(child))
+            if first:
+                raise ValueError("solver crashed")
+            return super().fitness(child)
+
+    def setUp(self):
+        schema = opt.Schema.from_dict({"name1": {"max": 5, "min": 4},
+                                       "name2": {"max": 7, "min": 2}})
+        self.genetic = self.SlowGenetic(opt.GeneticFactory(), schema,
+                                        opt.TaskQueueEvaluator(4), seed = 3)
+
+    def tearDown(self):
+        self.genetic.evaluator.close()
+
+    def test_steady_state(self):
+        summaries = []
+        elites = self.genetic.steady_state(8, 80, concurrency = 4,
+                                           sink = summaries.append)
+        self.assertEqual(self.genetic.evaluations, 80)
+        self.assertEqual(len(elites), 8)
+        fitnesses = [child.fitness for child in elites]
+        self.assertEqual(fitnesses, sorted(fitnesses))
+        self.assertEqual(len(summaries), 10)
+        self.assertLess(summaries[-1]["mean"], summaries[0]["mean"])
+
+    def test_not_held_by_slow_child(self):
+        """
+        other children are bred and evaluated while one is still running
+        """
+        genetic = self.BlockedGenetic(opt.GeneticFactory(), self.genetic.schema,
+                                      self.genetic.evaluator, seed = 3)
+        genetic.steady_state(8, 40, concurrency = 4)
+        self.assertTrue(genetic.released)
+        self.assertEqual(genetic.evaluations, 40)
+
+    def test_retry(self):
+        genetic = self.FlakyGenetic(opt.GeneticFactory(), self.genetic.schema,
+                                    self.genetic.evaluator, seed = 3)
+        elites = genetic.steady_state(8, 20, concurrency = 4)
+        self.assertEqual(genetic.evaluations, 20)
+        self.assertEqual(genetic.evaluator.failures, 0)
+        self.assertNotIn(math.inf, [child.fitness for child in elites])
+
+    def test_tournament(self):
+        pool = []
+        for fitness in range(5):
+            child = opt.Child({"name1": 4, "name2": 2})
+            child.fitness = fitness
+            pool.append(child)
+        self.genetic.TOURNAMENT_SIZE = 5
+        self.assertIs(self.genetic.tournament(pool), pool[0])
+
+    def test_serial(self):
+        genetic = self.SlowGenetic(opt.GeneticFactory(), self.genetic.schema)
+        self.assertEqual(len(genetic.steady_state(4, 10)), 4)
+        self.assertEqual(genetic.evaluations, 10)
+
+
+class TestValidity(unittest.TestCase):
+
+    class LowGenetic(opt.Genetic):
+        """
+        only children with name1 below 4.5 are valid
+        """
+
+        def is_valid_child(self, child):
+            return child.inputs["name1"] < 4.5
+
+    def setUp(self):
+        schema = opt.Schema.from_dict({"name1": {"max": 5, "min": 4},
+                                       "name2": {"max": 7, "min": 2}})
+        self.genetic = self.LowGenetic(opt.GeneticFactory(), schema)
+
+    def test_is_valid_population(self):
+        population = [opt.Child({"name1": 4.2, "name2": 3}),
+                      opt.Child({"name1": 4.8, "name2": 3})]
+        self.assertEqual(self.genetic.is_valid_population(population).tolist(),
+                         [True, False])
+
+    def test_initial_population_valid(self):
+        population = self.genetic.generate_initial_population(20)
+        self.assertEqual(len(population), 20)
+        for child in population:
+            self.assertTrue(child.inputs["name1"] < 4.5)
+
+    def test_next_population_valid(self):
+        parents = [opt.Child({"name1": 4.49, "name2": 3}),
+                   opt.Child({"name1": 4.2, "name2": 5})]
+        population = self.genetic.generate_next_population(parents)
+        self.assertEqual(len(population), 4)
+        for child in population:
+            self.assertTrue(child.inputs["name1"] < 4.5)
+
+
+class TestAircraftValidity(unittest.TestCase):
+
+    def setUp(self):
+        self.input_dict = {"cord_1": 0.8,
+                           "battery_x_loc": 0.3,
+                           "aerofoil_1_thickness": 0.2,
+                           "aerofoil_1_camber": 0.0,
+                           "aerofoil_1_thickness_loc": 0.4,
+                           "aerofoil_2_thickness": 0.15,
+                           "aerofoil_2_camber": 0.02,
+                           "aerofoil_2_thickness_loc": 0.4,
+                           "aerofoil_3_thickness": 0.1,
+                           "aerofoil_3_camber": 0.1,
+                           "aerofoil_3_thickness_loc": 0.4}
+        self.genetic = opt.AircraftGenetic(opt.GeneticFactory(), opt.Schema())
+
+    def test_aerofoil_parameters(self):
+        parameters = self.genetic.aerofoil_parameters(self.input_dict)
+        self.assertEqual(parameters[0], [0.2, -0.2, 0.2, 0.4, 0.0])
+        self.assertEqual(parameters[2], [0.1, -0.1, 0.1, 0.4, 0.1])
+
+    def test_valid(self):
+        self.assertTrue(self.genetic.is_valid_child(opt.Child(self.input_dict)))
+
+    def test_battery_does_not_fit(self):
+        self.input_dict["cord_1"] = 0.3
+        self.assertFalse(self.genetic.is_valid_child(opt.Child(self.input_dict)))
+
+    def test_crossed_surfaces(self):
+        self.input_dict["aerofoil_2_thickness"] = -0.05
+        self.assertFalse(self.genetic.is_valid_child(opt.Child(self.input_dict)))
+
+    def test_population(self):
+        invalid_dict = dict(self.input_dict, aerofoil_1_thickness_loc = 1.5)
+        population = [opt.Child(self.input_dict), opt.Child(invalid_dict)]
+        self.assertEqual(self.genetic.is_valid_population(population).tolist(),
+                         [True, False])
+
+
 class TestChild(unittest.TestCase):
 
     def setUp(self):
@@ -1,3 +1,5 @@
 from .analysis import *
 from . import xfoil
 from . import athena_vortex_lattice
+from . import vortex_lattice
+from . import panel_method
@@ -7,9 +7,12 @@ this_directory = dirname(abspath(__file__))
 import sys
 sys.path.append(this_directory + "/../../")  # so uggo thanks to atom runner
 from uav_design_system import layout, aerodynamics as aero
+from uav_design_system.aerofoil import PointDistribution
 import tempfile
 import shutil
 import math
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
 
 class Inputs():
 
@@ -93,34 +96,96 @@ class AerodynamicStudy():
 
 
 
+class VortexLatticeBackend(Enum):
+    """
+    Used for selection of the code that trims the plane and finds the induced
+    drag: the avl executable or the vortex lattice solver in this package
+    """
+    AVL = 1
+    NATIVE = 2
+
+
+class AerofoilBackend(Enum):
+    """
+    Used for selection of the code that finds the section polars: the xfoil
+    executable or the panel method in this package
+    """
+    XFOIL = 1
+    PANEL = 2
+
+
 class AerodynamicAnalysis():
 
-    def __init__(self, plane, case, arrangement):
+    # step of the alpha sweep run around each sections angle of attack
+    ALPHA_STEP = 0.1
+    # points written for each surface of an aerofoil. xfoil converges with
+    # around 60 cosine spaced points, set these to use them. changing them
+    # changes the files the polar cache is keyed by, so cached polars are
+    # not reused
+    AEROFOIL_POINTS = 100
+    AEROFOIL_DISTRIBUTION = PointDistribution.UNIFORM
+
+    def __init__(self, plane, case, arrangement, xfoil_pool = None,
+                 max_workers = 1, polar_cache = None, avl_cache = None,
+                 backend = VortexLatticeBackend.AVL,
+                 aerofoil_backend = AerofoilBackend.XFOIL):
         self.plane = plane
         self.case = case
         self.arrangement = arrangement
+        self.max_workers = max_workers
+        self.polar_cache = polar_cache
+        self.avl_cache = avl_cache
+        self.backend = backend
 
         #set xfoil path
         self.xfoil_file_path = "/Applications/Xfoil.app/Contents/Resources/xfoil"
         self.xfoil_results_dir = tempfile.mkdtemp()
 
+        # reuse the callers xfoil workers if given, otherwise start our own
+        self._owns_xfoil_pool = xfoil_pool is None
+        if self._owns_xfoil_pool and aerofoil_backend is AerofoilBackend.PANEL:
+            xfoil_pool = aero.panel_method.PanelRunner()
+        elif self._owns_xfoil_pool:
+            xfoil_pool = aero.xfoil.XfoilPool(self.xfoil_file_path,
+                                              size = max_workers)
+        self.xfoil_pool = xfoil_pool
+
         #setup athena_vortex_lattice
         self.athena_results_dir = tempfile.mkdtemp()
 
     def __del__(self):
+        if self._owns_xfoil_pool:
+            self.xfoil_pool.close()
         shutil.rmtree(self.xfoil_results_dir)
         shutil.rmtree(self.athena_results_dir)
 
+    def _run_vortex_lattice(self):
+        # moments about the centre of gravity, as avl does with the mass file
+        reference_point = None
+        if self.arrangement.all_mass_objects:
+            reference_point = self.arrangement.center_of_gravity_global.as_tuple()
+        solver = aero.vortex_lattice.VortexLatticeSolver(self.plane, self.case,
+                                                         reference_point)
+        return solver()
+
     def _run_avl(self):
+        if self.backend is VortexLatticeBackend.NATIVE:
+            return self._run_vortex_lattice()
+
         avl_file, aerofoil_files, case_file, mass_file = self._generate_avl_files(self.plane,
                                                                                  self.case,
                                                                                  self.arrangement)
-        avl_runner = aero.athena_vortex_lattice.AVLRunner()
-        avl_runner.setup_analysis(avl_file,
-                                       mass_file,
-                                       case_file,
-                                       *aerofoil_files)
-        return avl_runner.generate_results(self.athena_results_dir)
+        if self.avl_cache is not None:
+            return self.avl_cache(aero.athena_vortex_lattice.AVLRunner,
+                                  avl_file, mass_file, case_file,
+                                  *aerofoil_files)
+
+        with aero.athena_vortex_lattice.AVLRunner() as avl_runner:
+            avl_runner.setup_analysis(avl_file,
+                                      mass_file,
+                                      case_file,
+                                      *aerofoil_files)
+            return avl_runner.generate_results()
 
     def _generate_avl_files(self, plane, case, arrangement):
         run_file = join(self.athena_results_dir, "run.avl")
@@ -132,29 +197,49 @@ class AerodynamicAnalysis():
 
     def _run_xfoil(self, aerofoil_file, aerofoil, angle_of_attack, reynolds_number):
         with open(aerofoil_file, "w") as open_file:
-            aerofoil.write(open_file)
-        xfoil_runner = aero.xfoil.XfoilRunner(self.xfoil_file_path)
-        xfoil_runner.setup_analysis(aerofoil_file, reynolds_number)
-        result =  xfoil_runner(angle_of_attack - 4, angle_of_attack + 1, 0.1, False).get_alpha(angle_of_attack)
-        return result
+            aerofoil.write(open_file, self.AEROFOIL_POINTS,
+                           self.AEROFOIL_DISTRIBUTION)
+        if self.polar_cache is None:
+            results = self.xfoil_pool(aerofoil_file, reynolds_number,
+                                      angle_of_attack - 4, angle_of_attack + 1,
+                                      self.ALPHA_STEP)
+        else:
+            # snap the sweep to the step so nearby angles share a cached polar
+            start = round(angle_of_attack / self.ALPHA_STEP) * self.ALPHA_STEP
+            results = self.polar_cache(self.xfoil_pool, aerofoil_file,
+                                       reynolds_number, round(start - 4, 6),
+                                       round(start + 1, 6), self.ALPHA_STEP)
+        return results.get_closest_alpha(angle_of_attack)
+
+    def _run_xfoil_section(self, alpha, i, j, section):
+        angle_of_attack = section.twist_angle + alpha
+        # calc reynolds number
+        reynolds_number = (self.case["density"] * self.case["velocity"] * section.cord)/ (1.983e-5)
+        # create aerofoil_file_name
+        aerofoil_file_name = join(self.xfoil_results_dir, f"surf{i}_sec{j}_af.txt")
+        return self._run_xfoil(aerofoil_file_name,
+                               section.aerofoil,
+                               angle_of_attack,
+                               reynolds_number)
 
     def _run_xfoil_plane(self, alpha):
+        """
+        runs xfoil on every section, sections are independent once alpha is
+        known so up to max_workers of them are run at the same time
+        """
+        with ThreadPoolExecutor(max_workers = self.max_workers) as executor:
+            futures = {}
+            for i, surface in enumerate(self.plane):
+                futures[i] = {}
+                for j, section in enumerate(surface):
+                    futures[i][j] = executor.submit(self._run_xfoil_section,
+                                                    alpha, i, j, section)
+
+        # return results dictionary
         xfoil_results = {}
-        for i, surface in enumerate(self.plane):
-            surf_dict = {}
-            xfoil_results[i] = surf_dict
-            for j, section in enumerate(surface):
-                angle_of_attack = section.twist_angle + alpha
-                # calc reynolds number
-                reynolds_number = (self.case["density"] * self.case["velocity"] * section.cord)/ (1.983e-5)
-                # create aerofoil_file_name
-                aerofoil_file_name = join(self.xfoil_results_dir, f"surf{i}_sec{j}_af.txt")
-                result = self._run_xfoil(aerofoil_file_name,
-                                         section.aerofoil,
-                                         angle_of_attack,
-                                         reynolds_number)
-                # return results dictionary
-                surf_dict[j] = result
+        for i, surf_futures in futures.items():
+            xfoil_results[i] = {j: future.result()
+                                for j, future in surf_futures.items()}
         return xfoil_results
 
     def _run_analysis(self):
@@ -165,8 +250,21 @@ class AerodynamicAnalysis():
         return xfoil_results, avl_results
 
     @staticmethod
-    def run(plane, case, arrangement) -> AerodynamicStudy:
-        analyser = AerodynamicAnalysis(plane, case, arrangement)
+    def run(plane, case, arrangement, xfoil_pool = None,
+            max_workers = 1, polar_cache = None, avl_cache = None,
+            backend = VortexLatticeBackend.AVL,
+            aerofoil_backend = AerofoilBackend.XFOIL) -> AerodynamicStudy:
+        """
+        runs avl and xfoil on the plane, pass an xfoil.XfoilPool to reuse
+        xfoil processes between analyses. max_workers sets how many sections
+        are run through xfoil at the same time. pass an xfoil.PolarCache and
+        an athena_vortex_lattice.AVLCache to reuse results from earlier
+        analyses. backend selects avl or the native vortex lattice solver,
+        aerofoil_backend selects xfoil or the panel method
+        """
+        analyser = AerodynamicAnalysis(plane, case, arrangement, xfoil_pool,
+                                       max_workers, polar_cache, avl_cache,
+                                       backend, aerofoil_backend)
         xfoil_results, avl_results = analyser._run_analysis()
 
         input = Inputs(plane, case, arrangement)
@@ -1,4 +1,5 @@
-from .run import AVLRunner
+from .run import AVLRunner, AVLError, AVLTimeoutError
+from .cache import AVLCache
 from .surface import *
 from .case import *
 from .results import *
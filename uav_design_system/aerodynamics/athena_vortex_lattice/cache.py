@@ -0,0 +1,95 @@
+"""
+cache of avl results so identical planes are not analysed again
+"""
+from ...common import MemoryCache, DiskCache, hash_content
+from .results import AVLResults
+
+
+def _canonical(content: str, skip_title: bool = False) -> str:
+    """
+    content of an avl input file without the title, comments or blank lines,
+    which do not change the results
+    """
+    lines = content.split("\n")
+    if skip_title:
+        lines = lines[1:]
+    lines = [line.rstrip() for line in lines]
+    return "\n".join(line for line in lines
+                     if line and not line.lstrip().startswith("#"))
+
+
+class AVLCache():
+    """
+    stores avl results keyed on the content of the avl, mass, case and
+    aerofoil files. results are kept in memory and, if a directory is given,
+    on disk where they can be shared between processes
+    """
+
+    def __init__(self, max_entries: int = 128, directory: str = None,
+                 max_size: int = None):
+        """
+        inputs:
+            max_entries: number of results kept in memory
+            directory: folder to also store results in, memory only if None
+            max_size: bytes of results kept on disk
+        """
+        self.memory = MemoryCache(max_entries)
+        self.store = None if directory is None else DiskCache(directory, max_size)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0
+
+    def key(self, avl_file, mass_file, case_file, *aerofoil_files) -> str:
+        """
+        key of an analysis from its input files
+        """
+        parts = []
+        for file_path, skip_title in [(avl_file, True), (mass_file, False),
+                                      (case_file, False)]:
+            with open(file_path) as open_file:
+                parts.append(_canonical(open_file.read(), skip_title))
+        for file_path in aerofoil_files:
+            with open(file_path) as open_file:
+                parts.append(_canonical(open_file.read(), True))
+        return hash_content(*parts)
+
+    def get(self, key: str):
+        """
+        returns the stored AVLResults, or None if the key is not stored
+        """
+        results_dict = self.memory.get(key)
+        if results_dict is None and self.store is not None:
+            results_dict = self.store.get(key)
+            if results_dict is not None:
+                self.memory.put(key, results_dict)
+
+        if results_dict is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return AVLResults(results_dict)
+
+    def put(self, key: str, results: AVLResults):
+        self.memory.put(key, results._results_dict)
+        if self.store is not None:
+            self.store.put(key, results._results_dict)
+
+    def __call__(self, runner_factory, avl_file, mass_file, case_file,
+                 *aerofoil_files):
+        """
+        returns the stored results for the files, or runs avl with a runner
+        made by runner_factory (e.g. AVLRunner) and stores the results
+        """
+        key = self.key(avl_file, mass_file, case_file, *aerofoil_files)
+        results = self.get(key)
+        if results is None:
+            with runner_factory() as avl_runner:
+                avl_runner.setup_analysis(avl_file, mass_file, case_file,
+                                          *aerofoil_files)
+                results = avl_runner.generate_results()
+            self.put(key, results)
+        return results
@@ -78,12 +78,23 @@ class TrimCase():
 
     def __init__(self, ref_area, **kwargs):
 
-        self._case_parameters = TrimCase.CASEPARAMETERS
+        # copy so each case has its own parameters
+        self._case_parameters = dict(TrimCase.CASEPARAMETERS)
         self._ref_area = ref_area
 
         for kwarg in kwargs:
             self[kwarg] = kwargs[kwarg]
 
+    @classmethod
+    def from_arrangement(cls, ref_area, arrangement: "Arrangement", **kwargs):
+        """
+        case with the mass, center of gravity and inertias of a layout
+        arrangement, other parameters as key word arguments
+        """
+        parameters = dict(arrangement.avl_case_parameters)
+        parameters.update(kwargs)
+        return cls(ref_area, **parameters)
+
     def set_trim_cl(self, velocity, density, mass, gravity, area):
         self._case_parameters["cl"] = mass*gravity/(0.5*density*velocity*velocity*area)
 
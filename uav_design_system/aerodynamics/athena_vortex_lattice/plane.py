@@ -73,7 +73,8 @@ class Plane:
 
     def _write_aerofoil_file(self, file_path, aerofoil):
         with open(file_path, 'w') as open_file:
-            aerofoil.write(open_file)
+            aerofoil.write(open_file, Surface.AEROFOIL_POINTS,
+                           Surface.AEROFOIL_DISTRIBUTION)
         return file_path
 
     @property
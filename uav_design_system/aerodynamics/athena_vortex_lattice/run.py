@@ -1,17 +1,28 @@
 import sys
 import os
+import re
 from pathlib import Path
 import subprocess
 import tempfile
 from typing import List
 import shutil
-import time
 
 this_directory = Path(os.path.dirname(__file__))
-sys.path.append(str(this_directory) + '/../../common')
-from process import Process, Runner
+from ...common import Process, Runner, ProcessTimeoutError, ProcessExitedError
 from .results import AVLResults
 
+
+class AVLError(Exception):
+
+    def __init__(self, message, output = ""):
+        super().__init__(message)
+        # text avl output before the error
+        self.output = output
+
+class AVLTimeoutError(AVLError):
+    pass
+
+
 class AVLRunner(Runner):
 
     result_aliases = {'st' : 'stability_derivatives',
@@ -21,9 +32,29 @@ class AVLRunner(Runner):
                       'fs' : 'strip_forces',
                       'vm' : 'structural_forces'}
 
-    def __init__(self):
-        avl_path_object = this_directory / 'avl3.35'
-        super().__init__(str(avl_path_object))
+    # prompts avl shows when it is ready for the next command
+    TOP_PROMPT = r'AVL +c>'
+    OPER_PROMPT = r'OPER \(AVL\)c>'
+    # result commands without a file name ask where to write the results
+    FILE_PROMPT = r'Enter filename, or <return> for screen output +s>'
+    ANY_PROMPT = r'c>'
+
+    # avl reports problems on lines starting with asterisks
+    ERROR_PATTERN = r'^\s*\*+.*(error|not found|failed|cannot).*$'
+
+    def __init__(self, avl_file_path: str = None, timeout: float = 60,
+                 root: str = None):
+        """
+        inputs:
+            avl_file_path: path to avl executable, defaults to the bundled avl
+            timeout: seconds to wait for each avl command before giving up
+            root: folder to make the runtime directory in
+        """
+        if avl_file_path is None:
+            avl_file_path = str(this_directory / 'avl3.35')
+        super().__init__(avl_file_path, root)
+        self.timeout = timeout
+        self.process = None
 
     def setup_analysis(self, geom_file: str, mass_file: str, config_file: str,
                        *required_files: str):
@@ -37,50 +68,106 @@ class AVLRunner(Runner):
             required_files: additional file paths for files used in analysis
         """
         # move files to run time directory
-        self.geom_file = self._move_to_runtime(geom_file)
-        self.mass_file = self._move_to_runtime(mass_file)
-        self.config_file = self._move_to_runtime(config_file)
+        self.geom_file = self.move_to_runtime(geom_file)
+        self.mass_file = self.move_to_runtime(mass_file)
+        self.config_file = self.move_to_runtime(config_file)
         for required_file in required_files:
-            self._move_to_runtime(required_file)
+            self.move_to_runtime(required_file)
 
         # begin avl executable
         self.process = Process.initialise_process(self.executable, cwd = self.run_time_directory)
+        self._read_prompt(AVLRunner.TOP_PROMPT)
+
+        self._request('LOAD ' + self.geom_file, AVLRunner.TOP_PROMPT)
+        self._request('CASE ' + self.config_file, AVLRunner.TOP_PROMPT)
+        self._request('MASS ' + self.mass_file, AVLRunner.TOP_PROMPT)
+        self._request('MSET 0', AVLRunner.TOP_PROMPT)
+
+    def _request(self, command: str, prompt: str) -> str:
+        """
+        runs an avl command and waits for avl to be ready for the next one
 
-        self.process.command('LOAD ' + self.geom_file)
-        self.process.command('CASE ' + self.config_file)
-        self.process.command('MASS ' + self.mass_file)
-        self.process.command('MSET 0')
+        Inputs:
+            command: the avl command
+            prompt: regular expression for the prompt shown after the command
 
+        Returns:
+            output: text output by avl for the command
+        """
+        try:
+            output = self.process.request(command, prompt, self.timeout)
+        except ProcessTimeoutError as error:
+            raise AVLTimeoutError(f"avl did not finish '{command}' within "
+                                  f"{self.timeout}s", error.output) from error
+        except ProcessExitedError as error:
+            raise AVLError(f"avl exited during '{command}'",
+                           error.output) from error
+
+        self._check_errors(command, output)
+        return output
+
+    def _read_prompt(self, prompt: str):
+        """
+        waits for a prompt avl shows without being sent a command
+        """
+        try:
+            self.process.read_until(prompt, self.timeout)
+        except (ProcessTimeoutError, ProcessExitedError) as error:
+            raise AVLError("avl did not start", error.output) from error
+
+    def _check_errors(self, command: str, output: str):
+        match = re.search(AVLRunner.ERROR_PATTERN, output,
+                          re.IGNORECASE | re.MULTILINE)
+        if match:
+            raise AVLError(f"avl failed running '{command}': "
+                           f"{match.group(0).strip()}", output)
 
     def generate_results(self, results_dir: str = ''):
         """
-        create a file for each result and return a dictionary with the files
-        content.
-        copies content into results_dir
+        runs the trim case and returns the content of each result.
+        by default the results are read straight from the output of avl
+        without touching the disk, if results_dir is given avl writes a file
+        for each result which is copied into results_dir
 
         Inputs:
-            results_dir: path to results directory
+            results_dir: path to results directory, default no files
 
         Returns:
             results_dict: A dictionary of analysis names and results in string
             format
         """
         results_dict = {}
-        self.process.command('OPER')
-        self.process.command('c1')
-        self.process.command('')
-        self.process.command('X')
+        self._request('OPER', AVLRunner.OPER_PROMPT)
+        self._request('c1', AVLRunner.ANY_PROMPT)
+        self._request('', AVLRunner.OPER_PROMPT)
+        self._request('X', AVLRunner.OPER_PROMPT)
 
         for analysis_command, analysis_name in AVLRunner.result_aliases.items():
 
-            temp_file = os.path.join(self.temp_folder, analysis_name + '.txt')
-            content = self._get_results(analysis_command, temp_file)
+            if results_dir:
+                temp_file = os.path.join(self.run_time_directory, analysis_name + '.txt')
+                content = self._get_results(analysis_command, temp_file)
+                shutil.copy(temp_file, results_dir)
+            else:
+                content = self._capture_results(analysis_command)
 
             results_dict[analysis_name] = content
-            shutil.copy(temp_file, results_dir)
 
         return AVLResults(results_dict)
 
+    def _capture_results(self, analysis_command: str) -> str:
+        """
+        runs an analysis without a file name, answering avl's request for
+        one with an empty line so avl prints the results
+
+        Inputs:
+            analysis_command:  The AVL command to run a certain analysis
+
+        Returns:
+            content: The results printed by avl
+        """
+        self._request(analysis_command, AVLRunner.FILE_PROMPT)
+        return self._request('', AVLRunner.OPER_PROMPT)
 
     def _get_results(self, analysis_command: str, file_name: str) -> str:
         """
@@ -94,23 +181,29 @@ class AVLRunner(Runner):
             content: The content of the file
         """
         command = analysis_command + f' {file_name}'
-        self.process.command(command)
 
         # BUG: when the print_it is performed here the values of xref and zref
         # are different to those put in output filex
 
-        while not os.path.exists(file_name):
-            time.sleep(0.1)
+        # avl has closed the file once it is back at the oper prompt
+        self._request(command, AVLRunner.OPER_PROMPT)
 
         with open(file_name) as open_file:
             content = open_file.read()
 
         return content
 
-    def __del__(self):
-        self.process.command('')
-        self.process.command('quit')
-        super().__del__()
+    def close(self):
+        """
+        quit avl and remove the runtime directory
+        """
+        if getattr(self, 'process', None) is not None:
+            if self.process.is_alive:
+                self.process.command('')
+                self.process.command('quit')
+            self.process.close()
+            self.process = None
+        super().close()
 
 
 if __name__ == "__main__":
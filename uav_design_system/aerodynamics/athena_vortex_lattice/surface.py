@@ -3,6 +3,7 @@ from enum import Enum
 from typing import List
 from os.path import join
 from matplotlib import pyplot as plt
+from ...aerofoil import PointDistribution
 
 
 class NoControlSurfaceError(Exception):
@@ -20,6 +21,12 @@ class Surface():
     Class responsible for all aerodynamic surfaces, such as wings or rudders
     """
 
+    # points written for each surface of the section aerofoils. avl only
+    # needs the camber line, which around 40 cosine spaced points resolve as
+    # well, set these to write smaller files
+    AEROFOIL_POINTS = 100
+    AEROFOIL_DISTRIBUTION = PointDistribution.UNIFORM
+
     name: str
     reflect_surface: bool
     bias_angle: float
@@ -250,7 +257,8 @@ class Surface():
             try:
                 aerofoil_file = join(directory, f"section{i}_aerofoil.txt")
                 with open(aerofoil_file, "w") as open_file:
-                    section.aerofoil.write(open_file)
+                    section.aerofoil.write(open_file, self.AEROFOIL_POINTS,
+                                           self.AEROFOIL_DISTRIBUTION)
                 files.append(aerofoil_file)
             except NoAerofoilError:
                 continue
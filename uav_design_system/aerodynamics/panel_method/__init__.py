@@ -0,0 +1,4 @@
+from .panel import (PanelGeometry, PanelError, read_coordinates, repanel,
+                    close_trailing_edge, clean_coordinates)
+from .solver import PanelSolver, PanelRunner, deflect_flap
+from . import boundary_layer
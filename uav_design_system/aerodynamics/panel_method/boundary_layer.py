@@ -0,0 +1,160 @@
+"""
+integral boundary layer for the profile drag of an aerofoil, marched on both
+surfaces of every angle of attack at once. thwaites' method for the laminar
+layer, michel's criterion for transition, head's method for the turbulent
+layer and the squire young formula for the drag
+"""
+import numpy as np
+
+
+# shape factor of the turbulent layer just after transition
+TRANSITION_SHAPE_FACTOR = 1.4
+# turbulent shape factor at which the layer separates
+SEPARATION_SHAPE_FACTOR = 2.4
+# thwaites' pressure gradient parameter at which the laminar layer separates
+LAMINAR_SEPARATION = -0.09
+
+
+def thwaites_shape_factor(pressure_gradient):
+    """
+    shape factor from thwaites' pressure gradient parameter lambda
+    """
+    pressure_gradient = np.clip(pressure_gradient, LAMINAR_SEPARATION, 0.1)
+    favourable = 2.61 - 3.75 * pressure_gradient + 5.24 * pressure_gradient ** 2
+    adverse = 2.088 + 0.0731 / (pressure_gradient + 0.14)
+    return np.where(pressure_gradient >= 0, favourable, adverse)
+
+
+def head_entrainment_shape_factor(shape_factor):
+    """
+    head's entrainment shape factor H1 from the shape factor H
+    """
+    shape_factor = np.maximum(shape_factor, 1.11)
+    return np.where(shape_factor <= 1.6,
+                    3.3 + 0.8234 * (shape_factor - 1.1) ** -1.287,
+                    3.3 + 1.5501 * (np.maximum(shape_factor, 0.68) - 0.6778) ** -3.064)
+
+
+def head_shape_factor(entrainment_shape_factor):
+    """
+    the shape factor H from head's entrainment shape factor H1
+    """
+    excess = np.maximum(entrainment_shape_factor - 3.3, 1e-6)
+    return np.where(entrainment_shape_factor >= 5.3,
+                    0.6778 + 1.1536 * excess ** -0.326,
+                    1.1 + 0.86 * excess ** -0.777)
+
+
+def ludwieg_tillmann(shape_factor, momentum_reynolds):
+    """
+    turbulent skin friction coefficient
+    """
+    return (0.246 * 10 ** (-0.678 * shape_factor)
+            * np.maximum(momentum_reynolds, 1) ** -0.268)
+
+
+def michel_transition(momentum_reynolds, distance_reynolds):
+    """
+    true where the laminar layer has become turbulent by michel's criterion
+    """
+    return momentum_reynolds > 1.174 * (1 + 22400 / np.maximum(distance_reynolds, 1)) \
+        * np.maximum(distance_reynolds, 1) ** 0.46
+
+
+def march(distance, edge_speed, reynolds: float):
+    """
+    marches the boundary layer along rows of surfaces
+
+    inputs:
+        distance: (R, K) distance from the stagnation point of each station,
+            starting just after it
+        edge_speed: (R, K) speed at the edge of the layer
+        reynolds: reynolds number based on the cord and freestream speed,
+            with distances and speeds relative to those
+
+    returns:
+        momentum thickness, shape factor and the index of transition of each
+        row, K if the layer stays laminar
+    """
+    distance = np.asarray(distance, dtype = float)
+    edge_speed = np.maximum(np.asarray(edge_speed, dtype = float), 1e-6)
+    rows, stations = distance.shape
+
+    acceleration = np.gradient(edge_speed, axis = 1) / np.gradient(distance, axis = 1)
+
+    # thwaites, including the stagnation point flow before the first station
+    integrand = edge_speed ** 5
+    integral = edge_speed[:, :1] ** 5 * distance[:, :1] / 6 + np.concatenate(
+        [np.zeros((rows, 1)),
+         np.cumsum(0.5 * (integrand[:, 1:] + integrand[:, :-1])
+                   * np.diff(distance, axis = 1), axis = 1)], axis = 1)
+    laminar_theta = np.sqrt(0.45 * integral / (reynolds * edge_speed ** 6))
+    pressure_gradient = laminar_theta ** 2 * acceleration * reynolds
+    laminar_shape = thwaites_shape_factor(pressure_gradient)
+
+    turbulent = (michel_transition(reynolds * edge_speed * laminar_theta,
+                                   reynolds * edge_speed * distance)
+                 | (pressure_gradient < LAMINAR_SEPARATION))
+    # the favourable gradient near the stagnation point keeps it laminar
+    turbulent[:, 0] = False
+    transition = np.where(turbulent.any(axis = 1), turbulent.argmax(axis = 1),
+                          stations)
+
+    theta = laminar_theta.copy()
+    shape = laminar_shape.copy()
+
+    def derivatives(theta_k, entrainment_k, speed_k, acceleration_k, separated_k):
+        shape_k = np.where(separated_k, SEPARATION_SHAPE_FACTOR,
+                           head_shape_factor(entrainment_k))
+        friction = np.where(separated_k, 0,
+                            ludwieg_tillmann(shape_k, reynolds * speed_k * theta_k))
+        dtheta = 0.5 * friction - (shape_k + 2) * theta_k / speed_k * acceleration_k
+        entrainment = 0.0306 * np.maximum(entrainment_k - 3, 1e-3) ** -0.6169
+        # d(ue theta H1)/ds = ue F
+        dentrainment = (speed_k * entrainment - entrainment_k * acceleration_k * theta_k
+                        - entrainment_k * speed_k * dtheta) / (speed_k * theta_k)
+        return dtheta, np.where(separated_k, 0, dentrainment)
+
+    theta_k = np.zeros(rows)
+    entrainment_k = np.zeros(rows)
+    separated = np.zeros(rows, dtype = bool)
+    for k in range(1, stations):
+        starting = transition == k
+        theta_k = np.where(starting, laminar_theta[:, k - 1], theta_k)
+        entrainment_k = np.where(starting,
+                                 head_entrainment_shape_factor(TRANSITION_SHAPE_FACTOR),
+                                 entrainment_k)
+        active = transition <= k
+        if not active.any():
+            continue
+
+        # heun's method between stations k - 1 and k
+        step = distance[:, k] - distance[:, k - 1]
+        dtheta, dentrainment = derivatives(theta_k, entrainment_k,
+                                           edge_speed[:, k - 1],
+                                           acceleration[:, k - 1], separated)
+        theta_guess = np.maximum(theta_k + step * dtheta, 1e-9)
+        entrainment_guess = entrainment_k + step * dentrainment
+        dtheta_end, dentrainment_end = derivatives(theta_guess, entrainment_guess,
+                                                   edge_speed[:, k],
+                                                   acceleration[:, k], separated)
+        theta_next = np.maximum(theta_k + 0.5 * step * (dtheta + dtheta_end), 1e-9)
+        entrainment_next = entrainment_k + 0.5 * step * (dentrainment + dentrainment_end)
+
+        theta_k = np.where(active, theta_next, theta_k)
+        entrainment_k = np.where(active, entrainment_next, entrainment_k)
+        shape_k = head_shape_factor(entrainment_k)
+        separated |= active & (shape_k > SEPARATION_SHAPE_FACTOR)
+        shape_k = np.where(separated, SEPARATION_SHAPE_FACTOR, shape_k)
+
+        theta[active, k] = theta_k[active]
+        shape[active, k] = shape_k[active]
+
+    return theta, shape, transition
+
+
+def squire_young(theta, shape_factor, edge_speed):
+    """
+    drag coefficient of one surface from the layer at the trailing edge
+    """
+    return 2 * theta * np.abs(edge_speed) ** ((shape_factor + 5) / 2)
@@ -0,0 +1,205 @@
+"""
+linear vorticity panel method for the inviscid flow around an aerofoil
+"""
+import math
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+
+class PanelError(Exception):
+    pass
+
+
+def read_coordinates(file_path):
+    """
+    reads an aerofoil file in the format written by Aerofoil.write, a title
+    line followed by x y pairs
+
+    returns:
+        x, y arrays
+    """
+    with open(file_path) as open_file:
+        lines = open_file.read().split("\n")[1:]
+    points = [line.split() for line in lines if line.strip()]
+    coordinates = np.array(points, dtype = float)
+    return coordinates[:, 0], coordinates[:, 1]
+
+
+def close_trailing_edge(x, y):
+    """
+    closes a blunt trailing edge by moving each surface towards the other by
+    half the gap, blended in linearly from the leading edge as xfoil's TGAP
+    does, so the surface speeds at the trailing edge stay finite
+    """
+    x, y = np.array(x, dtype = float), np.array(y, dtype = float)
+    leading_edge = np.argmin(x)
+    gap = np.array([x[0] - x[-1], y[0] - y[-1]])
+    if np.hypot(*gap) < 1e-12:
+        return x, y
+    blend = (x - x[leading_edge]) / (max(x[0], x[-1]) - x[leading_edge])
+    side = np.where(np.arange(len(x)) <= leading_edge, -0.5, 0.5)
+    return x + side * blend * gap[0], y + side * blend * gap[1]
+
+
+def clean_coordinates(x, y):
+    """
+    removes repeated points, such as the leading edge point shared by both
+    surfaces, and closes the trailing edge
+    """
+    x, y = np.asarray(x, dtype = float), np.asarray(y, dtype = float)
+    keep = np.concatenate([[True], np.hypot(np.diff(x), np.diff(y)) > 1e-12])
+    return close_trailing_edge(x[keep], y[keep])
+
+
+def repanel(x, y, number_panels: int = 160):
+    """
+    redistributes the points of an aerofoil, ordered from the trailing edge
+    over the upper surface to the lower surface, with cosine spacing so the
+    panels are small at the leading and trailing edges
+
+    returns:
+        x, y arrays of number_panels + 1 nodes
+    """
+    x, y = clean_coordinates(x, y)
+    arc = np.concatenate([[0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))])
+    leading_edge = arc[np.argmin(x)]
+
+    upper = leading_edge * 0.5 * (1 - np.cos(np.linspace(0, math.pi,
+                                                          number_panels // 2 + 1)))
+    lower = leading_edge + (arc[-1] - leading_edge) * 0.5 * (
+        1 - np.cos(np.linspace(0, math.pi, number_panels - number_panels // 2 + 1)))
+    nodes = np.concatenate([upper, lower[1:]])
+
+    return np.interp(nodes, arc, x), np.interp(nodes, arc, y)
+
+
+class PanelGeometry():
+    """
+    panels between nodes ordered counter clockwise from the upper trailing
+    edge, the vorticity is linear along each panel. the tangential speed on
+    the surface equals the vorticity at the nodes
+    """
+
+    def __init__(self, x, y):
+        self.x, self.y = np.asarray(x, dtype = float), np.asarray(y, dtype = float)
+        if len(self.x) < 4:
+            raise PanelError("an aerofoil needs at least 3 panels")
+
+        # scale to unit cord with the leading edge at the origin
+        leading_edge = np.argmin(self.x)
+        trailing_edge = 0.5 * np.array([self.x[0] + self.x[-1],
+                                        self.y[0] + self.y[-1]])
+        self.cord = math.hypot(*(trailing_edge - [self.x[leading_edge],
+                                                  self.y[leading_edge]]))
+
+        dx, dy = np.diff(self.x), np.diff(self.y)
+        self.lengths = np.hypot(dx, dy)
+        if np.any(self.lengths <= 0):
+            raise PanelError("aerofoil has panels of zero length")
+        self.angles = np.arctan2(dy, dx)
+        self.midpoints = np.stack([self.x[:-1] + 0.5 * dx,
+                                   self.y[:-1] + 0.5 * dy], axis = 1)
+        # outward normal is to the right of a counter clockwise surface
+        self.normals = np.stack([np.sin(self.angles), -np.cos(self.angles)],
+                                axis = 1)
+        self.arc_length = np.concatenate([[0], np.cumsum(self.lengths)])
+
+        self._factors = lu_factor(self._influence_matrix())
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def _influence_matrix(self):
+        """
+        stream function at each node from unit vorticity at each node, with
+        the unknown stream function of the surface as the last column and the
+        kutta condition as the last row
+        """
+        number = len(self)
+        cos, sin = np.cos(self.angles), np.sin(self.angles)
+
+        # nodes i in the frame of panel j
+        dx = self.x[:, None] - self.x[None, :-1]
+        dy = self.y[:, None] - self.y[None, :-1]
+        local_x = dx * cos[None, :] + dy * sin[None, :]
+        local_y = -dx * sin[None, :] + dy * cos[None, :]
+        length = self.lengths[None, :]
+
+        r1 = np.hypot(local_x, local_y)
+        r2 = np.hypot(local_x - length, local_y)
+        theta = (np.arctan2(local_y, local_x - length)
+                 - np.arctan2(local_y, local_x))
+        # r log r goes to zero at the ends of the panel
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            log_r1 = np.where(r1 > 0, np.log(r1), 0)
+            log_r2 = np.where(r2 > 0, np.log(r2), 0)
+
+        # integrals of log r and s log r along the panel
+        log_integral = (local_x * log_r1 - (local_x - length) * log_r2 - length
+                        + local_y * theta)
+        moment_integral = (local_x * log_integral
+                           - (0.5 * r1 ** 2 * log_r1 - 0.25 * local_x ** 2)
+                           + (0.5 * r2 ** 2 * log_r2 - 0.25 * (local_x - length) ** 2))
+
+        matrix = np.zeros((number + 2, number + 2))
+        matrix[:number + 1, :number] -= (log_integral - moment_integral / length) / (2 * math.pi)
+        matrix[:number + 1, 1:number + 1] -= (moment_integral / length) / (2 * math.pi)
+        matrix[:number + 1, number + 1] = -1
+
+        # the trailing edge nodes coincide so their equations are the same,
+        # instead the curvature of the vorticity is equal on both sides
+        matrix[number] = 0
+        matrix[number, [0, 1, 2]] = [1, -2, 1]
+        matrix[number, [number, number - 1, number - 2]] = [-1, 2, -1]
+
+        # kutta condition, equal speeds leaving both sides of the trailing edge
+        matrix[number + 1, 0] = 1
+        matrix[number + 1, number] = 1
+        return matrix
+
+    def solve(self, alphas) -> np.ndarray:
+        """
+        vorticity at each node for each angle of attack (degrees), unit
+        freestream speed
+
+        returns:
+            (M, N + 1) vorticity, equal to the surface speed along the
+            counter clockwise direction
+        """
+        alphas = np.radians(np.atleast_1d(np.asarray(alphas, dtype = float)))
+        # stream function of the freestream along x and along y
+        right_hand_side = np.zeros((len(self) + 2, 2))
+        right_hand_side[:-1, 0] = -self.y
+        right_hand_side[:-1, 1] = self.x
+        right_hand_side[-2] = 0
+        unit_vorticity = lu_solve(self._factors, right_hand_side)[:-1]
+        return (np.cos(alphas)[:, None] * unit_vorticity[None, :, 0]
+                + np.sin(alphas)[:, None] * unit_vorticity[None, :, 1])
+
+    def forces(self, alphas, vorticity):
+        """
+        lift and quarter cord pitching moment coefficients from the surface
+        pressure
+
+        returns:
+            cl, cm arrays
+        """
+        alphas = np.radians(np.atleast_1d(np.asarray(alphas, dtype = float)))
+        speed = 0.5 * (vorticity[:, :-1] + vorticity[:, 1:])
+        pressure = 1 - speed ** 2
+
+        # pressure pushes inwards on each panel
+        force_x = -np.sum(pressure * self.normals[None, :, 0] * self.lengths, axis = 1)
+        force_y = -np.sum(pressure * self.normals[None, :, 1] * self.lengths, axis = 1)
+        cl = (force_y * np.cos(alphas) - force_x * np.sin(alphas)) / self.cord
+
+        leading_edge = np.argmin(self.x)
+        quarter_cord = (np.array([self.x[leading_edge], self.y[leading_edge]])
+                        + 0.25 * np.array([self.cord, 0]))
+        arm = self.midpoints - quarter_cord
+        moment = np.sum(pressure * self.lengths
+                        * -(arm[None, :, 0] * self.normals[None, :, 1]
+                            - arm[None, :, 1] * self.normals[None, :, 0]), axis = 1)
+        # nose up is clockwise
+        cm = -moment / self.cord ** 2
+        return cl, cm
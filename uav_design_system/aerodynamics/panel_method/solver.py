@@ -0,0 +1,228 @@
+"""
+aerofoil polars from the panel method and integral boundary layer, without
+running xfoil
+"""
+import math
+import numpy as np
+from ..xfoil import XfoilResults, XfoilConvergenceError
+from .panel import PanelGeometry, read_coordinates, repanel, clean_coordinates
+from . import boundary_layer
+
+
+class PanelSolver():
+    """
+    solves the flow around one aerofoil for any number of angles of attack,
+    the panel influences are factorised once so each angle of attack is only
+    a combination of two solutions. the lift and moment are inviscid, the
+    drag is the profile drag of the boundary layer. quicker than xfoil but
+    with no viscous coupling, so less accurate near stall and at low
+    reynolds numbers
+    """
+
+    # stations the boundary layer is marched through on each surface
+    STATIONS = 120
+    # fraction of each surface the layer is marched over. the inviscid flow
+    # slows to a stop at the trailing edge, which the real flow does not as
+    # the layer displaces it, so the drag is taken just ahead of it
+    TRAILING_EDGE_FRACTION = 0.98
+
+    def __init__(self, x, y, number_panels: int = 160):
+        """
+        inputs:
+            x, y: coordinates ordered from the trailing edge over the upper
+                surface and back along the lower surface
+            number_panels: panels the aerofoil is redistributed onto, None to
+                use the points as given
+        """
+        if number_panels is None:
+            x, y = clean_coordinates(x, y)
+        else:
+            x, y = repanel(x, y, number_panels)
+        self.geometry = PanelGeometry(x, y)
+
+    @classmethod
+    def from_aerofoil(cls, aerofoil, num_points: int = 100,
+                      number_panels: int = 160):
+        """
+        solver for an aerofoil.Aerofoil
+        """
+        x, y = aerofoil.coordinates(num_points).T
+        return cls(x, y, number_panels)
+
+    @classmethod
+    def from_file(cls, aerofoil_file, number_panels: int = 160,
+                  flap_info = None):
+        """
+        solver for an aerofoil file, as written by Aerofoil.write
+
+        inputs:
+            flap_info: (x, y, deflection down in degrees) of a flap hinge, as
+                given to xfoil
+        """
+        x, y = read_coordinates(aerofoil_file)
+        if flap_info:
+            x, y = deflect_flap(x, y, *flap_info)
+        return cls(x, y, number_panels)
+
+    def inviscid(self, alphas):
+        """
+        returns:
+            cl, cm and the surface vorticity of each angle of attack
+        """
+        vorticity = self.geometry.solve(alphas)
+        cl, cm = self.geometry.forces(alphas, vorticity)
+        return cl, cm, vorticity
+
+    def _surfaces(self, alphas):
+        """
+        edge speed along the upper then the lower surface of every angle of
+        attack, from the stagnation point to the trailing edge
+
+        returns:
+            (2M, K) distance and edge speed
+        """
+        geometry = self.geometry
+        arc = geometry.arc_length
+        vorticity = geometry.solve(alphas)
+
+        # stagnation point where the vorticity changes sign, the one closest
+        # to the leading edge if there are several
+        crossing = (vorticity[:, :-1] < 0) & (vorticity[:, 1:] >= 0)
+        leading_edge = np.argmin(geometry.x)
+        distance_to_nose = np.abs(np.arange(len(geometry)) - leading_edge)
+        node = np.argmin(np.where(crossing, distance_to_nose, len(arc)), axis = 1)
+        rows = np.arange(len(vorticity))
+        start, end = vorticity[rows, node], vorticity[rows, node + 1]
+        stagnation = arc[node] + geometry.lengths[node] * start / (start - end)
+
+        fractions = self.TRAILING_EDGE_FRACTION * 0.5 * (
+            1 - np.cos(np.linspace(0, math.pi, self.STATIONS + 1)[1:]))
+        upper = stagnation[:, None] * fractions[None, :]
+        lower = (arc[-1] - stagnation)[:, None] * fractions[None, :]
+
+        # interpolating the two unit solutions is the same as interpolating
+        # the vorticity of each angle of attack
+        unit = geometry.solve([0, 90])
+        radians = np.radians(np.atleast_1d(alphas))[:, None]
+
+        def vorticity_at(positions):
+            return (np.cos(radians) * np.interp(positions, arc, unit[0])
+                    + np.sin(radians) * np.interp(positions, arc, unit[1]))
+
+        upper_speed = -vorticity_at(stagnation[:, None] - upper)
+        lower_speed = vorticity_at(stagnation[:, None] + lower)
+        return (np.concatenate([upper, lower]),
+                np.concatenate([upper_speed, lower_speed]))
+
+    def profile_drag(self, alphas, reynolds_number: float):
+        """
+        returns:
+            cd of each angle of attack, and the fraction of the length of each
+            surface at which it transitions as (M, 2) upper and lower
+        """
+        alphas = np.atleast_1d(np.asarray(alphas, dtype = float))
+        distance, speed = self._surfaces(alphas)
+        theta, shape, transition = boundary_layer.march(distance, speed,
+                                                        reynolds_number)
+        drag = boundary_layer.squire_young(theta[:, -1], shape[:, -1], speed[:, -1])
+        cd = drag[:len(alphas)] + drag[len(alphas):]
+
+        surface_length = distance[:, -1] / self.TRAILING_EDGE_FRACTION
+        stations = np.minimum(transition, self.STATIONS - 1)
+        transition_fraction = np.where(
+            transition < self.STATIONS,
+            distance[np.arange(len(distance)), stations] / surface_length, 1)
+        return cd, transition_fraction.reshape(2, -1).T
+
+    def polar(self, reynolds_number: float, alphas, name: str = "panel"):
+        """
+        runs a polar at each angle of attack (degrees)
+
+        returns:
+            XfoilResults, with any angles of attack the boundary layer failed
+            at in its unconverged_alphas. each result has the transition
+            point of the upper and lower surface as a fraction of the surface
+            length from the stagnation point, not of the cord as xfoil gives
+        """
+        alphas = np.atleast_1d(np.asarray(alphas, dtype = float))
+        cl, cm, _ = self.inviscid(alphas)
+        cd, transition = self.profile_drag(alphas, reynolds_number)
+
+        converged = np.isfinite(cl) & np.isfinite(cd) & np.isfinite(cm)
+        results = [{"alpha": float(alpha), "cl": float(cl[i]),
+                    "cd": float(cd[i]), "cm": float(cm[i]),
+                    "transition_top": float(transition[i, 0]),
+                    "transition_bottom": float(transition[i, 1])}
+                   for i, alpha in enumerate(alphas) if converged[i]]
+        unconverged_alphas = [float(alpha) for alpha in alphas[~converged]]
+        if not results:
+            raise XfoilConvergenceError("no angle of attack converged",
+                                        unconverged_alphas)
+
+        # same structure as the results parsed from xfoil. transition is free,
+        # found by michel's criterion rather than an amplification ratio, so
+        # there is no forced transition or Ncrit
+        parameters = {"transition_criterion": "michel", "mach": 0.0,
+                      "Ncrit": None, "reynolds_number": float(reynolds_number)}
+        results_dict = {"xfoil": {"version": 0.0,
+                                  "analysis": {"results": results,
+                                               "name": name,
+                                               "analysis_parameters": parameters}}}
+        return XfoilResults(results_dict, unconverged_alphas)
+
+
+def deflect_flap(x, y, hinge_x, hinge_y, deflection_down):
+    """
+    rotates the points behind the hinge down about it. unlike xfoil the
+    surfaces are not trimmed or filled at the hinge
+    """
+    x, y = np.array(x, dtype = float), np.array(y, dtype = float)
+    angle = -math.radians(deflection_down)
+    behind = x > hinge_x
+    dx, dy = x[behind] - hinge_x, y[behind] - hinge_y
+    x[behind] = hinge_x + dx * math.cos(angle) - dy * math.sin(angle)
+    y[behind] = hinge_y + dx * math.sin(angle) + dy * math.cos(angle)
+    return x, y
+
+
+def sweep(start, stop, step):
+    """
+    angles of attack of an xfoil ASEQ sweep, including stop
+    """
+    number = int(math.floor(round((stop - start) / step, 6))) + 1
+    return np.round(start + step * np.arange(number), 6)
+
+
+class PanelRunner():
+    """
+    runs polars with the panel method, called the same way as an XfoilRunner
+    or XfoilPool so it can be used in their place
+    """
+
+    # solver the polars are keyed by in a PolarCache, the version changed
+    # whenever the results of the method change
+    SOLVER = 'panel 1'
+
+    def __init__(self, number_panels: int = 160):
+        self.number_panels = number_panels
+
+    def __call__(self, aerofoil_file, reynolds_number, start, stop, step,
+                 results_dir = None, flap_info = None):
+        """
+        results of the aerofoil at angles of attack from start to stop,
+        results_dir is accepted for compatibility with xfoil and ignored
+        """
+        solver = PanelSolver.from_file(aerofoil_file, self.number_panels,
+                                       flap_info)
+        with open(aerofoil_file) as open_file:
+            name = open_file.readline().strip()
+        return solver.polar(reynolds_number, sweep(start, stop, step), name)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
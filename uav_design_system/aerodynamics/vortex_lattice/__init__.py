@@ -0,0 +1,3 @@
+from .mesh import Lattice, LatticeError, spacing
+from .solver import VortexLatticeSolver, VortexLatticeError, horseshoe_velocities
+from .results import VortexLatticeResults, VortexLatticeResultSet
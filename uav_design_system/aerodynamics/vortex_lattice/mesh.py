@@ -0,0 +1,315 @@
+"""
+horseshoe vortex lattice of a plane, built from the same surface and section
+definitions that are written to avl
+"""
+import math
+import numpy as np
+from ..athena_vortex_lattice.surface import NoAerofoilError
+
+
+class LatticeError(Exception):
+    pass
+
+
+def spacing(number: int, parameter: float) -> np.ndarray:
+    """
+    fractions of the length at the edges of number panels, following the
+    avl spacing parameter
+
+        3.0 equal, 2.0 sine (bunched at the start), 1.0 cosine, 0.0 equal,
+        -1.0 cosine, -2.0 sine (bunched at the end), -3.0 equal
+
+    values in between blend the neighbouring distributions
+    """
+    absolute = min(abs(parameter), 3)
+    if absolute <= 1:
+        equal, cosine, sine = 1 - absolute, absolute, 0
+    elif absolute <= 2:
+        equal, cosine, sine = 0, 2 - absolute, absolute - 1
+    else:
+        equal, cosine, sine = absolute - 2, 0, 3 - absolute
+
+    fraction = np.linspace(0, 1, number + 1)
+    if parameter >= 0:
+        sine_fraction = 1 - np.cos(0.5 * math.pi * fraction)
+    else:
+        sine_fraction = np.sin(0.5 * math.pi * fraction)
+
+    return (equal * fraction
+            + cosine * 0.5 * (1 - np.cos(math.pi * fraction))
+            + sine * sine_fraction)
+
+
+def camber_slope(aerofoil, x: np.ndarray, num_points: int = 100) -> np.ndarray:
+    """
+    slope of the camber line of an aerofoil at each x/c, zero if there is no
+    aerofoil
+    """
+    if aerofoil is None:
+        return np.zeros_like(x)
+
+    sx, sy = aerofoil.suction_surface.coordinates(num_points).T
+    px, py = aerofoil.pressure_surface.coordinates(num_points).T
+    grid = np.linspace(0, 1, num_points)
+    suction_order, pressure_order = np.argsort(sx), np.argsort(px)
+    camber = 0.5 * (np.interp(grid, sx[suction_order], sy[suction_order])
+                    + np.interp(grid, px[pressure_order], py[pressure_order]))
+    return np.interp(x, grid, np.gradient(camber, grid))
+
+
+def _unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis = -1, keepdims = True)
+
+
+class Lattice():
+    """
+    horseshoe vortices of a plane. each strip of a surface is split into
+    chordwise panels with the bound vortex on the panel quarter cord and the
+    control point on the three quarter cord. like avl the geometry is kept
+    flat, twist, camber and control deflections tilt the panel normals
+
+    panel arrays (one row per panel):
+        bound_a, bound_b: ends of the bound vortex, a is at the lower y
+        control_points: where the flow must be tangent to the panel
+        normals: normal of each panel
+        strips: index of the strip each panel is in
+        control_normals: {control name: change of normal per degree}
+        hinge_points: {control name: point on the hinge line}, nan if the
+                      panel is not on the control surface
+        hinge_axes: {control name: axis a positive deflection rotates the
+                    panel about}, zero if the panel is not on the control
+
+    strip arrays (one row per strip):
+        strip_leading_edges: leading edge at the middle of the strip
+        strip_cords, strip_widths, strip_areas
+        strip_a, strip_b: ends of the strip at the leading edge
+    """
+
+    def __init__(self, plane: "Plane"):
+        self.surfaces = list(plane)
+        self.control_names = []
+        for surface in self.surfaces:
+            for section in surface:
+                control = section._control_surface
+                if control is not None and control.name not in self.control_names:
+                    self.control_names.append(control.name)
+
+        self._panels = {name: [] for name in ["bound_a", "bound_b",
+                                              "control_points", "normals",
+                                              "strips"]}
+        self._strips = {name: [] for name in ["leading_edges", "cords",
+                                              "widths", "a", "b"]}
+        self._controls = {name: ([], [], []) for name in self.control_names}
+        self.number_strips = 0
+
+        for surface in self.surfaces:
+            self._add_surface(surface)
+
+        if not self.number_strips:
+            raise LatticeError("plane has no surfaces with two or more sections")
+
+        for name, values in self._panels.items():
+            setattr(self, name, np.concatenate(values))
+        self.strips = self.strips.astype(int)
+
+        self.strip_leading_edges = np.concatenate(self._strips["leading_edges"])
+        self.strip_cords = np.concatenate(self._strips["cords"])
+        self.strip_widths = np.concatenate(self._strips["widths"])
+        self.strip_a = np.concatenate(self._strips["a"])
+        self.strip_b = np.concatenate(self._strips["b"])
+        self.strip_areas = self.strip_cords * self.strip_widths
+
+        self.control_normals = {}
+        self.hinge_points = {}
+        self.hinge_axes = {}
+        for name, (normals, hinge_points, hinge_axes) in self._controls.items():
+            self.control_normals[name] = np.concatenate(normals)
+            self.hinge_points[name] = np.concatenate(hinge_points)
+            self.hinge_axes[name] = np.concatenate(hinge_axes)
+
+        del self._panels, self._strips, self._controls
+
+    def __len__(self):
+        return len(self.normals)
+
+    @property
+    def bound_midpoints(self):
+        return 0.5 * (self.bound_a + self.bound_b)
+
+    def _add_surface(self, surface):
+        sections = list(surface)
+        if len(sections) < 2:
+            return
+
+        translation = np.array([surface.x, surface.y, surface.z], dtype = float)
+        leading_edges = np.array([[section.x, section.y, section.z]
+                                  for section in sections], dtype = float) + translation
+        cords = np.array([section.cord for section in sections], dtype = float)
+        incidences = np.radians([section.twist_angle + surface.angle_bias
+                                 for section in sections])
+
+        # position of each section along the span of the surface
+        lengths = np.linalg.norm(np.diff(leading_edges[:, 1:], axis = 0), axis = 1)
+        if not np.all(lengths > 0):
+            raise LatticeError(f"sections of {surface.name} must be spread "
+                               f"along the span")
+        section_fractions = np.concatenate([[0], np.cumsum(lengths)]) / lengths.sum()
+        edges = self._span_edges(surface, section_fractions)
+
+        # interpolate the geometry to the strip edges and centres
+        interval = np.clip(np.searchsorted(section_fractions, edges, "right") - 1,
+                           0, len(sections) - 2)
+        weight = ((edges - section_fractions[interval])
+                  / (section_fractions[interval + 1] - section_fractions[interval]))
+        edge_points = (leading_edges[interval] * (1 - weight)[:, None]
+                       + leading_edges[interval + 1] * weight[:, None])
+        edge_cords = cords[interval] * (1 - weight) + cords[interval + 1] * weight
+
+        centres = 0.5 * (edges[:-1] + edges[1:])
+        strip_interval = np.clip(np.searchsorted(section_fractions, centres,
+                                                 "right") - 1, 0, len(sections) - 2)
+        strip_weight = ((centres - section_fractions[strip_interval])
+                        / (section_fractions[strip_interval + 1]
+                           - section_fractions[strip_interval]))
+
+        # chordwise positions of the vortices and control points
+        cord_edges = spacing(surface.number_cord, surface.cord_distribution)
+        panel_lengths = np.diff(cord_edges)
+        vortex_fractions = cord_edges[:-1] + 0.25 * panel_lengths
+        control_fractions = cord_edges[:-1] + 0.75 * panel_lengths
+        panel_centres = cord_edges[:-1] + 0.5 * panel_lengths
+
+        # panel angle, the strip incidence less the camber line slope
+        slopes = np.array([camber_slope(self._aerofoil(section), control_fractions)
+                           for section in sections])
+        strip_slopes = (slopes[strip_interval] * (1 - strip_weight)[:, None]
+                        + slopes[strip_interval + 1] * strip_weight[:, None])
+        strip_incidences = (incidences[strip_interval] * (1 - strip_weight)
+                            + incidences[strip_interval + 1] * strip_weight)
+        angles = strip_incidences[:, None] - np.arctan(strip_slopes)
+
+        # controls span the intervals between sections that share them
+        controls = []
+        for name in self.control_names:
+            active = np.array([sections[index]._control_surface is not None
+                               and sections[index]._control_surface is
+                               sections[index + 1]._control_surface
+                               and sections[index]._control_surface.name == name
+                               for index in range(len(sections) - 1)])
+            strip_active = active[strip_interval]
+            if not strip_active.any():
+                controls.append(None)
+                continue
+            control = sections[strip_interval[strip_active][0]]._control_surface
+            if control.xhinge >= 0:
+                on_control = panel_centres > control.xhinge
+            else:
+                on_control = panel_centres < -control.xhinge
+            mask = strip_active[:, None] & on_control[None, :]
+            controls.append((control, mask))
+
+        left, right = edge_points[:-1], edge_points[1:]
+        left_cords, right_cords = edge_cords[:-1], edge_cords[1:]
+        self._add_strips(left, right, left_cords, right_cords, angles,
+                         vortex_fractions, control_fractions, controls, 1)
+
+        if surface.reflect_surface:
+            # mirror image about y = 0, ends swapped so a stays at the lower y
+            mirror = np.array([1, -1, 1])
+            self._add_strips(right * mirror, left * mirror, right_cords,
+                             left_cords, angles, vortex_fractions,
+                             control_fractions, controls, -1)
+
+    @staticmethod
+    def _aerofoil(section):
+        try:
+            return section.aerofoil
+        except NoAerofoilError:
+            return None
+
+    @staticmethod
+    def _span_edges(surface, section_fractions):
+        """
+        spanwise strip edges over the whole surface, with the nearest edge to
+        each section moved onto it
+        """
+        edges = spacing(surface.number_span, surface.span_distribution)
+        for fraction in section_fractions[1:-1]:
+            index = np.argmin(np.abs(edges - fraction))
+            if index in (0, len(edges) - 1):
+                edges = np.append(edges, fraction)
+            else:
+                edges[index] = fraction
+            edges = np.unique(edges)
+        return edges
+
+    def _add_strips(self, left, right, left_cords, right_cords, angles,
+                    vortex_fractions, control_fractions, controls, side):
+        """
+        adds the panels of strips between the left and right leading edge
+        points. side is -1 for the mirror image of a surface
+        """
+        number_strips, number_cord = angles.shape
+        x_axis = np.array([1.0, 0, 0])
+
+        def along_cord(fractions):
+            # points at cord fractions on the left and right edges (S, C, 3)
+            left_points = left[:, None, :] + (left_cords[:, None, None]
+                                              * fractions[None, :, None] * x_axis)
+            right_points = right[:, None, :] + (right_cords[:, None, None]
+                                                * fractions[None, :, None] * x_axis)
+            return left_points, right_points
+
+        bound_a, bound_b = along_cord(vortex_fractions)
+        control_left, control_right = along_cord(control_fractions)
+        control_points = 0.5 * (control_left + control_right)
+
+        # spanwise direction and untwisted normal of each strip
+        span_vectors = right - left
+        span_vectors[:, 0] = 0
+        spanwise = _unit(span_vectors)
+        flat_normals = _unit(np.cross(x_axis, spanwise))
+        chordwise = np.cross(spanwise, flat_normals)
+        normals = (np.cos(angles)[:, :, None] * flat_normals[:, None, :]
+                   + np.sin(angles)[:, :, None] * chordwise[:, None, :])
+
+        # deflecting a control trailing edge down rotates the normal about the
+        # spanwise direction
+        for name, control in zip(self.control_names, controls):
+            control_normals = np.zeros((number_strips, number_cord, 3))
+            hinge_points = np.full((number_strips, number_cord, 3), np.nan)
+            hinge_axes = np.zeros((number_strips, number_cord, 3))
+            if control is not None:
+                control_surface, mask = control
+                sign = 1
+                if side == -1:
+                    sign = control_surface.deflection_type.value
+                rotated = np.cross(spanwise[:, None, :], normals)
+                control_normals[mask] = (math.radians(control_surface.gain * sign)
+                                         * rotated[mask])
+                axes = np.broadcast_to(sign * spanwise[:, None, :],
+                                       hinge_axes.shape)
+                hinge_axes[mask] = axes[mask]
+                hinge_left, hinge_right = along_cord(
+                    np.array([abs(control_surface.xhinge)]))
+                hinge = np.broadcast_to(0.5 * (hinge_left + hinge_right),
+                                        hinge_points.shape)
+                hinge_points[mask] = hinge[mask]
+            self._controls[name][0].append(control_normals.reshape(-1, 3))
+            self._controls[name][1].append(hinge_points.reshape(-1, 3))
+            self._controls[name][2].append(hinge_axes.reshape(-1, 3))
+
+        strip_index = self.number_strips + np.repeat(np.arange(number_strips),
+                                                     number_cord)
+        self._panels["bound_a"].append(bound_a.reshape(-1, 3))
+        self._panels["bound_b"].append(bound_b.reshape(-1, 3))
+        self._panels["control_points"].append(control_points.reshape(-1, 3))
+        self._panels["normals"].append(normals.reshape(-1, 3))
+        self._panels["strips"].append(strip_index)
+
+        self._strips["leading_edges"].append(0.5 * (left + right))
+        self._strips["cords"].append(0.5 * (left_cords + right_cords))
+        self._strips["widths"].append(np.linalg.norm(span_vectors, axis = 1))
+        self._strips["a"].append(left)
+        self._strips["b"].append(right)
+        self.number_strips += number_strips
@@ -0,0 +1,121 @@
+"""
+results of the vortex lattice solver, with the same properties as AVLResults
+"""
+import numpy as np
+
+
+class VortexLatticeResults():
+
+    def __init__(self, results_dict):
+        self._results_dict = results_dict
+
+    @property
+    def _strips(self):
+        return self._results_dict["strips"]
+
+    @property
+    def alpha(self):
+        return self._results_dict["alpha"]
+
+    @property
+    def elevator_deflection(self):
+        return self._results_dict["deflections"].get("elevator", 0)
+
+    @property
+    def cl(self):
+        return self._results_dict["cl"]
+
+    @property
+    def cd(self):
+        return self._results_dict["cd"]
+
+    @property
+    def cm(self):
+        return self._results_dict["cm"]
+
+    @property
+    def cd_trefftz(self):
+        return self._results_dict["cd_trefftz"]
+
+    @property
+    def efficiency(self):
+        return self._results_dict["efficiency"]
+
+    @property
+    def surface_area(self):
+        return self._results_dict["reference_area"]
+
+    @property
+    def cord(self):
+        return self._results_dict["reference_cord"]
+
+    @property
+    def Span(self):
+        return self._results_dict["reference_span"]
+
+    @property
+    def y_distribution(self):
+        return self._strips["y"]
+
+    @property
+    def cord_distribution(self):
+        return self._strips["cord"]
+
+    @property
+    def area_distribution(self):
+        return self._strips["area"]
+
+    @property
+    def cl_distribution(self):
+        return self._strips["cl"]
+
+    @property
+    def cd_distribution(self):
+        return self._strips["cd"]
+
+    @property
+    def cm_quarter_cord_distribution(self):
+        return self._strips["cm_quarter_cord"]
+
+    @property
+    def elevator_hinge_coefficient(self):
+        return self._results_dict["hinge_coefficients"]["elevator"]
+
+    @property
+    def neutral_point(self):
+        return self._results_dict["neutral_point"]
+
+
+class VortexLatticeResultSet(VortexLatticeResults):
+    """
+    results of many flight conditions of one plane, each property is an
+    array with a value (or a row of strip values) per condition. indexing
+    gives the VortexLatticeResults of one condition
+    """
+
+    def __len__(self):
+        return len(self._results_dict["alpha"])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def elevator_deflection(self):
+        return self._results_dict["deflections"].get("elevator",
+                                                     np.zeros(len(self)))
+
+    def __getitem__(self, index):
+        results_dict = {}
+        for key, value in self._results_dict.items():
+            if key == "strips":
+                results_dict[key] = {name: np.asarray(values[index]).tolist()
+                                     for name, values in value.items()}
+            elif isinstance(value, dict):
+                results_dict[key] = {name: float(values[index])
+                                     for name, values in value.items()}
+            elif np.ndim(value) == 0:
+                results_dict[key] = value
+            else:
+                results_dict[key] = float(value[index])
+        return VortexLatticeResults(results_dict)
@@ -0,0 +1,448 @@
+"""
+vortex lattice solver that trims a plane to a TrimCase in process, an
+alternative to running the avl executable
+"""
+import math
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve, LinAlgError
+from .mesh import Lattice
+from .results import VortexLatticeResults, VortexLatticeResultSet
+
+
+class VortexLatticeError(Exception):
+    pass
+
+
+def _divide(numerator, denominator, tolerance = 1e-12):
+    # velocities on a vortex line are taken as zero
+    return np.divide(numerator, denominator,
+                     out = np.zeros(np.broadcast(numerator, denominator).shape),
+                     where = np.abs(denominator) > tolerance)
+
+
+def horseshoe_velocities(points: np.ndarray, bound_a: np.ndarray,
+                         bound_b: np.ndarray) -> np.ndarray:
+    """
+    velocity induced at each point by each horseshoe vortex of unit strength.
+    the trailing legs run from infinity to bound_a and from bound_b to
+    infinity along x
+
+    inputs:
+        points: (M, 3) points the velocity is found at
+        bound_a, bound_b: (N, 3) ends of the bound vortices
+
+    returns:
+        (M, N, 3) velocities
+    """
+    r1 = points[:, None, :] - bound_a[None, :, :]
+    r2 = points[:, None, :] - bound_b[None, :, :]
+    length1 = np.linalg.norm(r1, axis = 2)
+    length2 = np.linalg.norm(r2, axis = 2)
+
+    # bound vortex from a to b
+    bound = _divide(length1 + length2,
+                    length1 * length2 * (length1 * length2
+                                         + np.einsum("mnj,mnj->mn", r1, r2)))
+    velocities = np.cross(r1, r2) * bound[:, :, None]
+
+    # trailing legs, (x x r) / (|r| (|r| - x.r))
+    for r, length, sign in [(r2, length2, 1), (r1, length1, -1)]:
+        x_cross_r = np.stack([np.zeros_like(length), -r[:, :, 2], r[:, :, 1]],
+                             axis = 2)
+        trailing = _divide(sign, length * (length - r[:, :, 0]))
+        velocities += x_cross_r * trailing[:, :, None]
+
+    return velocities / (4 * math.pi)
+
+
+class VortexLatticeSolver():
+    """
+    solves the flow over a plane with a horseshoe vortex lattice. the
+    influence matrix depends only on the geometry so it is factorised once,
+    the circulation for unit freestream components and control deflections is
+    found up front and any flight condition is a sum of these solutions
+
+    like avl the plane is trimmed to the case lift coefficient with alpha and
+    to zero pitching moment with the elevator (if the plane has a control
+    named elevator). angles are in degrees
+    """
+
+    TRIM_CONTROL = "elevator"
+
+    def __init__(self, plane: "Plane", case: "TrimCase",
+                 reference_point = None, block_size: int = 256):
+        """
+        inputs:
+            plane: plane to analyse
+            case: trim case, the lift coefficient and beta are used
+            reference_point: (x, y, z) moments are taken about, the centre of
+                             gravity, defaults to the planes reference point
+            block_size: rows of the influence matrix built at once, limits
+                        the memory used
+        """
+        self.plane = plane
+        self.case = case
+        if reference_point is None:
+            reference_point = (plane.x_ref, plane.y_ref, plane.z_ref)
+        self.reference_point = np.asarray(reference_point, dtype = float)
+        self.block_size = block_size
+
+        self.reference_area = plane.reference_area
+        self.reference_cord = plane.reference_cord
+        self.reference_span = plane.reference_span
+
+        self.lattice = Lattice(plane)
+        self._solve_unit_circulations()
+
+    def _solve_unit_circulations(self):
+        lattice = self.lattice
+        number_panels = len(lattice)
+
+        # flow tangency at the control points
+        influence = np.empty((number_panels, number_panels))
+        for start in range(0, number_panels, self.block_size):
+            block = slice(start, start + self.block_size)
+            velocities = horseshoe_velocities(lattice.control_points[block],
+                                              lattice.bound_a, lattice.bound_b)
+            influence[block] = np.einsum("mnj,mj->mn", velocities,
+                                         lattice.normals[block])
+        try:
+            factors = lu_factor(influence, check_finite = False)
+        except (LinAlgError, ValueError) as error:
+            raise VortexLatticeError("influence matrix is singular") from error
+
+        # unit freestream components, then each control per degree
+        normals = [lattice.normals] + [lattice.control_normals[name]
+                                       for name in lattice.control_names]
+        right_hand_side = -np.concatenate(normals, axis = 1)
+        self._circulations = lu_solve(factors, right_hand_side)
+
+        # velocity induced on the bound vortices by each unit solution
+        self._induced = np.empty((number_panels, 3, right_hand_side.shape[1]))
+        midpoints = lattice.bound_midpoints
+        for start in range(0, number_panels, self.block_size):
+            block = slice(start, start + self.block_size)
+            velocities = horseshoe_velocities(midpoints[block],
+                                              lattice.bound_a, lattice.bound_b)
+            self._induced[block] = np.einsum("mnj,nk->mjk", velocities,
+                                             self._circulations)
+
+    @staticmethod
+    def freestream(alpha, beta = 0) -> np.ndarray:
+        """
+        unit freestream velocity in the plane axes (x back, z up), an (M, 3)
+        array if alpha and beta are arrays
+        """
+        alpha, beta = np.radians(alpha), np.radians(beta)
+        return np.stack([np.cos(alpha) * np.cos(beta),
+                         -np.sin(beta) * np.ones_like(alpha),
+                         np.sin(alpha) * np.cos(beta)], axis = -1)
+
+    def solve(self, alpha: float, deflections: dict = None,
+              beta: float = None) -> dict:
+        """
+        finds the forces on the plane at a flight condition
+
+        inputs:
+            alpha: angle of attack
+            deflections: {control name: deflection}, trailing edge down positive
+            beta: sideslip angle, defaults to the case beta
+
+        returns:
+            dictionary of the circulation and forces of each panel and the
+            total force and moment coefficients
+        """
+        deflections = deflections or {}
+        beta = self.case["beta"] if beta is None else beta
+        solutions = self.solve_batch([alpha],
+                                     {name: [value] for name, value
+                                      in deflections.items()},
+                                     [beta])
+        return _select(solutions, 0)
+
+    def solve_batch(self, alphas, deflections: dict = None, betas = None) -> dict:
+        """
+        finds the forces at many flight conditions at once, every condition
+        uses the same factorised influence matrix
+
+        inputs:
+            alphas: (M,) angles of attack
+            deflections: {control name: (M,) deflections}
+            betas: (M,) sideslip angles, defaults to the case beta
+
+        returns:
+            dictionary like solve with an extra first axis of length M
+        """
+        alphas = np.atleast_1d(np.asarray(alphas, dtype = float))
+        number = len(alphas)
+        if betas is None:
+            betas = self.case["beta"]
+        betas = np.broadcast_to(np.asarray(betas, dtype = float), (number,))
+        deflections = {name: np.broadcast_to(np.asarray(value, dtype = float),
+                                             (number,))
+                       for name, value in (deflections or {}).items()}
+
+        freestream = self.freestream(alphas, betas)
+        weights = [freestream.T]
+        for name in self.lattice.control_names:
+            weights.append(deflections.get(name, np.zeros(number)) * freestream.T)
+        weights = np.concatenate(weights)
+
+        circulation = (self._circulations @ weights).T
+        velocity = (freestream[:, None, :]
+                    + np.einsum("njk,km->mnj", self._induced, weights))
+
+        # kutta joukowski on the bound vortices, unit density and speed
+        lattice = self.lattice
+        forces = circulation[:, :, None] * np.cross(velocity,
+                                                    lattice.bound_b - lattice.bound_a)
+        moments = np.cross(lattice.bound_midpoints - self.reference_point, forces)
+
+        alpha_radians = np.radians(alphas)
+        lift_direction = np.stack([-np.sin(alpha_radians), np.zeros(number),
+                                   np.cos(alpha_radians)], axis = 1)
+        force = forces.sum(axis = 1)
+        dynamic_pressure_area = 0.5 * self.reference_area
+
+        return {"alpha": alphas,
+                "deflections": deflections,
+                "freestream": freestream,
+                "circulation": circulation,
+                "forces": forces,
+                "lift_direction": lift_direction,
+                "cl": np.sum(force * lift_direction, axis = 1) / dynamic_pressure_area,
+                "cd": np.sum(force * freestream, axis = 1) / dynamic_pressure_area,
+                "cm": moments[:, :, 1].sum(axis = 1) / (dynamic_pressure_area
+                                                        * self.reference_cord)}
+
+    def trim(self, tolerance: float = 1e-10, max_iterations: int = 20):
+        """
+        finds alpha and elevator deflection that give the case lift
+        coefficient and no pitching moment
+
+        returns:
+            the solution at the trimmed condition (see solve)
+        """
+        return _select(self.trim_batch([self.case["cl"]], [self.case["beta"]],
+                                       tolerance, max_iterations), 0)
+
+    def trim_batch(self, cls, betas = None, tolerance: float = 1e-10,
+                   max_iterations: int = 20) -> dict:
+        """
+        trims the plane to many lift coefficients at once, newton iterations
+        are run on every condition together
+
+        inputs:
+            cls: (M,) lift coefficients to trim to
+            betas: (M,) sideslip angles, defaults to the case beta
+
+        returns:
+            the solutions at the trimmed conditions (see solve_batch)
+        """
+        targets = np.atleast_1d(np.asarray(cls, dtype = float))
+        control = VortexLatticeSolver.TRIM_CONTROL
+        use_control = control in self.lattice.control_names
+
+        def residual(variables):
+            deflections = {control: variables[:, 1]} if use_control else {}
+            solutions = self.solve_batch(variables[:, 0], deflections, betas)
+            values = [solutions["cl"] - targets]
+            if use_control:
+                values.append(solutions["cm"])
+            return np.stack(values, axis = 1), solutions
+
+        variables = np.zeros((len(targets), 2 if use_control else 1))
+        step = 1e-4
+        for _ in range(max_iterations):
+            values, solutions = residual(variables)
+            if np.max(np.abs(values)) < tolerance:
+                return solutions
+
+            jacobian = np.empty(values.shape + (variables.shape[1],))
+            for index in range(variables.shape[1]):
+                perturbed = variables.copy()
+                perturbed[:, index] += step
+                jacobian[:, :, index] = (residual(perturbed)[0] - values) / step
+            try:
+                variables = variables - np.linalg.solve(jacobian,
+                                                        values[:, :, None])[:, :, 0]
+            except np.linalg.LinAlgError as error:
+                raise VortexLatticeError("plane cannot be trimmed, the lift and "
+                                         "moment do not depend on the trim "
+                                         "variables") from error
+
+        raise VortexLatticeError(f"trim did not converge in {max_iterations} "
+                                 f"iterations")
+
+    def trefftz(self, solution: dict):
+        """
+        induced drag and lift from the trailing vortices far downstream, of a
+        solution or batch of solutions
+
+        returns:
+            cl, cd
+        """
+        lattice = self.lattice
+        circulation = np.atleast_2d(solution["circulation"])
+        strip_circulation = np.stack([np.bincount(lattice.strips, row,
+                                                  lattice.number_strips)
+                                      for row in circulation])
+
+        # two dimensional vortices at the strip edges, velocity at the centres
+        a, b = lattice.strip_a[:, 1:], lattice.strip_b[:, 1:]
+        centres = 0.5 * (a + b)
+        span = b - a
+        normals = np.stack([-span[:, 1], span[:, 0]], axis = 1)
+        normals /= np.linalg.norm(normals, axis = 1, keepdims = True)
+
+        def vortex_velocity(points):
+            r = centres[:, None, :] - points[None, :, :]
+            velocity = np.stack([-r[:, :, 1], r[:, :, 0]], axis = 2)
+            return _divide(velocity, 2 * math.pi
+                           * np.sum(r * r, axis = 2)[:, :, None])
+
+        influence = np.einsum("mnj,mj->mn",
+                              vortex_velocity(b) - vortex_velocity(a), normals)
+        normal_wash = strip_circulation @ influence.T
+        widths = np.linalg.norm(span, axis = 1)
+
+        dynamic_pressure_area = 0.5 * self.reference_area
+        drag = -0.5 * np.sum(strip_circulation * normal_wash * widths, axis = 1)
+        lift = strip_circulation @ span[:, 0]
+        return (_unbatch(lift / dynamic_pressure_area, solution),
+                _unbatch(drag / dynamic_pressure_area, solution))
+
+    def neutral_point(self, solution: dict, step: float = 0.1):
+        """
+        x location where the pitching moment does not change with alpha, at
+        fixed control deflections
+        """
+        alpha = np.atleast_1d(solution["alpha"])
+        deflections = {name: np.atleast_1d(value)
+                       for name, value in solution["deflections"].items()}
+        above = self.solve_batch(alpha + step, deflections)
+        below = self.solve_batch(alpha - step, deflections)
+        cm_cl = (above["cm"] - below["cm"]) / (above["cl"] - below["cl"])
+        return _unbatch(self.reference_point[0] - cm_cl * self.reference_cord,
+                        solution)
+
+    def hinge_coefficient(self, solution: dict, name: str):
+        """
+        moment of the forces on a control surface about its hinge line
+        """
+        lattice = self.lattice
+        hinge_points = np.nan_to_num(lattice.hinge_points[name])
+        moments = np.cross(lattice.bound_midpoints - hinge_points,
+                           np.asarray(solution["forces"]))
+        hinge_moment = np.sum(moments * lattice.hinge_axes[name], axis = (-2, -1))
+        return hinge_moment / (0.5 * self.reference_area * self.reference_cord)
+
+    def strip_distributions(self, solution: dict) -> dict:
+        """
+        coefficients of each strip, normalised by the strip area and cord
+        """
+        lattice = self.lattice
+        forces = np.asarray(solution["forces"])
+        if forces.ndim == 2:
+            forces = forces[None]
+        strips, number_strips = lattice.strips, lattice.number_strips
+        dynamic_pressure_area = 0.5 * lattice.strip_areas
+
+        def strip_sum(panel_values):
+            return np.stack([np.bincount(strips, row, number_strips)
+                             for row in panel_values])
+
+        lift_direction = np.atleast_2d(solution["lift_direction"])
+        freestream = np.atleast_2d(solution["freestream"])
+        lift = strip_sum(np.einsum("mnj,mj->mn", forces, lift_direction))
+        drag = strip_sum(np.einsum("mnj,mj->mn", forces, freestream))
+
+        quarter_cords = lattice.strip_leading_edges.copy()
+        quarter_cords[:, 0] += 0.25 * lattice.strip_cords
+        moments = np.cross(lattice.bound_midpoints - quarter_cords[strips], forces)
+        moment = strip_sum(moments[:, :, 1])
+
+        distributions = {"y": lattice.strip_leading_edges[:, 1],
+                         "cord": lattice.strip_cords,
+                         "area": lattice.strip_areas,
+                         "cl": lift / dynamic_pressure_area,
+                         "cd": drag / dynamic_pressure_area,
+                         "cm_quarter_cord": moment / (dynamic_pressure_area
+                                                      * lattice.strip_cords)}
+        if np.ndim(solution["alpha"]) == 0:
+            return {key: (value[0] if value.ndim == 2 else value).tolist()
+                    for key, value in distributions.items()}
+        return {key: (value if value.ndim == 2
+                      else np.broadcast_to(value, lift.shape))
+                for key, value in distributions.items()}
+
+    def _result_set(self, solutions: dict) -> VortexLatticeResultSet:
+        cl_trefftz, cd_trefftz = self.trefftz(solutions)
+        aspect_ratio = self.reference_span ** 2 / self.reference_area
+        efficiency = _divide(cl_trefftz ** 2, math.pi * aspect_ratio * cd_trefftz,
+                             0)
+
+        results_dict = {
+            "alpha": solutions["alpha"],
+            "deflections": solutions["deflections"],
+            "cl": solutions["cl"],
+            "cd": solutions["cd"],
+            "cm": solutions["cm"],
+            "cl_trefftz": cl_trefftz,
+            "cd_trefftz": cd_trefftz,
+            "efficiency": efficiency,
+            "reference_area": self.reference_area,
+            "reference_cord": self.reference_cord,
+            "reference_span": self.reference_span,
+            "neutral_point": self.neutral_point(solutions),
+            "hinge_coefficients": {name: self.hinge_coefficient(solutions, name)
+                                   for name in self.lattice.control_names},
+            "strips": self.strip_distributions(solutions),
+        }
+        return VortexLatticeResultSet(results_dict)
+
+    def sweep(self, alphas, deflections: dict = None) -> VortexLatticeResultSet:
+        """
+        results at each angle of attack without trimming
+
+        inputs:
+            alphas: (M,) angles of attack
+            deflections: {control name: deflection or (M,) deflections}
+        """
+        return self._result_set(self.solve_batch(alphas, deflections))
+
+    def solve_cases(self, cases: list) -> VortexLatticeResultSet:
+        """
+        trims the plane for each case at once, for example a sweep of speed
+        or mass. cases only change the lift coefficient and beta, the moment
+        reference point of the solver is used for all of them
+        """
+        return self._result_set(self.trim_batch([case["cl"] for case in cases],
+                                                [case["beta"] for case in cases]))
+
+    def __call__(self) -> VortexLatticeResults:
+        """
+        trims the plane and returns the results
+        """
+        return self.solve_cases([self.case])[0]
+
+
+def _select(solutions: dict, index: int) -> dict:
+    """
+    one solution from a batch of solutions
+    """
+    solution = {}
+    for key, value in solutions.items():
+        if isinstance(value, dict):
+            solution[key] = {name: float(array[index])
+                             for name, array in value.items()}
+        elif np.ndim(value) == 1:
+            solution[key] = float(value[index])
+        else:
+            solution[key] = value[index]
+    return solution
+
+
+def _unbatch(values, solution):
+    # single values for a single solution
+    return float(values[0]) if np.ndim(solution["alpha"]) == 0 else values
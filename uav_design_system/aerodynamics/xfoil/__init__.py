@@ -1,2 +1,5 @@
-from .xfoil import XfoilRunner
+from .xfoil import (XfoilRunner, XfoilError, XfoilTimeoutError,
+                    XfoilConvergenceError)
+from .pool import XfoilWorker, XfoilPool
 from .results import XfoilResults
+from .cache import PolarCache
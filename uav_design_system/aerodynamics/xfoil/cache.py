@@ -0,0 +1,139 @@
+"""
+on disk cache of xfoil polars so repeated analyses of the same aerofoil are
+not solved again
+"""
+import math
+from ...common import DiskCache, hash_content
+from .results import XfoilResults
+
+
+class PolarCache():
+    """
+    stores xfoil results keyed on the aerofoil coordinates, the analysis
+    settings and the solver that ran them. reynolds numbers are rounded to a number of significant figures
+    so sections with nearly the same reynolds number share a polar
+    """
+
+    def __init__(self, directory: str, reynolds_significant_figures: int = 3,
+                 max_size: int = None, max_entries: int = None,
+                 mach: float = 0.0, ncrit: float = 9.0,
+                 solver: str = "xfoil"):
+        """
+        inputs:
+            directory: folder the polars are stored in, can be shared between
+                       processes
+            reynolds_significant_figures: significant figures the reynolds
+                                          number is rounded to, None to not
+                                          round
+            max_size: bytes of polars kept before the least recently used are
+                      removed
+            max_entries: number of polars kept
+            mach: mach number the runner analyses at, xfoil's default if it
+                  is not set
+            ncrit: transition amplification ratio the runner analyses at
+            solver: SOLVER of runners without one of their own, so polars of
+                    other solvers sharing the directory are not returned
+        """
+        self.store = DiskCache(directory, max_size, max_entries)
+        self.reynolds_significant_figures = reynolds_significant_figures
+        self.mach = mach
+        self.ncrit = ncrit
+        self.solver = solver
+
+    @property
+    def hits(self):
+        return self.store.hits
+
+    @property
+    def misses(self):
+        return self.store.misses
+
+    @property
+    def hit_rate(self):
+        return self.store.hit_rate
+
+    def quantise_reynolds(self, reynolds_number: float) -> float:
+        """
+        rounds the reynolds number to the caches significant figures, the
+        polar should be run at this reynolds number so the cached result is
+        exact
+        """
+        figures = self.reynolds_significant_figures
+        if figures is None or reynolds_number == 0:
+            return reynolds_number
+        exponent = math.floor(math.log10(abs(reynolds_number)))
+        return float(round(reynolds_number, figures - 1 - exponent))
+
+    def key(self, aerofoil_file, reynolds_number, start, stop, step,
+            flap_info = None, mach: float = None, ncrit: float = None,
+            solver: str = None) -> str:
+        """
+        key of a polar, the title line of the aerofoil file is ignored so
+        aerofoils with the same coordinates share a key. the mach number,
+        ncrit and solver are the caches own unless given
+        """
+        solver = self.solver if solver is None else solver
+        mach = float(self.mach if mach is None else mach)
+        ncrit = float(self.ncrit if ncrit is None else ncrit)
+        with open(aerofoil_file) as open_file:
+            coordinates = open_file.read().split("\n", 1)[-1]
+
+        settings = (solver, self.quantise_reynolds(reynolds_number), mach,
+                    ncrit, start, stop, step,
+                    tuple(flap_info) if flap_info else None)
+        return hash_content(coordinates, repr(settings))
+
+    def get(self, aerofoil_file, reynolds_number, start, stop, step,
+            flap_info = None, solver: str = None):
+        """
+        returns the stored XfoilResults, or None if the polar is not stored
+        """
+        results_dict = self.store.get(self.key(aerofoil_file, reynolds_number,
+                                               start, stop, step, flap_info,
+                                               solver = solver))
+        if results_dict is None:
+            return None
+        return XfoilResults.from_dict(results_dict)
+
+    def put(self, aerofoil_file, reynolds_number, start, stop, step,
+            results: XfoilResults, flap_info = None, solver: str = None):
+        """
+        stores a polar under the mach number and ncrit xfoil reports it was
+        run at, so a polar run at other settings is never returned for the
+        caches own
+        """
+        mach, ncrit = self.settings(results)
+        self.store.put(self.key(aerofoil_file, reynolds_number, start, stop,
+                                step, flap_info, mach, ncrit, solver),
+                       results.to_dict())
+
+    def settings(self, results: XfoilResults):
+        """
+        mach number and ncrit of a polar, the caches own if the results do
+        not give them
+        """
+        try:
+            parameters = results.to_dict()["results"]["xfoil"]["analysis"][
+                "analysis_parameters"]
+        except (KeyError, TypeError):
+            return self.mach, self.ncrit
+        return (parameters.get("mach", self.mach),
+                parameters.get("Ncrit", self.ncrit))
+
+    def __call__(self, runner, aerofoil_file, reynolds_number, start, stop,
+                 step, flap_info = None):
+        """
+        returns the stored polar, or runs it at the quantised reynolds number
+        with the runner (an XfoilRunner, XfoilPool or PanelRunner) and stores
+        it, keyed by the SOLVER of the runner
+        """
+        solver = getattr(runner, "SOLVER", self.solver)
+        results = self.get(aerofoil_file, reynolds_number, start, stop, step,
+                           flap_info, solver)
+        if results is None:
+            results = runner(aerofoil_file,
+                             self.quantise_reynolds(reynolds_number),
+                             start, stop, step, flap_info = flap_info)
+            self.put(aerofoil_file, reynolds_number, start, stop, step,
+                     results, flap_info, solver)
+        return results
@@ -0,0 +1,144 @@
+"""
+pool of long lived xfoil processes that are reused between analyses
+"""
+import os
+import queue
+from .xfoil import XfoilRunner
+
+
+class XfoilWorker(XfoilRunner):
+    """
+    xfoil runner that keeps its xfoil process alive between polars, resetting
+    the state of xfoil after each job rather than restarting it
+    """
+
+    def __init__(self, xfoil_file_path, max_jobs: int = 50, timeout: float = 30,
+                 root: str = None):
+        """
+        inputs:
+
+            xfoil_file_path: path to xfoil executable
+            max_jobs: number of polars run before the process is restarted
+            timeout: seconds to wait for a polar before xfoil is considered hung
+            root: folder to make the temp folder in
+        """
+        super().__init__(xfoil_file_path, timeout, root)
+        self.max_jobs = max_jobs
+        self.jobs_run = 0
+
+    def start(self):
+        self._start_process()
+        self.jobs_run = 0
+
+    def stop(self):
+        if self.process is not None:
+            self.process.close()
+            self.process = None
+
+    def recycle(self):
+        """
+        replace the xfoil process with a new one
+        """
+        self.stop()
+        self.start()
+
+    def __call__(self, aerofoil_file, reynolds_number, start, stop, step,
+                 results_dir = None, flap_info = None):
+        """
+        runs a polar on the live xfoil process, see XfoilRunner.__call__
+        """
+        if self.process is None or not self.process.is_alive \
+                or self.jobs_run >= self.max_jobs:
+            self.recycle()
+
+        try:
+            results = self._analyse(aerofoil_file, reynolds_number, start,
+                                    stop, step, results_dir, flap_info)
+            self._reset()
+        except Exception:
+            # xfoil is in an unknown state (or hung) so throw the process away
+            self.stop()
+            raise
+        finally:
+            self._remove_output_file()
+
+        self.jobs_run += 1
+        return results
+
+    def _reset(self):
+        """
+        returns xfoil to the top level menu in inviscid mode with no stored
+        polars, ready for the next job
+        """
+        self.process.command('PDEL 0')
+        self.process.command('VISC')
+        self.process.command('INIT')
+        self.process.command('')
+        self.process.clear_output()
+
+    def _remove_output_file(self):
+        # xfoil appends to an existing polar file so each job needs a new one
+        temp_file = self.temp_folder / 'aerofoil_results.txt'
+        if temp_file.exists():
+            temp_file.unlink()
+
+
+class XfoilPool():
+    """
+    a fixed number of xfoil workers shared between analyses. calling the pool
+    runs a polar on the next free worker, blocking until one is available, so
+    a pool can be driven from many threads at once
+    """
+
+    SOLVER = XfoilRunner.SOLVER
+
+    def __init__(self, xfoil_file_path, size: int = None, max_jobs: int = 50,
+                 timeout: float = 30, root: str = None):
+        """
+        inputs:
+
+            xfoil_file_path: path to xfoil executable
+            size: number of workers, defaults to one per core
+            max_jobs: number of polars a worker runs before it is restarted
+            timeout: seconds to wait for a polar before a worker is restarted
+            root: folder to make the workers temp folders in
+        """
+        if size is None:
+            size = os.cpu_count() or 1
+
+        self.workers = [XfoilWorker(xfoil_file_path, max_jobs, timeout, root)
+                        for _ in range(size)]
+
+        self._idle_workers = queue.Queue()
+        for worker in self.workers:
+            self._idle_workers.put(worker)
+
+    def __len__(self):
+        return len(self.workers)
+
+    def __call__(self, *args, **kwargs):
+        """
+        runs a polar on a free worker, see XfoilRunner.__call__ for inputs
+        """
+        worker = self._idle_workers.get()
+        try:
+            return worker(*args, **kwargs)
+        finally:
+            self._idle_workers.put(worker)
+
+    def close(self):
+        """
+        stop all xfoil processes, workers restart if the pool is used again
+        """
+        for worker in self.workers:
+            worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == "__main__":
+    pass
@@ -6,8 +6,21 @@ from scipy.interpolate import interp1d as interpolate
 
 class XfoilResults():
 
-    def __init__(self, xfoil_results_dict):
+    def __init__(self, xfoil_results_dict, unconverged_alphas = None):
         self._results_dict = xfoil_results_dict
+        # angles of attack in the sweep that xfoil could not converge
+        self.unconverged_alphas = unconverged_alphas or []
+
+    def to_dict(self):
+        """
+        json serialisable form of the results, see from_dict
+        """
+        return {"results": self._results_dict,
+                "unconverged_alphas": self.unconverged_alphas}
+
+    @classmethod
+    def from_dict(cls, results_dict):
+        return cls(results_dict["results"], results_dict["unconverged_alphas"])
 
     @property
     def _results_list(self):
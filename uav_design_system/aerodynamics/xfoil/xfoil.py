@@ -3,52 +3,114 @@ Xfoil API
 """
 import sys
 import os
-from ...common import Process, Runner
-import time
+import re
+from ...common import (Process, Runner, ProcessTimeoutError, ProcessExitedError,
+                       create_runtime_directory, MAX_PATH_LENGTH)
 import tempfile
 import shutil
 from .results import XfoilResults
 from pathlib import Path
 
 
+class XfoilError(Exception):
+    pass
+
+class XfoilTimeoutError(XfoilError):
+    pass
+
+class XfoilConvergenceError(XfoilError):
+
+    def __init__(self, message, unconverged_alphas):
+        super().__init__(message)
+        self.unconverged_alphas = unconverged_alphas
+
+
 class XfoilRunner():
     """
     class for running xfoil through python
     """
 
-    def __init__(self, xfoil_file_path):
+    # solver the polars are keyed by in a PolarCache
+    SOLVER = 'xfoil'
+
+    # not an xfoil command, so xfoil reports it back once all the commands
+    # before it have run
+    SENTINEL = 'SYNC'
+
+    # every file xfoil reads or writes sits in the temp folder, so leave room
+    # in the path limit for the file names
+    FILE_NAME_ALLOWANCE = 24
+
+    def __init__(self, xfoil_file_path, timeout: float = 30, root: str = None):
         """
         inputs:
 
             file_path (str): path to xfoil executable (located in xfoil.app/ MacOS)
+            timeout: seconds to wait for a polar before xfoil is considered hung
+            root: folder to make the temp folder in, defaults to the home
+                  directory or UAV_RUNTIME_ROOT
         """
-        # temp folder located here because xfoil file path limit (64 chars)
-        self.temp_folder = self._create_temp_folder()
+        self.process = None
+        # each runner has its own temp folder so runners can run side by side
+        self.temp_folder = self._create_temp_folder(root)
         # create a variable for the path to the location of the xfoil executable
         self.executable = xfoil_file_path
+        self.timeout = timeout
 
     def __del__(self):
         """
         remove temporary folder with results
         """
-        self._delete_temp_folder()
+        self.close()
+
+    def __enter__(self):
+        return self
 
-    def _create_temp_folder(self):
-        temp_folder = Path.home() / 'xfoil_temp'
-        temp_folder.mkdir()
-        return temp_folder
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """
+        stop xfoil if it is running and remove the temp folder
+        """
+        if getattr(self, 'process', None) is not None:
+            self.process.close()
+            self.process = None
+        if getattr(self, 'temp_folder', None) is not None:
+            self._delete_temp_folder()
+
+    def _create_temp_folder(self, root = None):
+        # xfoil cannot read paths longer than 64 chars
+        return create_runtime_directory(
+            'xf', root, MAX_PATH_LENGTH - XfoilRunner.FILE_NAME_ALLOWANCE)
 
     def _delete_temp_folder(self):
-        shutil.rmtree(str(self.temp_folder))
+        if self.temp_folder.exists():
+            shutil.rmtree(str(self.temp_folder))
 
     def _move_aerofile_to_temp(self, aerofoil_file_path):
         base_name = os.path.basename(aerofoil_file_path)
         shutil.copy(aerofoil_file_path, str(self.temp_folder))
         return self.temp_folder / base_name
 
+    def _start_process(self):
+        self.process = Process.initialise_process(self.executable)
+        self._disable_x11_plot()
+        self._sequence_points()
+
     def _disable_x11_plot(self):
         self.process.command('PLOP\nG\n')
 
+    def _sequence_points(self):
+        """
+        SEQP toggles the plotting of each point of a sequence, so it is sent
+        once per process rather than per polar, which would turn it back off
+        on every other polar of a reused process
+        """
+        self.process.command('OPER')
+        self.process.command('SEQP')
+        self.process.command('')
+
     def _prepare_aerofoil(self, aerofoil_file_path):
         aerofoil_file_path = self._move_aerofile_to_temp(aerofoil_file_path)
         self.process.command(f'LOAD {aerofoil_file_path}')
@@ -65,7 +127,6 @@ class XfoilRunner():
         """
         self.process.command('OPER')
         self.process.command(f'visc {reynolds_number}')
-        self.process.command('SEQP')
 
     def _prepare_output_file(self):
         temp_file = self.temp_folder / 'aerofoil_results.txt'
@@ -93,8 +154,20 @@ class XfoilRunner():
             step (Int): setp size
             results_dir (Str): location to copy results to if kept, default None
         """
-        self.process = Process.initialise_process(self.executable)
-        self._disable_x11_plot()
+        self._start_process()
+        try:
+            return self._analyse(aerofoil_file, reynolds_number, start, stop,
+                                 step, results_dir, flap_info)
+        finally:
+            self.process.close()
+            self.process = None
+
+    def _analyse(self, aerofoil_file, reynolds_number, start, stop, step,
+                 results_dir = None, flap_info = None):
+        """
+        runs a single polar on the current xfoil process, which must be at the
+        top level menu
+        """
         self._prepare_aerofoil(aerofoil_file)
         if flap_info: self._modify_geometry(flap_info[0],
                                                 flap_info[1],
@@ -103,14 +176,19 @@ class XfoilRunner():
 
         temp_file = self._prepare_output_file()
 
-        content = self._run_analysis(start, stop, step, temp_file)
-
-        self.process.close()
+        content, unconverged_alphas = self._run_analysis(start, stop, step,
+                                                         temp_file)
 
         if results_dir:
             shutil.copy(temp_file, results_dir)
 
-        return XfoilResults(self._format_content(content))
+        results_dict = self._format_content(content)
+        if not results_dict['xfoil']['analysis']['results']:
+            raise XfoilConvergenceError(f"no angle of attack between {start} "
+                                        f"and {stop} converged",
+                                        unconverged_alphas)
+
+        return XfoilResults(results_dict, unconverged_alphas)
 
     def _format_content(self, content):
         """
@@ -169,35 +247,45 @@ class XfoilRunner():
 
         Returns:
             content (str): content of results in temp_file
+            unconverged_alphas (list): angles of attack that did not converge
         """
-
+        self.process.clear_output()
         self.process.command(f'ASEQ {start} {stop} {step}')
-
-        # tune so that xfoil runs results within this time
-
-
-        # check the file exists
-        i = 0
-        while not os.path.exists(temp_file):
-            time.sleep(0.1)
-            if i == 25:
-                i+=1
-                break
-
-        # waiting until file has been fully written to
-        start_size = os.stat(temp_file).st_size
-        new_size = 0
-
-        while start_size != new_size:
-            time.sleep(0.2)
-            start_size = new_size
-            new_size  = os.stat(temp_file).st_size
+        # closing the polar save file flushes it to disk, then the sentinel
+        # is reported back once the sequence has finished
+        self.process.command('PACC')
+        self.process.command(XfoilRunner.SENTINEL)
+
+        try:
+            output = self.process.read_until(re.escape(XfoilRunner.SENTINEL),
+                                             self.timeout)
+        except ProcessTimeoutError as error:
+            raise XfoilTimeoutError(f"xfoil did not finish within "
+                                    f"{self.timeout}s") from error
+        except ProcessExitedError as error:
+            raise XfoilError(f"xfoil exited during the analysis:\n"
+                             f"{error.output}") from error
 
         # read the content of the file
         with open(temp_file) as open_file:
             content = open_file.read()
 
-        return content
+        return content, self._find_unconverged(output)
+
+    def _find_unconverged(self, output):
+        """
+        finds the angles of attack xfoil reported as not converging in its
+        output, each failure is printed after the iterations for that angle
+        """
+        unconverged_alphas = []
+        alpha = None
+        for line in output.split('\n'):
+            match = re.search(r'a =\s*(-?\d+\.\d*)', line)
+            if match:
+                alpha = float(match.group(1))
+            elif 'Convergence failed' in line and alpha is not None:
+                unconverged_alphas.append(alpha)
+        return unconverged_alphas
 
 
 
@@ -1 +1,2 @@
 from .aerofoil import *
+from .family import AerofoilFamily, AerofoilFamilyError
@@ -1,11 +1,28 @@
 """
 """
 import numpy as np
-import bezier
-import scipy.optimize as opt
+from enum import Enum
+from scipy.special import comb
 import matplotlib.pyplot as plt
 
 
+class PointDistribution(Enum):
+    """
+    Used for selection of how points are spaced along a surface when its
+    coordinates are sampled
+        UNIFORM: evenly spaced in the curve parameter
+        COSINE: cosine spaced in x, small near the leading and trailing edges
+        ARC_LENGTH: evenly spaced along the surface
+        CURVATURE: spaced along the surface in proportion to its curvature,
+            so the points gather where the surface bends most, and
+            cosine spaced so they also gather at the ends
+    """
+    UNIFORM = 1
+    COSINE = 2
+    ARC_LENGTH = 3
+    CURVATURE = 4
+
+
 class Aerofoil:
     """
     Class that represents an Aerofoil
@@ -16,6 +33,9 @@ class Aerofoil:
         self.name = name
         self.suction_surface = suction_surface
         self.pressure_surface = pressure_surface
+        # (num_points, distribution): (suction table, pressure table,
+        # coordinates, text)
+        self._tables = {}
 
     def plot(self, plot = None, num_points: int = 250, colour = "g"):
         """
@@ -76,10 +96,10 @@ class Aerofoil:
 
         return aerofoil
 
-    def get_maxmin_y(self, x_target: float, **kwargs):
+    def get_maxmin_y(self, x_target, **kwargs):
         """
-        gets the top surface y coordinate and bottom surface y coordinate at a
-        given x
+        gets the pressure surface y coordinate and suction surface y
+        coordinate at a given x, or at each x of an array
         """
 
         y_pressure, _ = self.pressure_surface.get_y(x_target, **kwargs)
@@ -96,7 +116,8 @@ class Aerofoil:
         else:
             return "Name: Not Specified"
 
-    def write(self, open_file, num_points: int = 100):
+    def write(self, open_file, num_points: int = 100,
+              distribution: PointDistribution = PointDistribution.UNIFORM):
         """
         writes the suction and pressure surface x,y coordinates into a file with
         a title line of the aerofoil name
@@ -104,59 +125,63 @@ class Aerofoil:
         Inputs:
             open_file:  a file stream object
             num_points:  The number of points for each surface to be written
+            distribution: how the points are spaced along each surface
 
         Returns:
             None
         """
 
         open_file.write(f'{self}\n')
+        open_file.write(self._table(num_points, distribution)[3])
 
-        px, py = self.pressure_surface.get_xy_coords(num_points)
-        sx, sy = self.suction_surface.get_xy_coords(num_points)
-
-        x = sx[::-1] + px
-        y = sy[::-1] + py
+    def _table(self, num_points, distribution):
+        """
+        coordinates and their text, made again only if either surface has
+        changed since they were last made
+        """
+        suction = self.suction_surface.coordinates(num_points, distribution)
+        pressure = self.pressure_surface.coordinates(num_points, distribution)
+        table = self._tables.get((num_points, distribution))
+        if table is None or table[0] is not suction or table[1] is not pressure:
+            coordinates = np.concatenate([suction[::-1], pressure])
+            coordinates.flags.writeable = False
+            text = "".join(f"{x} {y}\n" for x, y in coordinates.tolist())
+            table = (suction, pressure, coordinates, text)
+            self._tables[(num_points, distribution)] = table
+        return table
+
+    def coordinates(self, num_points: int = 100,
+                    distribution: PointDistribution = PointDistribution.UNIFORM):
+        """
+        coordinates from the trailing edge along the suction surface and back
+        along the pressure surface, as written to aerofoil files
 
-        for i in range(num_points * 2):
-            open_file.write(f"{x[i]} {y[i]}\n")
+        returns:
+            read only (2 * num_points, 2) array
+        """
+        return self._table(num_points, distribution)[2]
 
     def check_fits(self, shape: "TwoDimentional"):
         """
-        checks that a 2D shape fits inside this aerofoil
+        checks that a 2D shape fits inside this aerofoil, comparing every
+        point of each surface within the shape in x to the box bounding it at
+        once
         """
-        x, y = self.suction_surface.get_xy_coords()
-        boolean = True
-
-        # check suction surface
-        skip_number = 0
-        for index, x_val in enumerate(x):
-
-            try:
-                y_top, _ = shape.get_y_vals(x_val)
-            except:
-                skip_number += 1
-                continue
-
-            if y[index] <= y_top:
-                return False
+        x_shape, y_shape = (np.asarray(values, dtype = float)
+                            for values in shape.plot_coordinates)
+        x_min, x_max = x_shape.min(), x_shape.max()
 
+        x, y = self.suction_surface.coordinates().T
+        inside = (x >= x_min) & (x <= x_max)
         # for when the whole object is located outside of the aerofoil x range
-        if len(x) == skip_number:
+        if not inside.any():
+            return False
+        if np.any(y[inside] <= y_shape.max()):
             return False
 
-        # check pressure surface
-        x, y = self.pressure_surface.get_xy_coords()
-
-        for index, x_val in enumerate(x):
-            try:
-                _, y_bottom = shape.get_y_vals(x_val)
-            except:
-                continue
-
-            if y[index] >= y_bottom:
-                return False
-
-        return boolean
+        x, y = self.pressure_surface.coordinates().T
+        inside = (x >= x_min) & (x <= x_max)
+        return not np.any(y[inside] >= y_shape.min())
 
     def __mul__(self, value: float):
         """
@@ -172,58 +197,279 @@ class Aerofoil:
                self.pressure_surface == aerofoil.pressure_surface
 
 
+class BezierCurve:
+    """
+    bezier curve of degree len(nodes) - 1 evaluated with numpy, with the
+    power basis coefficients kept so x can be inverted for many points at once
+    """
+
+    # iterations of newton's method when inverting curves above degree 2
+    NEWTON_ITERATIONS = 50
+    TOLERANCE = 1e-12
+    # share of the points of the CURVATURE distribution placed by curvature,
+    # the rest are spaced evenly along the curve
+    CURVATURE_FRACTION = 0.7
+
+    def __init__(self, nodes):
+        self.nodes = np.ascontiguousarray(nodes, dtype = float)
+        self.degree = len(self.nodes) - 1
+
+        # curve(s) = sum of coefficients[k] * s ** k
+        degree = self.degree
+        self.coefficients = self.power_basis(degree) @ self.nodes
+        self.derivative_coefficients = (self.coefficients[1:]
+                                        * np.arange(1, degree + 1)[:, None])
+
+    @staticmethod
+    def power_basis(degree: int):
+        """
+        matrix taking bezier nodes to the coefficients of s ** k
+        """
+        transform = np.zeros((degree + 1, degree + 1))
+        for k in range(degree + 1):
+            for i in range(k + 1):
+                transform[k, i] = (comb(degree, k) * comb(k, i)
+                                   * (-1) ** (k - i))
+        return transform
+
+    @staticmethod
+    def horner(coefficients, s):
+        """
+        horner's method on the power basis, coefficients of s ** k along the
+        first axis with the rest broadcast against s
+        """
+        result = np.zeros(np.broadcast(s, coefficients[-1]).shape) + coefficients[-1]
+        for coefficient in coefficients[-2::-1]:
+            result = result * s + coefficient
+        return result
+
+    def evaluate(self, s):
+        """
+        points on the curve at each s, the barycentric form used by the
+        bezier package so the points match it exactly
+
+        returns:
+            (len(s), 2) array of points
+        """
+        s = np.atleast_1d(np.asarray(s, dtype = float))
+        lambda1 = (1.0 - s)[:, None]
+        lambda2 = s[:, None]
+        nodes = self.nodes
+
+        if self.degree == 0:
+            return np.repeat(nodes[:1], len(s), axis = 0)
+
+        result = lambda1 * nodes[0]
+        binomial = 1.0
+        lambda2_power = np.ones_like(lambda2)
+        for index in range(1, self.degree):
+            lambda2_power = lambda2_power * lambda2
+            binomial = binomial * (self.degree - index + 1) / index
+            result = result + binomial * lambda2_power * nodes[index]
+            result = result * lambda1
+        return result + lambda2 * lambda2_power * nodes[self.degree]
+
+    def _power(self, coefficients, s):
+        return self.horner(coefficients, s[:, None])
+
+    def derivative(self, s, order: int = 1):
+        """
+        d(x, y)/ds, or a higher derivative, at each s
+        """
+        s = np.atleast_1d(np.asarray(s, dtype = float))
+        coefficients = self.coefficients
+        for _ in range(order):
+            if len(coefficients) == 1:
+                return np.zeros((len(s), 2))
+            coefficients = coefficients[1:] * np.arange(1, len(coefficients))[:, None]
+        return self._power(coefficients, s)
+
+    def curvature(self, s):
+        """
+        magnitude of the curvature at each s
+        """
+        first, second = self.derivative(s), self.derivative(s, 2)
+        speed = np.maximum(np.hypot(first[:, 0], first[:, 1]), 1e-12)
+        return np.abs(first[:, 0] * second[:, 1]
+                      - first[:, 1] * second[:, 0]) / speed ** 3
+
+    def parameters(self, num_points: int,
+                   distribution: PointDistribution = PointDistribution.UNIFORM):
+        """
+        curve parameters s of num_points spaced by the distribution
+        """
+        uniform = np.linspace(0, 1, num_points)
+        if distribution is PointDistribution.UNIFORM:
+            return uniform
+
+        if distribution is PointDistribution.COSINE:
+            start, end = self.nodes[0, 0], self.nodes[-1, 0]
+            x = start + (end - start) * 0.5 * (1 - np.cos(np.pi * uniform))
+            s = np.clip(self.get_s(x), 0, 1)
+            s[0], s[-1] = 0, 1
+            return s
+
+        # invert the distance along a fine table of the curve
+        table_s = np.linspace(0, 1, max(20 * num_points, 200))
+        points = self.evaluate(table_s)
+        lengths = np.hypot(*np.diff(points, axis = 0).T)
+        if distribution is PointDistribution.CURVATURE:
+            curvature = self.curvature(0.5 * (table_s[1:] + table_s[:-1]))
+            mean = np.sum(curvature * lengths) / max(np.sum(lengths), 1e-12)
+            weight = ((1 - self.CURVATURE_FRACTION)
+                      + self.CURVATURE_FRACTION * curvature / max(mean, 1e-12))
+            lengths = lengths * weight
+            # and cosine spaced so the ends are refined too, as xfoil does
+            uniform = 0.5 * (1 - np.cos(np.pi * uniform))
+        distance = np.concatenate([[0], np.cumsum(lengths)])
+        return np.interp(uniform * distance[-1], distance, table_s)
+
+    def get_s(self, x, s0 = None, tolerance: float = None,
+              iterations: int = None):
+        """
+        the curve parameter at which the curve passes through each x, for a
+        curve with x increasing along it
+
+        inputs:
+            x: array of x coordinates
+            s0: starting guess for newton's method, used above degree 2
+            tolerance: step in s newton's method stops at, TOLERANCE by
+                default
+            iterations: most steps of newton's method, NEWTON_ITERATIONS by
+                default
+        """
+        x = np.atleast_1d(np.asarray(x, dtype = float))
+        a = self.coefficients[:, 0]
+
+        if self.degree == 1:
+            return (x - a[0]) / a[1]
+
+        if self.degree == 2 and abs(a[2]) > self.TOLERANCE * abs(a[1]):
+            # the root of the quadratic closest to the curve
+            discriminant = np.sqrt(np.maximum(a[1] ** 2 - 4 * a[2] * (a[0] - x), 0))
+            roots = np.stack([(-a[1] + discriminant) / (2 * a[2]),
+                              (-a[1] - discriminant) / (2 * a[2])])
+            distance = np.abs(roots - np.clip(roots, 0, 1))
+            return np.take_along_axis(roots, np.argmin(distance, axis = 0)[None], 0)[0]
+
+        if self.degree == 2:
+            return (x - a[0]) / a[1]
+
+        if s0 is None:
+            # start from a table of the curve, which is monotonic in x
+            table_s = np.linspace(0, 1, 8 * self.degree + 1)
+            s = np.interp(x, self.evaluate(table_s)[:, 0], table_s)
+        else:
+            s = np.full(x.shape, float(s0))
+
+        if tolerance is None:
+            tolerance = self.TOLERANCE
+        if iterations is None:
+            iterations = self.NEWTON_ITERATIONS
+        for _ in range(iterations):
+            error = self._power(self.coefficients[:, :1], s)[:, 0] - x
+            slope = self._power(self.derivative_coefficients[:, :1], s)[:, 0]
+            step = error / np.where(slope == 0, 1, slope)
+            s = s - step
+            if np.all(np.abs(step) < tolerance):
+                break
+        return s
+
+    def get_y(self, x, s0 = None, tolerance: float = None,
+              iterations: int = None):
+        """
+        y at each x
+
+        returns:
+            y array, s array
+        """
+        s = self.get_s(x, s0, tolerance, iterations)
+        return self.evaluate(s)[:, 1], s
+
+
 class Surface:
     """
-    Class that represents a Surface from a number of nodes and degree
+    Class that represents a Surface from a number of nodes and degree. the
+    curve is of degree len(nodes) - 1, as the bezier package made it, so
+    degree is only kept for compatibility and does not change the curve
     """
 
+    # keyword arguments of scipy.optimize.newton that get_y still takes
+    NEWTON_ARGUMENTS = {"x0": "s0", "tol": "tolerance", "maxiter": "iterations"}
+
     def __init__(self, *nodes, degree: int = 2):
-        self._nodes = np.asfortranarray(list(nodes))
         self.degree = degree
+        self.nodes = list(nodes)
 
     @property
     def nodes(self):
         return self._nodes.tolist()
 
-    def get_xy_coords(self, num_points = 100):
+    @nodes.setter
+    def nodes(self, nodes):
+        self._nodes = np.asfortranarray(nodes)
+        # curve and coordinates of the old nodes
+        self._bezier = None
+        self._coordinates = {}
+
+    def coordinates(self, num_points: int = 100,
+                    distribution: PointDistribution = PointDistribution.UNIFORM):
+        """
+        points along the surface spaced by the distribution, made once for
+        each num_points and distribution until the nodes change
+
+        returns:
+            read only (num_points, 2) array
+        """
+        points = self._coordinates.get((num_points, distribution))
+        if points is None:
+            s_vals = self.bezier.parameters(num_points, distribution)
+            points = self.bezier.evaluate(s_vals)
+            points.flags.writeable = False
+            self._coordinates[(num_points, distribution)] = points
+        return points
+
+    def get_xy_coords(self, num_points = 100,
+                      distribution: PointDistribution = PointDistribution.UNIFORM):
         """
         get x and y coordinates of the whole surface
         """
-        s_vals = np.linspace(0, 1, num_points)
-        points = self.bezier.evaluate_multi(s_vals)
-        x, y = zip(*points)
+        points = self.coordinates(num_points, distribution)
 
-        return list(x), list(y)
+        return points[:, 0].tolist(), points[:, 1].tolist()
 
-    def get_y(self, x: float, **kwargs):
+    def get_y(self, x, **kwargs):
         """
-        Get the y coordinate of a point given by x
+        Get the y coordinate of a point given by x, or of every point of an
+        array of x. s is found exactly for curves up to degree 2, so the
+        newton's method arguments only apply to higher degrees
+
+        inputs:
+            x0: optional starting guess of s
+            tol: step in s newton's method stops at
+            maxiter: most steps of newton's method
 
         returns:
             y coordinate, s value
         """
-
-        def newton_rap(function, target, **kwargs):
-
-            def get_zero_function(function, target):
-
-                def the_function(x):
-                    coords = function(x)
-                    return coords[0][0] - target
-
-                return the_function
-
-            return opt.newton(get_zero_function(function, target), **kwargs)
-
-        s = newton_rap(self.bezier.evaluate, x, **kwargs)
-        return self.bezier.evaluate(s)[0][1], s
+        unsupported = set(kwargs) - set(self.NEWTON_ARGUMENTS)
+        if unsupported:
+            raise TypeError("get_y got unsupported keyword arguments: "
+                            + ", ".join(sorted(unsupported)))
+        y, s = self.bezier.get_y(x, **{self.NEWTON_ARGUMENTS[name]: value
+                                       for name, value in kwargs.items()})
+        if np.ndim(x) == 0:
+            return float(y[0]), float(s[0])
+        return y, s
 
     @property
     def bezier(self):
         """
-        create a bezier curve class from the nodes
+        bezier curve of the nodes, made once and reused
         """
-        return bezier.Curve(self._nodes, degree = self.degree)
+        if self._bezier is None:
+            self._bezier = BezierCurve(self._nodes)
+        return self._bezier
 
     def __mul__(self, value: float):
         """
@@ -232,10 +478,14 @@ class Surface:
         """
         new_nodes = self._nodes * value
 
-        return Surface(*new_nodes, self.degree)
+        return Surface(*new_nodes, degree = self.degree)
 
     def __eq__(self, surface: 'Surface'):
         return self._nodes.all() == surface._nodes.all()
 
-    def plot(num_points, **kwargs):
-        return self.bezier.plot(num_points, **kwargs)
+    def plot(self, num_points, ax = None, color = None):
+        if ax is None:
+            ax = plt.gca()
+        points = self.coordinates(num_points)
+        ax.plot(points[:, 0], points[:, 1], color = color)
+        return ax
@@ -0,0 +1,304 @@
+"""
+many aerofoils of the same form held in arrays, so their coordinates,
+thickness and camber are found for all of them at once
+"""
+import numpy as np
+from scipy.special import comb
+from .aerofoil import Aerofoil, BezierCurve, Surface, PointDistribution
+
+
+class AerofoilFamilyError(Exception):
+    pass
+
+
+def bernstein(degree: int, s):
+    """
+    bernstein basis of the degree at each s
+
+    returns:
+        (len(s), degree + 1) array
+    """
+    s = np.asarray(s, dtype = float)[..., None]
+    index = np.arange(degree + 1)
+    return comb(degree, index) * s ** index * (1 - s) ** (degree - index)
+
+
+def horner(coefficients, s):
+    """
+    polynomials with (N, k) coefficients of s ** k evaluated at (N, M) s,
+    with BezierCurve's horner's method
+    """
+    return BezierCurve.horner(coefficients.T[:, :, None], s)
+
+
+class AerofoilFamily():
+    """
+    aerofoils whose surfaces all have the same number of nodes, stored as
+    (N, nodes, 2) arrays. indexing gives an Aerofoil of one member
+    """
+
+    # iterations of the bracketed newton's method used to invert x, started
+    # from a table of each curve
+    ITERATIONS = 60
+    TOLERANCE = 1e-12
+    TABLE_POINTS = 17
+
+    def __init__(self, suction_nodes, pressure_nodes, degree: int = 2):
+        self.suction_nodes = np.ascontiguousarray(suction_nodes, dtype = float)
+        self.pressure_nodes = np.ascontiguousarray(pressure_nodes, dtype = float)
+        if self.suction_nodes.ndim != 3 or \
+                self.suction_nodes.shape != self.pressure_nodes.shape:
+            raise AerofoilFamilyError("suction and pressure nodes must both be "
+                                      "(N, nodes, 2) arrays")
+        self.degree = degree
+        self._coefficients = {}
+
+    @classmethod
+    def from_parameters(cls, parameters, degree: int = 2):
+        """
+        the family of Aerofoil.develop_aerofoil for each row of parameters
+
+        inputs:
+            parameters: (N, 5) array of le_top, le_bottom, thickness,
+                camber_x, camber_y
+        """
+        parameters = np.atleast_2d(np.asarray(parameters, dtype = float))
+        if parameters.shape[1] != 5:
+            raise AerofoilFamilyError("parameters must be an (N, 5) array")
+        le_top, le_bottom, thickness, camber_x, camber_y = parameters.T
+
+        def surface_nodes(le_y, mid_y):
+            nodes = np.zeros((len(parameters), 4, 2))
+            nodes[:, 1, 1] = le_y
+            nodes[:, 2, 0] = camber_x
+            nodes[:, 2, 1] = mid_y
+            nodes[:, 3, 0] = 1
+            return nodes
+
+        return cls(surface_nodes(le_top, camber_y + thickness * 0.5),
+                   surface_nodes(le_bottom, camber_y - thickness * 0.5),
+                   degree)
+
+    def __len__(self):
+        return len(self.suction_nodes)
+
+    def __getitem__(self, index) -> Aerofoil:
+        if isinstance(index, slice):
+            return AerofoilFamily(self.suction_nodes[index],
+                                  self.pressure_nodes[index], self.degree)
+        return Aerofoil(Surface(*self.suction_nodes[index], degree = self.degree),
+                        Surface(*self.pressure_nodes[index], degree = self.degree))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def _nodes(self, surface):
+        return self.suction_nodes if surface == "suction" else self.pressure_nodes
+
+    def _power_coefficients(self, surface):
+        if surface not in self._coefficients:
+            nodes = self._nodes(surface)
+            self._coefficients[surface] = np.einsum(
+                "ki,nid->nkd", BezierCurve.power_basis(nodes.shape[1] - 1), nodes)
+        return self._coefficients[surface]
+
+    def _evaluate(self, surface, s):
+        """
+        points of a surface of every member at s, an (N, M) array or an (M,)
+        array shared by all members
+
+        returns:
+            (N, M, 2) array
+        """
+        nodes = self._nodes(surface)
+        if np.ndim(s) == 1:
+            return np.einsum("mi,nid->nmd", bernstein(nodes.shape[1] - 1, s), nodes)
+        coefficients = self._power_coefficients(surface)
+        return np.stack([horner(coefficients[:, :, 0], s),
+                         horner(coefficients[:, :, 1], s)], axis = 2)
+
+    def get_s(self, surface: str, x):
+        """
+        curve parameter of a surface of every member at each x, newton's
+        method kept inside a bisection bracket so it converges for any curve
+        with x increasing along it
+
+        inputs:
+            surface: "suction" or "pressure"
+            x: (M,) array, or (N, M) array of x for each member
+
+        returns:
+            (N, M) array
+        """
+        coefficients = self._power_coefficients(surface)[:, :, 0]
+        derivative = coefficients[:, 1:] * np.arange(1, coefficients.shape[1])
+        x = np.broadcast_to(np.asarray(x, dtype = float),
+                            (len(self), np.shape(x)[-1]))
+
+        # start from a table of each curve, which is increasing in x
+        table_s = np.linspace(0, 1, self.TABLE_POINTS)
+        table_x = horner(coefficients, np.broadcast_to(table_s, (len(self),
+                                                                     len(table_s))))
+        segment = np.clip(np.sum(table_x[:, None, :] <= x[:, :, None], axis = 2) - 1,
+                          0, len(table_s) - 2)
+        x0 = np.take_along_axis(table_x, segment, 1)
+        x1 = np.take_along_axis(table_x, segment + 1, 1)
+        fraction = np.clip((x - x0) / np.where(x1 == x0, 1, x1 - x0), 0, 1)
+        low, high = table_s[segment], table_s[segment + 1]
+        s = low + fraction * (high - low)
+
+        converged = np.zeros(x.shape, dtype = bool)
+        for _ in range(self.ITERATIONS):
+            error = horner(coefficients, s) - x
+            low = np.where(error < 0, s, low)
+            high = np.where(error > 0, s, high)
+            slope = horner(derivative, s)
+            new_s = s - error / np.where(slope == 0, 1, slope)
+            # bisect where newton leaves the bracket
+            outside = (new_s < low) | (new_s > high) | (slope == 0)
+            new_s = np.where(outside, 0.5 * (low + high), new_s)
+            # points already found are left where they are
+            new_s = np.where(converged | (error == 0), s, new_s)
+            converged |= np.abs(new_s - s) < self.TOLERANCE
+            s = new_s
+            if np.all(converged):
+                break
+        return s
+
+    def get_y(self, surface: str, x):
+        """
+        y of a surface of every member at each x
+
+        returns:
+            (N, M) array
+        """
+        return self._evaluate(surface, self.get_s(surface, x))[:, :, 1]
+
+    def thickness(self, x):
+        """
+        distance between the surfaces of every member at each x
+
+        returns:
+            (N, M) array
+        """
+        return self.get_y("suction", x) - self.get_y("pressure", x)
+
+    def camber(self, x):
+        """
+        height of the camber line of every member at each x
+
+        returns:
+            (N, M) array
+        """
+        return 0.5 * (self.get_y("suction", x) + self.get_y("pressure", x))
+
+    def is_closed(self, tolerance: float = 1e-9):
+        """
+        true for members whose surfaces meet at the leading and trailing edges
+        """
+        gap = np.abs(self.suction_nodes[:, [0, -1]] - self.pressure_nodes[:, [0, -1]])
+        return np.all(gap <= tolerance, axis = (1, 2))
+
+    def is_single_valued(self, num_points: int = 50):
+        """
+        true for members where x increases along both surfaces, so neither
+        folds back over itself and y is a function of x
+        """
+        s = np.linspace(0, 1, num_points)
+        increasing = np.ones(len(self), dtype = bool)
+        for surface in ("suction", "pressure"):
+            x = self._evaluate(surface, s)[:, :, 0]
+            increasing &= np.all(np.diff(x, axis = 1) > 0, axis = 1)
+        return increasing
+
+    def thickness_distribution(self, num_points: int = 50):
+        """
+        thickness of each member at cosine spaced x between, but not at, its
+        leading and trailing edges, negative where the surfaces cross
+
+        returns:
+            (N, num_points) array
+        """
+        start, end = self.suction_nodes[:, :1, 0], self.suction_nodes[:, -1:, 0]
+        spacing = 0.5 * (1 - np.cos(np.linspace(0, np.pi, num_points + 2)[1:-1]))
+        return self.thickness(start + (end - start) * spacing)
+
+    def fits(self, boxes, num_points: int = 20):
+        """
+        vectorised Aerofoil.check_fits for a rectangle in each member, given
+        in the aerofoil's coordinates. the parts of a rectangle outside the
+        aerofoil in x are ignored, as check_fits does
+
+        inputs:
+            boxes: (N, 4) array of x_min, x_max, y_min, y_max
+
+        returns:
+            (N,) boolean array
+        """
+        boxes = np.atleast_2d(np.asarray(boxes, dtype = float))
+        start = np.maximum(boxes[:, 0], self.suction_nodes[:, 0, 0])
+        end = np.minimum(boxes[:, 1], self.suction_nodes[:, -1, 0])
+        overlap = start <= end
+
+        x = start[:, None] + (end - start)[:, None] * np.linspace(0, 1, num_points)
+        x = np.where(overlap[:, None], x, self.suction_nodes[:, -1:, 0])
+        above = np.all(self.get_y("suction", x) > boxes[:, 3:4], axis = 1)
+        below = np.all(self.get_y("pressure", x) < boxes[:, 2:3], axis = 1)
+        return overlap & above & below
+
+    def is_valid(self, minimum_thickness: float = 0.0, boxes = None,
+                 num_points: int = 50):
+        """
+        geometric screening of every member before it is analysed, true for
+        closed aerofoils with single valued surfaces that do not cross, at
+        least minimum_thickness thick and fitting any boxes given
+
+        returns:
+            (N,) boolean array
+        """
+        valid = self.is_closed() & self.is_single_valued(num_points)
+        with np.errstate(invalid = "ignore"):
+            thickness = self.thickness_distribution(num_points)
+            valid &= np.all(thickness > 0, axis = 1)
+            valid &= np.max(thickness, axis = 1) >= minimum_thickness
+            if boxes is not None:
+                valid &= self.fits(boxes)
+        return valid
+
+    def surface_coordinates(self, surface: str, num_points: int = 100,
+                            distribution: PointDistribution = PointDistribution.UNIFORM):
+        """
+        points along a surface of every member
+
+        returns:
+            (N, num_points, 2) array
+        """
+        uniform = np.linspace(0, 1, num_points)
+        if distribution is PointDistribution.UNIFORM:
+            s = uniform
+        elif distribution is PointDistribution.COSINE:
+            nodes = self._nodes(surface)
+            start, end = nodes[:, :1, 0], nodes[:, -1:, 0]
+            s = self.get_s(surface, start + (end - start)
+                           * 0.5 * (1 - np.cos(np.pi * uniform)))
+            s[:, 0], s[:, -1] = 0, 1
+        else:
+            # spacing along the surface depends on each member's shape
+            return np.stack([getattr(aerofoil, surface + "_surface")
+                             .coordinates(num_points, distribution)
+                             for aerofoil in self])
+        return self._evaluate(surface, s)
+
+    def coordinates(self, num_points: int = 100,
+                    distribution: PointDistribution = PointDistribution.UNIFORM):
+        """
+        coordinates of every member from the trailing edge along the suction
+        surface and back along the pressure surface, as Aerofoil.coordinates
+
+        returns:
+            (N, 2 * num_points, 2) array
+        """
+        suction = self.surface_coordinates("suction", num_points, distribution)
+        pressure = self.surface_coordinates("pressure", num_points, distribution)
+        return np.concatenate([suction[:, ::-1], pressure], axis = 1)
@@ -1,7 +1,6 @@
 """
 Script for generating aerofoil files
 """
-import bezier
 import numpy as np
 import matplotlib.pyplot as plt
 from typing import List
@@ -1 +1,4 @@
-from .process import Process, Runner
+from .process import (Process, Runner, ProcessOutputError, ProcessTimeoutError,
+                      ProcessExitedError, RuntimeDirectoryError, runtime_root,
+                      create_runtime_directory, MAX_PATH_LENGTH)
+from .cache import hash_content, MemoryCache, DiskCache
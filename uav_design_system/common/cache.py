@@ -0,0 +1,194 @@
+"""
+caches for storing the results of expensive solver runs
+"""
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def hash_content(*parts) -> str:
+    """
+    creates a key from a number of strings or bytes, the same parts always
+    give the same key
+    """
+    hasher = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        hasher.update(part)
+        # separate parts so ('ab', 'c') and ('a', 'bc') differ
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+class MemoryCache():
+    """
+    stores values in memory, the least recently used entries are removed once
+    the cache has more than max_entries
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default = None):
+        """
+        returns the value stored for the key, or default if there is none
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last = False)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0
+
+
+class DiskCache():
+    """
+    stores json serialisable values in gzipped files named by their key. the
+    least recently used entries are removed once the cache is over its size.
+    several processes can share the same directory
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(self, directory: str, max_size: int = None,
+                 max_entries: int = None):
+        """
+        inputs:
+            directory: folder the entries are stored in, created if missing
+            max_size: total bytes of stored entries kept, unlimited if None
+            max_entries: number of entries kept, unlimited if None
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents = True, exist_ok = True)
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.directory / (key + DiskCache.SUFFIX)
+
+    def _entries(self):
+        return list(self.directory.glob("*" + DiskCache.SUFFIX))
+
+    def get(self, key: str, default = None):
+        """
+        returns the value stored for the key, or default if there is none
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(str(path), "rt") as open_file:
+                value = json.load(open_file)
+        except (OSError, EOFError, ValueError):
+            # missing, or removed by another process while being read
+            with self._lock:
+                self.misses += 1
+            return default
+
+        # mark as recently used
+        try:
+            os.utime(str(path))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value):
+        """
+        stores a value under the key, replacing any value already stored
+        """
+        # write to a temporary file first so readers never see half an entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir = str(self.directory),
+                                                      suffix = ".tmp")
+        os.close(file_descriptor)
+        try:
+            with gzip.open(temp_path, "wt") as open_file:
+                json.dump(value, open_file, separators = (",", ":"))
+            os.replace(temp_path, str(self._path(key)))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        """
+        removes the least recently used entries until the cache is in its limits
+        """
+        if self.max_size is None and self.max_entries is None:
+            return
+
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(key = lambda entry: entry[0])
+
+        total_size = sum(entry[1] for entry in entries)
+        while entries and ((self.max_entries is not None
+                            and len(entries) > self.max_entries)
+                           or (self.max_size is not None
+                               and total_size > self.max_size)):
+            _, size, path = entries.pop(0)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            total_size -= size
+
+    def __contains__(self, key):
+        return self._path(key).exists()
+
+    def __len__(self):
+        return len(self._entries())
+
+    def clear(self):
+        for path in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0
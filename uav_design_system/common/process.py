@@ -3,29 +3,85 @@ class to wrap the Popen class from the subprocess library
 """
 import subprocess
 import os
+import re
+import time
 import shutil
+import tempfile
+import threading
+import codecs
 from pathlib import Path
 
+# xfoil cannot read file paths longer than this
+MAX_PATH_LENGTH = 64
+
+
+class ProcessOutputError(Exception):
+
+    def __init__(self, message, output = ""):
+        super().__init__(message)
+        # text received from the process before the error
+        self.output = output
+
+class ProcessTimeoutError(ProcessOutputError):
+    pass
+
+class ProcessExitedError(ProcessOutputError):
+    pass
+
+
+class RuntimeDirectoryError(Exception):
+    pass
+
+
+def runtime_root():
+    """
+    folder that runtime directories are made in, the home directory unless
+    the UAV_RUNTIME_ROOT environment variable gives another (short) path
+    """
+    return Path(os.getenv('UAV_RUNTIME_ROOT', str(Path.home())))
+
+
+def create_runtime_directory(prefix: str, root: str = None,
+                             max_length: int = None) -> Path:
+    """
+    creates a new uniquely named directory for a solver to run in, so any
+    number of solvers can run at once on the same host
+
+    inputs:
+        prefix: start of the directory name
+        root: folder to create the directory in, defaults to runtime_root()
+        max_length: longest allowed path for the directory
+
+    returns:
+        path to the new directory
+    """
+    root = runtime_root() if root is None else Path(root)
+    root.mkdir(parents = True, exist_ok = True)
+    directory = Path(tempfile.mkdtemp(prefix = prefix, dir = str(root)))
+
+    if max_length is not None and len(str(directory)) > max_length:
+        shutil.rmtree(str(directory))
+        raise RuntimeDirectoryError(f"runtime directory {directory} is longer "
+                                    f"than {max_length} characters, use a "
+                                    f"shorter root or set UAV_RUNTIME_ROOT")
+    return directory
+
 
 class Runner():
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, root: str = None):
         """
         Creates a runtime directory and process for an executable
         inputs:
 
             file_path (str): path to executable
+            root (str): folder to make the runtime directory in, defaults to
+                        runtime_root()
         """
 
         # make a temp folder to run analysis in
         # temp folder located here because xfoil file path limit (64 chars)
-        home_directory = Path(os.getenv('HOME'))
-        self._temp_folder = home_directory / 'temp'
-
-        if self._temp_folder.exists():
-            shutil.rmtree(str(self._temp_folder))
-
-        os.makedirs(self._temp_folder)
+        self._temp_folder = create_runtime_directory('run', root)
 
         # create a variable for the path to the location of the xfoil executable
         self.executable = file_path
@@ -40,8 +96,22 @@ class Runner():
         shutil.copy(file_path, self._temp_folder)
         return str(self._temp_folder / file_path.name )
 
+    def close(self):
+        """
+        removes the runtime directory
+        """
+        temp_folder = getattr(self, '_temp_folder', None)
+        if temp_folder is not None and temp_folder.exists():
+            shutil.rmtree(str(temp_folder))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def __del__(self):
-        shutil.rmtree(str(self._temp_folder))
+        self.close()
 
 
 class Process():
@@ -49,6 +119,105 @@ class Process():
     def __init__(self, process):
         self.process = process
 
+        # drain stdout in the background so a long lived process never blocks
+        # on a full pipe
+        self._output = []
+        self._output_finished = False
+        self._output_condition = threading.Condition()
+        self._reader = threading.Thread(target = self._read_output, daemon = True)
+        self._reader.start()
+
+    def _read_output(self):
+        """
+        reads the processes stdout until it closes, storing the text
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors = "replace")
+        file_descriptor = self.process.stdout.fileno()
+        while True:
+            try:
+                chunk = os.read(file_descriptor, 4096)
+            except (OSError, ValueError):
+                break
+            if not chunk:
+                break
+            with self._output_condition:
+                self._output.append(decoder.decode(chunk))
+                self._output_condition.notify_all()
+
+        with self._output_condition:
+            self._output_finished = True
+            self._output_condition.notify_all()
+
+    @property
+    def output(self):
+        """
+        all text written to stdout that has not been read or cleared
+        """
+        with self._output_condition:
+            return "".join(self._output)
+
+    def clear_output(self):
+        with self._output_condition:
+            self._output = []
+
+    def read_until(self, pattern: str, timeout: float = None) -> str:
+        """
+        waits for the output of the process to match a regular expression
+
+        inputs:
+            pattern: regular expression searched for in the unread output
+            timeout: seconds to wait for the match, waits forever if None
+
+        returns:
+            the unread output up to and including the match, which is removed
+            from the output
+        """
+        expression = re.compile(pattern)
+        if timeout is not None:
+            end_time = time.monotonic() + timeout
+
+        with self._output_condition:
+            while True:
+                output = "".join(self._output)
+                match = expression.search(output)
+                if match:
+                    self._output = [output[match.end():]]
+                    return output[:match.end()]
+
+                if self._output_finished:
+                    raise ProcessExitedError(f"process exited before "
+                                             f"{pattern!r} was output", output)
+
+                if timeout is None:
+                    self._output_condition.wait()
+                else:
+                    remaining = end_time - time.monotonic()
+                    if remaining <= 0:
+                        raise ProcessTimeoutError(f"{pattern!r} not output "
+                                                  f"within {timeout}s", output)
+                    self._output_condition.wait(remaining)
+
+    def request(self, command: str, prompt: str, timeout: float = None) -> str:
+        """
+        writes a command then waits for the prompt the process shows once the
+        command has finished
+
+        inputs:
+            command: line written to stdin
+            prompt: regular expression matching the prompt
+            timeout: seconds to wait for the prompt, waits forever if None
+
+        returns:
+            the output of the command, not including the prompt
+        """
+        self.command(command)
+        output = self.read_until(prompt, timeout)
+        return output[:re.search(prompt, output).start()]
+
+    @property
+    def is_alive(self):
+        return self.process.poll() is None
+
     def command(self, command):
         command = self.process.stdin.write(command + "\n")
         self.process.stdin.flush()
@@ -58,10 +227,15 @@ class Process():
         self.close()
 
     def close(self):
+        if self.is_alive:
+            self.process.kill()
+            self.process.wait()
+        self._reader.join()
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
         self.process.stdout.close()
-        self.process.stdin.close()
-        self.process.kill()
-        self.process.poll()
 
     @staticmethod
     def initialise_process(file_path: str, cwd: str = ""):
@@ -80,8 +254,4 @@ class Process():
         return Process(process)
 
     def print(self):
-        self.process.stdin.close()
-        i = 0
-        while i < 500:
-            i += 1
-            print(self.process.stdout.readline())
+        print(self.output)
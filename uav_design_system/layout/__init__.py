@@ -2,3 +2,4 @@ from .masses import *
 from .component import *
 from .geometry import *
 from .athena_vortex_lattice import *
+from .properties import *
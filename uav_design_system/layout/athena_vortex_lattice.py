@@ -3,7 +3,11 @@ file for athena vortext lattice interface
 """
 
 def create_mass_file(file_name: str, arrangement: "Arrangement",
-                                     properties):
+                                     properties, lumped: bool = False):
+    """
+    writes the masses of an arrangement to an avl mass file, lumped writes the
+    whole arrangement as one mass with its full inertia tensor
+    """
 
     title_string = """# Plane Name: {0}
 Lunit = 1.0 m
@@ -16,7 +20,10 @@ rho = {2}
            properties["gravity"],
            properties["density"])
 
-    mass_string = "\n".join(arrangement.avl_mass_list)
+    if lumped:
+        mass_string = arrangement.avl_lumped_mass_string
+    else:
+        mass_string = "\n".join(arrangement.avl_mass_list)
     with open(file_name, "w") as open_file:
         open_file.write(title_string + mass_string)
 
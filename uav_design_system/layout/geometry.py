@@ -2,9 +2,18 @@
 file containing geometry
 """
 from math import pi
-
-class ThreeDimentional:
-    pass
+from .observable import Observable
+
+class ThreeDimentional(Observable):
+    """
+    solid shapes, which tell their observers when any of their dimensions or
+    their location is set
+    """
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._notify("changed", name)
 
 class TwoDimentional:
     pass
@@ -2,12 +2,27 @@ from os.path import dirname, abspath
 this_directory = dirname(abspath(__file__))
 import sys
 sys.path.append(this_directory)# so uggo thanks to atom runner
-from .geometry import Point
+from .geometry import Point, Point2D
+from .properties import MassProperties
+from .observable import Observable
 import copy
 from matplotlib import pyplot as plt
 
-class IsArrangeable:
-    pass
+class IsArrangeable(Observable):
+    """
+    anything that can be placed in an arrangement. observers are told when
+    it moves, when its mass, geometry or density changes, or when objects
+    are added to, removed from or replaced in it
+    """
+
+    def _copy(self):
+        """
+        shallow copy without the observers of this object
+        """
+        copied = copy.copy(self)
+        copied.__dict__.pop("_observers", None)
+        return copied
+
 
 class Arrangement(IsArrangeable):
     """
@@ -15,14 +30,22 @@ class Arrangement(IsArrangeable):
     """
     def __init__(self, name: str = "", *objects: IsArrangeable):
         self.name = name
+        self._objects = list(objects)
+        self._location = Point(0, 0, 0)
+        self._tracker = None
 
-        # if no objects are provided create an empty list
-        if objects:
-            self.objects = objects
-        else:
-            self.objects = []
+    @property
+    def objects(self):
+        """
+        the objects of this arrangement, read only so every change goes
+        through append, remove or setting objects and is seen by observers
+        """
+        return tuple(self._objects)
 
-        self._location = Point(0, 0, 0)
+    @objects.setter
+    def objects(self, objects):
+        previous, self._objects = self._objects, list(objects)
+        self._notify("replaced", previous)
 
     @property
     def location(self):
@@ -31,9 +54,21 @@ class Arrangement(IsArrangeable):
     @location.setter
     def location(self, value: "Point"):
         self._location = value
+        self._notify("moved")
 
     def append(self, value: IsArrangeable):
-        self.objects.append(value)
+        self._objects.append(value)
+        self._notify("added", value)
+
+    def remove(self, value: IsArrangeable):
+        """
+        removes an object, the instance given rather than any equal to it
+        """
+        index = next((i for i, ob in enumerate(self._objects) if ob is value), None)
+        if index is None:
+            raise KeyError(f"{value} is not in arrangement {self.name}")
+        del self._objects[index]
+        self._notify("removed", value)
 
     @property
     def all_mass_objects(self):
@@ -48,12 +83,12 @@ class Arrangement(IsArrangeable):
             for object in objects:
 
                 if isinstance(object, Arrangement):
-                    mass_list += _all_mass_objects(object.objects)
+                    mass_list += _all_mass_objects(object._objects)
                 else:
                     mass_list.append(object)
             return mass_list
 
-        return _all_mass_objects(self.objects)
+        return _all_mass_objects(self._objects)
 
     def flatten(self, name: str = ""):
         """
@@ -61,38 +96,95 @@ class Arrangement(IsArrangeable):
         arrangement that only contains mass objects, where each mass object has
         had the location of its parent arrangements added to it.
 
-        returns an arrangement with masses with global locations
+        returns an arrangement of views of the masses with global locations,
+        the original instances are not copied or editted
         """
-        def _all_mass_objects_global(arrangement):
-
-            mass_list = []
-            for object in arrangement:
-
-                if isinstance(object, Arrangement):
-                    new_mass_list = _all_mass_objects_global(object)
-                    mass_list += new_mass_list
-                else:
-                    mass_list.append(object)
+        return Arrangement(name, *(MassView(mass, Point(*offset))
+                                   for mass, offset in self.mass_objects_global()))
 
-            # create copies so original instances are not editted
-            cloned_list = [mass.clone() for mass in mass_list]
-            # correct locations to add the arrangements
-            for ob in cloned_list:
-                ob.location += arrangement.location
-            return cloned_list
+    def mass_objects_global(self, offset = (0, 0, 0)):
+        """
+        generator of all mass objects within this arrangement with the summed
+        location of their parent arrangements, without copying them
+        """
+        offset = tuple(a + b for a, b in zip(offset, self.location.as_tuple()))
+        for object in self._objects:
+            if isinstance(object, Arrangement):
+                yield from object.mass_objects_global(offset)
+            else:
+                yield object, offset
+
+    def mass_properties(self) -> MassProperties:
+        """
+        the masses, centers of gravity and inertias of all mass objects in
+        arrays. built once then kept up to date as the masses and
+        arrangements within this one move or are added and removed
+        """
+        if getattr(self, "_tracker", None) is None:
+            self._tracker = MassTracker(self)
+        return self._tracker.properties
 
-        return Arrangement(name, *_all_mass_objects_global(self))
+    def __getstate__(self):
+        # the tracker observes these masses, copies build their own
+        state = super().__getstate__()
+        state.pop("_tracker", None)
+        return state
 
     @property
     def avl_mass_list(self):
         string_list = []
-        for mass_object in self.all_mass_objects:
-            string_list.append(mass_object.avl_mass_string)
+        for mass_object, offset in self.mass_objects_global():
+            string_list.append(MassView(mass_object, Point(*offset)).avl_mass_string)
         return string_list
 
+    @property
+    def avl_lumped_mass_string(self):
+        """
+        athena vortex lattice mass data string of the whole arrangement as one
+        mass, with the products of inertia
+        """
+        properties = self.mass_properties()
+        x, y, z = properties.center_of_gravity.as_tuple()
+        inertia = properties.inertia_tensor()
+        # avl products of inertia are the integrals of xy, xz and yz, adding
+        # zero so there are no negative zeros
+        values = [properties.mass, x, y, z,
+                  inertia[0, 0], inertia[1, 1], inertia[2, 2],
+                  0.0 - inertia[0, 1], 0.0 - inertia[0, 2], 0.0 - inertia[1, 2]]
+        return "   ".join(str(float(value)) for value in values)
+
     @property
     def mass(self):
-        return sum(mass.mass for mass in self.all_mass_objects)
+        return self.mass_properties().mass
+
+    @property
+    def total_mass(self):
+        return self.mass
+
+    @property
+    def inertia_tensor(self):
+        """
+        3x3 inertia tensor of all the masses about the global center of
+        gravity
+        """
+        return self.mass_properties().inertia_tensor()
+
+    @property
+    def avl_case_parameters(self):
+        """
+        mass, center of gravity and inertias as TrimCase parameters
+        """
+        properties = self.mass_properties()
+        x, y, z = properties.center_of_gravity.as_tuple()
+        inertia = properties.inertia_tensor()
+        return {"mass": properties.mass,
+                "x cg": x, "y cg": y, "z cg": z,
+                "ixx": float(inertia[0, 0]),
+                "iyy": float(inertia[1, 1]),
+                "izz": float(inertia[2, 2]),
+                "ixy": float(0.0 - inertia[0, 1]),
+                "iyz": float(0.0 - inertia[1, 2]),
+                "izx": float(0.0 - inertia[0, 2])}
 
     @property
     def center_of_gravity(self):
@@ -100,30 +192,32 @@ class Arrangement(IsArrangeable):
 
     @property
     def center_of_gravity_global(self):
-        flat = self.flatten()
-
-        mom_x = sum(mass.mass * mass.center_of_gravity_global.x for mass in flat)
-        mom_y = sum(mass.mass * mass.center_of_gravity_global.y for mass in flat)
-        mom_z = sum(mass.mass * mass.center_of_gravity_global.z for mass in flat)
-
-        return Point(mom_x/self.mass,
-                     mom_y/self.mass,
-                     mom_z/self.mass)
+        return self.mass_properties().center_of_gravity
 
     def clone(self, reflect_y = False):
         """
-        clone and return this object
+        clone and return this object, the masses are views of these masses so
+        moving them does not move these, use materialise for a full copy
         """
-        clone = copy.deepcopy(self)
-        if reflect_y:
-            # change the locations of all points in the test_clone
-            for mass in clone.all_mass_objects:
-                mass.geometry = mass.geometry.reflect_y()
+        clone = self._copy()
+        clone._tracker = None
+        clone.objects = [object.clone(reflect_y = reflect_y) for object in self.objects]
+        clone.location = Point(*self.location.as_tuple())
         return clone
 
+    def materialise(self):
+        """
+        a full copy of this arrangement and every mass in it
+        """
+        copied = self._copy()
+        copied._tracker = None
+        copied.objects = [object.materialise() for object in self.objects]
+        copied.location = Point(*self.location.as_tuple())
+        return copied
+
     def __getitem__(self, value):
 
-        val = [ob for ob in self.objects if ob.name == value]
+        val = [ob for ob in self._objects if ob.name == value]
 
         if not val:
             raise KeyError(f"no object in arrangement with name {value}")
@@ -131,11 +225,11 @@ class Arrangement(IsArrangeable):
         return val
 
     def __iter__(self):
-        for ob in self.objects:
+        for ob in self._objects:
             yield ob
 
     def __len__(self):
-        return len(self.objects)
+        return len(self._objects)
 
     def plot_xy(self, subplot = None, center_of_gravity = False, marker = "b-"):
         """
@@ -146,7 +240,7 @@ class Arrangement(IsArrangeable):
             plot = plt.subplot(111)
 
         for mass in self.flatten():
-            x,y  = mass.geometry.project_xy.plot_coordinates
+            x,y  = mass.project_xy.plot_coordinates
             subplot.plot(x, y, marker)
 
             if center_of_gravity:
@@ -166,8 +260,47 @@ class MassObject(IsArrangeable):
 
     def __init__(self, geometry: 'ThreeDimentional', density: float, name = ""):
         self.name = name
-        self.geometry = copy.deepcopy(geometry)
+        # the geometry may be shared between mass objects, each has its own
+        # location
+        self.geometry = geometry
         self.density = density
+        self._location = Point(*geometry.location.as_tuple())
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @geometry.setter
+    def geometry(self, geometry: 'ThreeDimentional'):
+        """
+        sets the geometry, and listens for changes to its dimensions
+        """
+        old = self.__dict__.get("_geometry")
+        if isinstance(old, Observable):
+            old.remove_observer(self._geometry_changed)
+        self._geometry = geometry
+        if isinstance(geometry, Observable):
+            geometry.add_observer(self._geometry_changed)
+        self._notify("changed")
+
+    def _geometry_changed(self, geometry, change: str, value = None):
+        self._notify("changed")
+
+    @property
+    def density(self):
+        return self._density
+
+    @density.setter
+    def density(self, density: float):
+        self._density = density
+        self._notify("changed")
+
+    def __setstate__(self, state):
+        # copies listen to their own geometry
+        self.__dict__.update(state)
+        geometry = state.get("_geometry")
+        if isinstance(geometry, Observable):
+            geometry.add_observer(self._geometry_changed)
 
     @property
     def mass(self):
@@ -182,21 +315,28 @@ class MassObject(IsArrangeable):
 
     @property
     def center_of_gravity_global(self):
-        return self.geometry.centroid + self.location
+        return self.center_of_gravity + self.location
 
     @property
     def location(self):
         """
         get the global position of the origin of this object
         """
-        return self.geometry.location
+        return self._location
 
     @location.setter
     def location(self, value: 'Point'):
         """
         set the global position of the origin of this object
         """
-        self.geometry.location = value
+        self._location = value
+        self._notify("moved")
+
+    @property
+    def project_xy(self):
+        projection = self.geometry.project_xy
+        projection.location = Point2D(self.location.x, self.location.y)
+        return projection
 
     @property
     def inertia_xx(self):
@@ -227,14 +367,19 @@ class MassObject(IsArrangeable):
         return template
 
     def clone(self, reflect_y = False):
+        """
+        a view of this object, optionally reflected in the y axis, that can be
+        moved without moving this object
+        """
+        return MassView(self, reflect_y = reflect_y)
 
-        clone = copy.deepcopy(self)
-
-        if reflect_y:
-            reflected_geom = clone.geometry.reflect_y()
-            clone.geometry = clone.geometry.reflect_y()
-
-        return clone
+    def materialise(self):
+        """
+        a full copy of this object
+        """
+        copied = MassObject(copy.deepcopy(self.geometry), self.density, self.name)
+        copied.location = Point(*self.location.as_tuple())
+        return copied
 
     def __eq__(self, value):
 
@@ -250,5 +395,233 @@ class MassObject(IsArrangeable):
         return MassObject(geometry, density, name)
 
 
+class MassView(MassObject):
+    """
+    a mass object moved by an offset and optionally reflected in the y axis,
+    the transform is applied when its properties are read so nothing is
+    copied. changes to the viewed object show in the view
+    """
+
+    def __init__(self, mass_object: MassObject, offset: Point = None,
+                 reflect_y: bool = False):
+        self.mass_object = mass_object
+        self.name = mass_object.name
+        self.offset = Point(0, 0, 0) if offset is None else offset
+        self.reflected = reflect_y
+
+    def _transform(self, point: Point) -> Point:
+        return point.reflect_y() if self.reflected else point
+
+    @property
+    def geometry(self):
+        geometry = self.mass_object.geometry
+        return geometry.reflect_y() if self.reflected else geometry
+
+    @property
+    def density(self):
+        return self.mass_object.density
+
+    @property
+    def mass(self):
+        return self.mass_object.mass
+
+    @property
+    def center_of_gravity(self):
+        return self._transform(self.mass_object.center_of_gravity)
+
+    @property
+    def location(self):
+        return self._transform(self.mass_object.location) + self.offset
+
+    @location.setter
+    def location(self, value: 'Point'):
+        """
+        moves the view, not the viewed object
+        """
+        self.offset = value - self._transform(self.mass_object.location)
+        self._notify("moved")
+
+    @property
+    def inertia_xx(self):
+        return self.mass_object.inertia_xx
+
+    @property
+    def inertia_yy(self):
+        return self.mass_object.inertia_yy
+
+    @property
+    def inertia_zz(self):
+        return self.mass_object.inertia_zz
+
+    def clone(self, reflect_y = False):
+        return MassView(self, reflect_y = reflect_y)
+
+    def materialise(self):
+        copied = MassObject(copy.deepcopy(self.geometry), self.density, self.name)
+        copied.location = self.location
+        return copied
+
+
+class MassTracker():
+    """
+    keeps the mass properties of an arrangement up to date by observing the
+    mass objects, views and arrangements within it. moving or changing a
+    mass updates its row and moving an arrangement shifts the rows within
+    it, adding an object appends rows and removing or replacing objects
+    removes their rows, all without reading the other masses again. an
+    arrangement in more than one place cannot have its rows told apart, so
+    adding or removing within it builds the properties again
+    """
+
+    def __init__(self, arrangement: Arrangement):
+        self.arrangement = arrangement
+        self._observed = {}
+        self._build()
+
+    def _build(self):
+        for observed in self._observed.values():
+            observed.remove_observer(self._changed)
+        self.properties = None
+        self._pending = []
+        # ids of the parent arrangements of each row, and of its mass object
+        # and the objects it views
+        self._keys = []
+        # rows affected by each observed object, by id
+        self._rows = {}
+        self._observed = {}
+        # parent arrangements of each arrangement and its last location
+        self._parents = {}
+        self._locations = {}
+        self._add(self.arrangement, ())
+        self.properties = MassProperties(*zip(*self._pending))
+
+    def _observe(self, observed, index = None):
+        if id(observed) not in self._observed:
+            self._observed[id(observed)] = observed
+            observed.add_observer(self._changed)
+        rows = self._rows.setdefault(id(observed), set())
+        if index is not None:
+            rows.add(index)
+
+    def _release(self, key: int):
+        """
+        stops observing an object once no rows or arrangements need it
+        """
+        if self._rows.get(key) or key in self._parents:
+            return
+        self._rows.pop(key, None)
+        self._observed.pop(key).remove_observer(self._changed)
+
+    def _offset(self, parents):
+        offset = Point(0, 0, 0)
+        for parent in parents:
+            offset = offset + parent.location
+        return offset.as_tuple()
+
+    def _add(self, object, parents):
+        if isinstance(object, Arrangement):
+            if id(object) in self._parents:
+                # the same arrangement twice, its rows cannot be told apart
+                self._parents[id(object)] = None
+            else:
+                self._parents[id(object)] = parents
+            self._locations[id(object)] = object.location.as_tuple()
+            self._observe(object)
+            for child in object._objects:
+                self._add(child, parents + (object,))
+            return
+
+        if self.properties is None:
+            index = len(self._pending)
+            self._pending.append((object, self._offset(parents)))
+        else:
+            index = self.properties.append(object, self._offset(parents))
+        for parent in parents:
+            self._observe(parent, index)
+        # views move when the objects they view move
+        viewed, chain = object, []
+        while True:
+            self._observe(viewed, index)
+            chain.append(id(viewed))
+            if not isinstance(viewed, MassView):
+                break
+            viewed = viewed.mass_object
+        self._keys.append((tuple(id(parent) for parent in parents), tuple(chain)))
+
+    def _remove_row(self, index: int):
+        parents, chain = self._keys[index]
+        for key in parents + chain:
+            self._rows[key].discard(index)
+        moved = self.properties.remove(index)
+        last = self._keys.pop()
+        if moved is not None:
+            self._keys[index] = last
+            for key in last[0] + last[1]:
+                self._rows[key].discard(moved)
+                self._rows[key].add(index)
+        for key in parents + chain:
+            self._release(key)
+
+    def _arrangements(self, arrangement: Arrangement):
+        yield arrangement
+        for object in arrangement._objects:
+            if isinstance(object, Arrangement):
+                yield from self._arrangements(object)
+
+    def _discard(self, object, parent: Arrangement) -> bool:
+        """
+        removes the rows of an object taken out of a parent arrangement
+
+        returns:
+            False if its rows cannot be told apart, when nothing is removed
+        """
+        if isinstance(object, Arrangement):
+            arrangements = list(self._arrangements(object))
+            if any(self._parents.get(id(nested)) is None for nested in arrangements):
+                return False
+            # from the last row so the rows still to remove are not moved
+            for index in sorted(self._rows[id(object)], reverse = True):
+                self._remove_row(index)
+            for nested in arrangements:
+                del self._parents[id(nested)]
+                del self._locations[id(nested)]
+                self._release(id(nested))
+            return True
+
+        # one row, an object in a parent twice has the same row twice
+        index = next((index for index in self._rows.get(id(object), ())
+                      if self._keys[index][0][-1:] == (id(parent),)
+                      and self._keys[index][1][0] == id(object)), None)
+        if index is None:
+            return False
+        self._remove_row(index)
+        return True
+
+    def _changed(self, object, change: str, value = None):
+        if change == "moved" and isinstance(object, Arrangement):
+            previous = self._locations[id(object)]
+            self._locations[id(object)] = object.location.as_tuple()
+            shift = [a - b for a, b in zip(object.location.as_tuple(), previous)]
+            self.properties.move(self._rows[id(object)], shift)
+        elif change in ("moved", "changed"):
+            for index in self._rows[id(object)]:
+                self.properties.update(index)
+        elif self._parents.get(id(object)) is None:
+            self._build()
+        elif change == "added":
+            self._add(value, self._parents[id(object)] + (object,))
+        elif change == "removed":
+            if not self._discard(value, object):
+                self._build()
+        elif change == "replaced":
+            if not all(self._discard(old, object) for old in value):
+                self._build()
+                return
+            for new in object._objects:
+                self._add(new, self._parents[id(object)] + (object,))
+        else:
+            self._build()
+
+
 if __name__  == "__main__":
     pass
@@ -0,0 +1,39 @@
+"""
+observers of objects of the layout, so cached properties built from them
+know when they change
+"""
+import weakref
+
+
+class Observable:
+    """
+    observers are called with the object, the change and a value when it
+    changes. they are held by weak reference so observing an object does not
+    keep the observer alive, and are not copied or pickled with the object
+    """
+
+    def add_observer(self, observer):
+        observers = self.__dict__.setdefault("_observers", [])
+        observers.append(weakref.WeakMethod(observer))
+
+    def remove_observer(self, observer):
+        observers = self.__dict__.get("_observers", [])
+        observers[:] = [ref for ref in observers if ref() not in (None, observer)]
+
+    def _notify(self, change: str, value = None):
+        observers = self.__dict__.get("_observers", [])
+        for ref in list(observers):
+            observer = ref()
+            if observer is None:
+                observers.remove(ref)
+            else:
+                observer(self, change, value)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_observers", None)
+        return state
+
+
+if __name__ == "__main__":
+    pass
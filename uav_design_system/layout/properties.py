@@ -0,0 +1,215 @@
+"""
+mass properties of every mass object of an arrangement held in arrays, so the
+totals are found in single reductions
+"""
+import numpy as np
+from .geometry import Point
+
+
+class MassProperties():
+    """
+    masses, centers of gravity and centroidal inertias of mass objects, with
+    the summed locations of their parent arrangements as offsets. the mass
+    objects are read, not copied, so a row is updated with update when its
+    object changes
+
+    the total mass, first and second moments are kept as running sums, so
+    updating, appending, removing or moving a row changes them without summing every
+    row again
+    """
+
+    def __init__(self, mass_objects = (), offsets = ()):
+        """
+        inputs:
+            mass_objects: MassObjects
+            offsets: global location of the parent arrangements of each
+        """
+        self.mass_objects = list(mass_objects)
+        number = len(self.mass_objects)
+        # rows are held in arrays with room to grow, doubled when full so
+        # appending is not a copy of every row
+        self._offsets = np.zeros((number, 3))
+        if number:
+            self._offsets[:] = [tuple(offset) for offset in offsets]
+        self._masses = np.zeros(number)
+        self._centroids = np.zeros((number, 3))
+        # centroidal moments of inertia about x, y and z
+        self._inertias = np.zeros((number, 3))
+        for index in range(number):
+            self._read(index)
+        self.refresh()
+
+    @classmethod
+    def from_arrangement(cls, arrangement: "Arrangement"):
+        mass_objects, offsets = [], []
+        for mass_object, offset in arrangement.mass_objects_global():
+            mass_objects.append(mass_object)
+            offsets.append(offset)
+        return cls(mass_objects, offsets)
+
+    def __len__(self):
+        return len(self.mass_objects)
+
+    @property
+    def offsets(self):
+        return self._offsets[:len(self)]
+
+    @property
+    def masses(self):
+        return self._masses[:len(self)]
+
+    @property
+    def centroids(self):
+        return self._centroids[:len(self)]
+
+    @property
+    def inertias(self):
+        return self._inertias[:len(self)]
+
+    def _grow(self):
+        """
+        doubles the rows the arrays have room for
+        """
+        capacity = max(2 * len(self._masses), 1)
+        for name in ("_offsets", "_masses", "_centroids", "_inertias"):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:])
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _read(self, index: int):
+        mass_object = self.mass_objects[index]
+        self.masses[index] = mass_object.mass
+        self.centroids[index] = mass_object.center_of_gravity_global.as_tuple()
+        self.inertias[index] = (mass_object.inertia_xx,
+                                mass_object.inertia_yy,
+                                mass_object.inertia_zz)
+
+    def _add_moments(self, index: int, sign: int):
+        """
+        adds the moments of a row to the running sums, or removes them
+        """
+        mass = sign * self.masses[index]
+        center = self.centroids[index] + self.offsets[index]
+        arm = center - self._reference
+        self._mass += mass
+        self._first_moment += mass * center
+        self._second_moment += mass * np.outer(arm, arm)
+        self._centroidal_inertia += sign * self.inertias[index]
+
+    def refresh(self):
+        """
+        sums the moments of every row again, removing any rounding the
+        running sums have gathered
+        """
+        centers = self.centers_of_gravity
+        self._mass = float(np.sum(self.masses))
+        self._first_moment = self.masses @ centers
+        # the second moment is kept about the center of gravity when summed,
+        # so it is not the small difference of large moments about the origin
+        self._reference = (self._first_moment / self._mass if self._mass
+                           else np.zeros(3))
+        arms = centers - self._reference
+        self._second_moment = (self.masses[:, None] * arms).T @ arms
+        self._centroidal_inertia = self.inertias.sum(axis = 0)
+
+    def update(self, index: int):
+        """
+        reads the properties of a mass object again, after it has moved or
+        changed
+        """
+        self._add_moments(index, -1)
+        self._read(index)
+        self._add_moments(index, 1)
+
+    def append(self, mass_object: "MassObject", offset = (0, 0, 0)) -> int:
+        """
+        adds a mass object
+
+        returns:
+            index of its row
+        """
+        index = len(self.mass_objects)
+        if index == len(self._masses):
+            self._grow()
+        self.mass_objects.append(mass_object)
+        self._offsets[index] = tuple(offset)
+        self._read(index)
+        self._add_moments(index, 1)
+        return index
+
+    def remove(self, index: int):
+        """
+        removes a row, moving the last row into its place
+
+        returns:
+            index the moved row had, None if the last row was removed
+        """
+        self._add_moments(index, -1)
+        last = len(self.mass_objects) - 1
+        self.mass_objects[index] = self.mass_objects[last]
+        self.mass_objects.pop()
+        for array in (self._offsets, self._masses, self._centroids, self._inertias):
+            array[index] = array[last]
+        if not self.mass_objects:
+            # nothing left to gather rounding
+            self.refresh()
+        return last if index != last else None
+
+    def move(self, indices, shift):
+        """
+        moves the offsets of rows, after their parent arrangement has moved
+        """
+        for index in indices:
+            self._add_moments(index, -1)
+            self.offsets[index] += shift
+            self._add_moments(index, 1)
+
+    @property
+    def centers_of_gravity(self):
+        """
+        global center of gravity of each mass object
+
+        returns:
+            (N, 3) array
+        """
+        return self.centroids + self.offsets
+
+    @property
+    def mass(self) -> float:
+        return float(self._mass)
+
+    @property
+    def first_moment(self):
+        """
+        mass weighted sum of the centers of gravity
+
+        returns:
+            (3,) array
+        """
+        return self._first_moment.copy()
+
+    @property
+    def center_of_gravity(self) -> Point:
+        mass = self.mass
+        return Point(*(float(moment) / mass for moment in self._first_moment))
+
+    def inertia_tensor(self, about: Point = None):
+        """
+        inertia tensor of all the masses about a point, the center of gravity
+        by default, with the parallel axis shift of each mass
+
+        returns:
+            (3, 3) array
+        """
+        if about is None:
+            about = self.center_of_gravity
+        point = np.array(about.as_tuple(), dtype = float) - self._reference
+        first_moment = self._first_moment - self._mass * self._reference
+        # second moment of the masses about the point
+        moment = (self._second_moment - np.outer(first_moment, point)
+                  - np.outer(point, first_moment)
+                  + self._mass * np.outer(point, point))
+        tensor = -moment
+        tensor[np.diag_indices(3)] += np.trace(moment) + self._centroidal_inertia
+        return tensor
@@ -1,2 +1,5 @@
+from .cache import *
+from .evaluators import *
+from .generation import *
 from .genetic import *
 from .schema import *
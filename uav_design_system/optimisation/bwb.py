@@ -88,8 +88,8 @@ def create(input_dict, name = "uav"):
     arrangement = layout.Arrangement("plane arrangement", battery, motor, structural_model, structural_clone)
 
     # create case file -----------------------------------------------------
-    case = avl.TrimCase(surface.area * 2, velocity = 22,
-                        mass = arrangement.total_mass)
+    case = avl.TrimCase.from_arrangement(surface.area * 2, arrangement,
+                                         velocity = 22)
 
     return surface, arrangement, case
 
@@ -0,0 +1,53 @@
+"""
+cache of the fitness of children already evaluated
+"""
+import threading
+from typing import Dict
+from ..common import MemoryCache
+
+
+class FitnessCache(MemoryCache):
+    """
+    fitness of children keyed by their inputs, so a child bred again is not
+    analysed again. with a resolution the inputs are rounded to multiples of
+    it first, so children closer than it share a fitness
+    """
+
+    def __init__(self, resolution: float = None, max_entries: int = None):
+        """
+        inputs:
+            resolution: step each input is rounded to, exact inputs if None
+            max_entries: most fitnesses kept, all of them if None
+        """
+        super().__init__(max_entries)
+        self.resolution = resolution
+
+    def key(self, inputs: Dict[str, float]) -> tuple:
+        items = sorted(inputs.items())
+        if self.resolution is None:
+            return tuple(items)
+        return tuple((name, round(value / self.resolution))
+                     for name, value in items)
+
+    def get(self, inputs: Dict[str, float], default = None):
+        return super().get(self.key(inputs), default)
+
+    def put(self, inputs: Dict[str, float], fitness: float):
+        super().put(self.key(inputs), fitness)
+
+    def __contains__(self, inputs: Dict[str, float]):
+        return super().__contains__(self.key(inputs))
+
+    def __getstate__(self):
+        # saved with checkpoints, without the lock
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,200 @@
+"""
+evaluators that find the fitness of the children of a population, one at a
+time or many at once
+"""
+import math
+import queue
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List
+
+
+class Evaluator(ABC):
+    """
+    runs a fitness function on children. submit starts one evaluation and
+    returns a concurrent.futures.Future, evaluate runs a whole population.
+    an evaluation that raises is retried, then the child is given
+    failure_fitness so one bad design or worker does not stop a run
+    """
+
+    def __init__(self, retries: int = 1, failure_fitness: float = math.inf):
+        """
+        inputs:
+            retries: times a failed evaluation is run again
+            failure_fitness: fitness of children that still fail, the worst
+                possible as lower fitness is better
+        """
+        self.retries = retries
+        self.failure_fitness = failure_fitness
+        self.failures = 0
+
+    @abstractmethod
+    def submit(self, fitness: Callable, child) -> Future:
+        """
+        starts the evaluation of a child, its fitness or error is set on the
+        future returned
+        """
+
+    def result(self, fitness: Callable, child, future: Future) -> float:
+        """
+        the fitness from a submitted evaluation, submitting it again if it
+        failed
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                future = self.submit(fitness, child)
+            try:
+                return future.result()
+            except Exception as error:
+                self.failed(error, future)
+        self.failures += 1
+        return self.failure_fitness
+
+    def evaluate(self, fitness: Callable, children) -> List[float]:
+        """
+        fitness of every child, all submitted before any result is waited for
+        """
+        futures = [self.submit(fitness, child) for child in children]
+        return [self.result(fitness, child, future)
+                for child, future in zip(children, futures)]
+
+    def failed(self, error: Exception, future: Future):
+        """
+        reports the error and future of a failed evaluation, before it is
+        submitted again or given failure_fitness
+        """
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class SerialEvaluator(Evaluator):
+    """
+    evaluates each child on the calling thread when it is submitted
+    """
+
+    def submit(self, fitness: Callable, child) -> Future:
+        future = Future()
+        try:
+            future.set_result(fitness(child))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+
+class ProcessPoolEvaluator(Evaluator):
+    """
+    evaluates children in a pool of processes, so evaluations run on every
+    core. the fitness function and children must be picklable. if a worker
+    process dies the pool is started again and its evaluations retried
+    """
+
+    def __init__(self, max_workers: int = None, retries: int = 1,
+                 failure_fitness: float = math.inf):
+        """
+        inputs:
+            max_workers: number of processes, defaults to one per core
+        """
+        super().__init__(retries, failure_fitness)
+        self.max_workers = max_workers
+        self._executor = None
+        # pool each future was submitted to
+        self._origins = weakref.WeakKeyDictionary()
+
+    def submit(self, fitness: Callable, child) -> Future:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        executor = self._executor
+        try:
+            future = executor.submit(fitness, child)
+        except BrokenProcessPool:
+            self._restart(executor)
+            return self.submit(fitness, child)
+        self._origins[future] = executor
+        return future
+
+    def failed(self, error: Exception, future: Future):
+        if isinstance(error, BrokenProcessPool):
+            self._restart(self._origins.get(future))
+
+    def _restart(self, executor: ProcessPoolExecutor):
+        """
+        shuts down a broken pool so the next submit starts another, unless
+        the pool has already been replaced. evaluations still waiting in it
+        are cancelled and so submitted again when their results are read
+        """
+        if executor is None or executor is not self._executor:
+            return
+        for future, origin in list(self._origins.items()):
+            if origin is executor:
+                future.cancel()
+        executor.shutdown(wait = False)
+        self._executor = None
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+class TaskQueueEvaluator(Evaluator):
+    """
+    workers take evaluations from a shared task queue as they become free,
+    a local stand in for workers spread over many nodes. the workers are
+    threads, suited to fitness functions that wait on solver processes such
+    as avl and xfoil
+    """
+
+    def __init__(self, workers: int = 4, retries: int = 1,
+                 failure_fitness: float = math.inf):
+        super().__init__(retries, failure_fitness)
+        self.workers = workers
+        self._tasks = queue.Queue()
+        self._threads = []
+
+    def _start(self):
+        self._threads = [threading.Thread(target = self._work, daemon = True)
+                         for _ in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            fitness, child, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fitness(child))
+            except Exception as error:
+                future.set_exception(error)
+
+    def submit(self, fitness: Callable, child) -> Future:
+        if not self._threads:
+            self._start()
+        future = Future()
+        self._tasks.put((fitness, child, future))
+        return future
+
+    def close(self):
+        for _ in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,62 @@
+"""
+generations of a genetic run and summaries of them, so a run keeps only what
+it needs as it goes
+"""
+import json
+from typing import List
+
+
+class Generation():
+    """
+    an evaluated population and its number in the run
+    """
+
+    def __init__(self, number: int, population: List["Child"]):
+        self.number = number
+        self.population = population
+
+    def __len__(self):
+        return len(self.population)
+
+    @property
+    def fitnesses(self) -> List[float]:
+        return [child.fitness for child in self.population]
+
+    @property
+    def best(self) -> "Child":
+        return min(self.population, key = lambda child: child.fitness)
+
+    def summary(self) -> dict:
+        """
+        number, size, best, mean and worst fitness and the inputs of the best
+        child of the generation
+        """
+        fitnesses = self.fitnesses
+        return {"generation": self.number,
+                "size": len(fitnesses),
+                "best": min(fitnesses),
+                "mean": sum(fitnesses) / len(fitnesses),
+                "worst": max(fitnesses),
+                "best_inputs": dict(self.best.inputs)}
+
+
+class SummaryFile():
+    """
+    sink appending the summary of each generation to a file as a line of
+    json, so a long run is followed without keeping its populations
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __call__(self, summary: dict):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(summary) + "\n")
+
+    def read(self) -> List[dict]:
+        with open(self.path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    pass
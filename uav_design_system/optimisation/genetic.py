@@ -2,13 +2,22 @@
 file for construting the genetic algorithm for use in this project
 """
 import os
+import gzip
+import pickle
 import shutil
 import tempfile
+import warnings
 from abc import ABC, abstractmethod
 from .schema import Schema
+from .cache import FitnessCache
+from .evaluators import Evaluator, SerialEvaluator
+from .generation import Generation
+from ..aerofoil import AerofoilFamily
 import random
 import collections
-from typing import List, Dict
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import Callable, Iterator, List, Dict
+import numpy as np
 
 
 
@@ -16,6 +25,8 @@ class Child():
 
     def __init__(self, inputs: Dict[str, float]):
         self.inputs = inputs
+        # set once the child is evaluated, so it is not analysed again
+        self.fitness = None
 
 
 class GeneticFactory(ABC):
@@ -24,11 +35,46 @@ class GeneticFactory(ABC):
 
 class Genetic():
 
-
-    def __init__(self, factory: GeneticFactory, schema: Schema):
+    # times a child failing the checks is bred again from its parents before
+    # a random valid child is used in its place
+    BREEDING_ATTEMPTS = 10
+    # generations kept by run, and the best children kept from all of them
+    HISTORY = 10
+    ELITES = 10
+    # children competing in each tournament of the steady state run
+    TOURNAMENT_SIZE = 3
+
+    def __init__(self, factory: GeneticFactory, schema: Schema,
+                 evaluator: Evaluator = None, seed = None,
+                 cache: FitnessCache = None):
+        """
+        inputs:
+            evaluator: runs the fitness of each population, one child at a
+                time on this thread by default
+            seed: seed of the random numbers breeding children, so a run
+                can be repeated
+            cache: fitness of the children evaluated, by their exact inputs
+                by default
+        """
         self.factory = factory
         self.schema = schema
-
+        self.evaluator = evaluator if evaluator is not None else SerialEvaluator()
+        self.cache = cache if cache is not None else FitnessCache()
+        # children bred again as they matched another child
+        self.duplicates = 0
+        self.random = random.Random(seed)
+        self.history = collections.deque(maxlen = self.HISTORY)
+        self.elites = []
+
+    def __getstate__(self):
+        # the fitness method is sent to worker processes with the genetic, but
+        # the evaluator running them and the record of the run are not
+        state = self.__dict__.copy()
+        state["evaluator"] = None
+        state["cache"] = None
+        state["history"] = collections.deque(maxlen = self.HISTORY)
+        state["elites"] = []
+        return state
 
     def fitness(self, child: Child) -> float:
         """
@@ -45,9 +91,10 @@ class Genetic():
         population = []
 
         while(len(population) < population_size):
-            child = self._create_random_child()
-            if self.is_valid_child(child):
-                population.append(child)
+            children = [self._create_random_child()
+                        for _ in range(population_size - len(population))]
+            valid = self.is_valid_population(children)
+            population += [child for child, keep in zip(children, valid) if keep]
 
         return population
 
@@ -58,12 +105,48 @@ class Genetic():
         # test that the sections fit the aerofoils
         return True
 
+    def is_valid_population(self, population: List[Child]) -> np.ndarray:
+        """
+        checks every child of a population at once, so invalid designs are
+        rejected before they are analysed. override to check a whole
+        population quicker than one child at a time
+        """
+        return np.array([self.is_valid_child(child) for child in population],
+                        dtype = bool)
+
+    def evaluate_population(self, population: List[Child]):
+        """
+        finds the fitness of every child not yet evaluated, storing it on
+        the child. children in the cache are not evaluated again, and
+        children with the same inputs are evaluated once
+        """
+        waiting = {}
+        for child in population:
+            if child.fitness is not None:
+                continue
+            key = self.cache.key(child.inputs)
+            if key in waiting:
+                self.cache.hits += 1
+                waiting[key].append(child)
+                continue
+            child.fitness = self.cache.get(child.inputs)
+            if child.fitness is None:
+                waiting[key] = [child]
+
+        children = [same[0] for same in waiting.values()]
+        fitnesses = self.evaluator.evaluate(self.fitness, children)
+        for same, fitness in zip(waiting.values(), fitnesses):
+            self.cache.put(same[0].inputs, fitness)
+            for child in same:
+                child.fitness = fitness
+
     def filter_population(self, population: List[Child]) -> List[Child]:
         """
         filters the population on how well they perform
         """
         half_size = int(0.5 * len(population))
-        population.sort(key = lambda x: self.fitness(x))
+        self.evaluate_population(population)
+        population.sort(key = lambda x: x.fitness)
         best_children = population[0: half_size]
         return best_children
 
@@ -75,7 +158,7 @@ class Genetic():
         for key, value in kwargs.items():
             constraint = self.schema[key] # assume schema contains keys in input dict
             delta = 0.01 * (constraint.max - constraint.min)
-            sign = random.choice([1, -1])
+            sign = self.random.choice([1, -1])
             new_value = value + sign * delta
             #enforce schema constraints
             new_dict[key] = self._confine(new_value, constraint.min, constraint.max)
@@ -91,38 +174,294 @@ class Genetic():
             value = max
         return value
 
+    def generations(self, population: List[Child],
+                    max_generations: int = None,
+                    start: int = 0) -> Iterator[Generation]:
+        """
+        evaluates a population and breeds the next from its best half,
+        yielding each generation as it is evaluated. only the current
+        population is held, so a run of any length uses the same memory
+
+        inputs:
+            population: first population of the run
+            max_generations: generations to run up to, forever if None
+            start: number of the first generation
+        """
+        number = start
+        while max_generations is None or number < max_generations:
+            self.evaluate_population(population)
+            yield Generation(number, population)
+            number += 1
+            if max_generations is not None and number >= max_generations:
+                break
+            best_children = self.filter_population(population)
+            population = self.generate_next_population(best_children)
+
+    def run(self, population_size: int, max_generations: int,
+            sink: Callable[[dict], None] = None, checkpoint: str = None,
+            checkpoint_every: int = 1) -> List[Child]:
+        """
+        runs from a random population, keeping the best children found and
+        the last HISTORY generations in history, and passing the summary of
+        each generation to sink as it finishes
+
+        inputs:
+            checkpoint: file the state of the run is saved to, for resume
+            checkpoint_every: generations between checkpoints
+
+        returns:
+            the ELITES best children of the run, best first
+        """
+        self.history = collections.deque(maxlen = self.HISTORY)
+        self.elites = []
+        population = self.generate_initial_population(population_size)
+        return self._run(self.generations(population, max_generations),
+                         sink, checkpoint, checkpoint_every)
+
+    def resume(self, checkpoint: str, max_generations: int,
+               sink: Callable[[dict], None] = None,
+               checkpoint_every: int = 1) -> List[Child]:
+        """
+        continues a run from its checkpoint file, breeding the same children
+        it would have if it had not stopped, and checkpointing to the same
+        file
+
+        returns:
+            the ELITES best children of the run, best first
+        """
+        generation = self.load_checkpoint(checkpoint)
+        generations = self.generations(generation.population, max_generations,
+                                       generation.number)
+        # the checkpointed generation was recorded before the run stopped
+        next(generations, None)
+        return self._run(generations, sink, checkpoint, checkpoint_every)
+
+    def _run(self, generations: Iterator[Generation], sink, checkpoint,
+             checkpoint_every) -> List[Child]:
+        for generation in generations:
+            self.history.append(generation)
+            self.elites = self._best(self.elites + generation.population,
+                                     self.ELITES)
+            if sink is not None:
+                sink(generation.summary())
+            if checkpoint is not None and \
+                    (generation.number + 1) % checkpoint_every == 0:
+                self.save_checkpoint(checkpoint, generation)
+        return self.elites
+
+    def checkpoint_state(self, generation: Generation) -> dict:
+        """
+        everything needed to carry on a run after a generation, extended by
+        subclasses with state of their own
+        """
+        return {"generation": generation,
+                "random": self.random.getstate(),
+                "cache": self.cache,
+                "duplicates": self.duplicates,
+                "history": list(self.history),
+                "elites": self.elites}
+
+    def restore_state(self, state: dict) -> Generation:
+        """
+        sets the state saved by checkpoint_state
+
+        returns:
+            the generation the run carries on from
+        """
+        self.random.setstate(state["random"])
+        self.cache = state["cache"]
+        self.duplicates = state["duplicates"]
+        self.history = collections.deque(state["history"], maxlen = self.HISTORY)
+        self.elites = state["elites"]
+        return state["generation"]
+
+    def save_checkpoint(self, path: str, generation: Generation):
+        """
+        writes the state of the run after a generation to a compressed file,
+        replacing the last checkpoint only once it is written
+        """
+        temp_path = path + ".tmp"
+        with gzip.open(temp_path, "wb") as f:
+            pickle.dump(self.checkpoint_state(generation), f,
+                        protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def load_checkpoint(self, path: str) -> Generation:
+        """
+        restores the state of a run from a checkpoint file
+
+        returns:
+            the generation the checkpoint was saved after
+        """
+        with gzip.open(path, "rb") as f:
+            return self.restore_state(pickle.load(f))
+
+    def _best(self, children: List[Child], number: int) -> List[Child]:
+        """
+        the number fittest children, each once
+        """
+        unique = {id(child): child for child in children}.values()
+        return sorted(unique, key = lambda child: child.fitness)[:number]
+
+    def steady_state(self, population_size: int, evaluations: int,
+                     concurrency: int = None,
+                     sink: Callable[[dict], None] = None) -> List[Child]:
+        """
+        asynchronous run without generations. a new child is bred by
+        tournament from the evaluated pool and submitted as soon as any
+        evaluation finishes, so no worker waits for the slowest child of a
+        generation. each evaluated child joins the pool, which then drops
+        its worst child. a failed evaluation is submitted again alongside
+        the others, rather than waited for
+
+        inputs:
+            population_size: children kept in the pool
+            evaluations: children evaluated in the whole run
+            concurrency: children evaluated at once, population_size by
+                default, best set to the number of workers
+            sink: given a summary of the pool every population_size
+                evaluations
+
+        returns:
+            the ELITES best children of the run, best first
+        """
+        if concurrency is None:
+            concurrency = population_size
+        self.elites = []
+        pool = []
+        pending = {}
+        in_flight = set()
+
+        def submit(child, attempt = 0):
+            future = self.evaluator.submit(self.fitness, child)
+            pending[future] = (child, attempt)
+            in_flight.add(self.cache.key(child.inputs))
+
+        first = self.generate_initial_population(min(concurrency, evaluations))
+        for child in first:
+            submit(child)
+        submitted, evaluated = len(first), 0
+
+        while pending:
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                child, attempt = pending.pop(future)
+                try:
+                    child.fitness = future.result()
+                except Exception as error:
+                    self.evaluator.failed(error, future)
+                    if attempt < self.evaluator.retries:
+                        submit(child, attempt + 1)
+                        continue
+                    self.evaluator.failures += 1
+                    child.fitness = self.evaluator.failure_fitness
+                self.cache.put(child.inputs, child.fitness)
+                in_flight.discard(self.cache.key(child.inputs))
+                evaluated += 1
+                pool = self._best(pool + [child], population_size)
+                if sink is not None and evaluated % population_size == 0:
+                    sink(Generation(evaluated // population_size - 1,
+                                    pool).summary())
+                if submitted < evaluations:
+                    submit(self.steady_state_child(pool, in_flight))
+                    submitted += 1
+
+        self.elites = self._best(pool, self.ELITES)
+        return self.elites
+
+    def tournament(self, pool: List[Child]) -> Child:
+        """
+        the fittest of TOURNAMENT_SIZE children picked at random from the pool
+        """
+        entrants = self.random.sample(pool, min(self.TOURNAMENT_SIZE, len(pool)))
+        return min(entrants, key = lambda child: child.fitness)
+
+    def steady_state_child(self, pool: List[Child], in_flight = ()) -> Child:
+        """
+        a valid child of two tournament winners, not already evaluated or
+        being evaluated, or a random child while the pool is too small to
+        breed from
+
+        inputs:
+            in_flight: cache keys of the children being evaluated
+        """
+        if len(pool) >= 2:
+            for _ in range(self.BREEDING_ATTEMPTS):
+                child = self.child_from_parents(self.tournament(pool),
+                                                self.tournament(pool))
+                if child.inputs in self.cache or \
+                        self.cache.key(child.inputs) in in_flight:
+                    self.duplicates += 1
+                elif self.is_valid_population([child])[0]:
+                    return child
+        return self.generate_initial_population(1)[0]
+
     def run_genetic(self, initial_population: List[Child],
                           current_generation: int,
                           max_generations: int) -> List[Child]:
         """
-        takes an intial population and returns
-        """
-        children = initial_population
+        deprecated, use run or generations. runs from an initial population
+        keeping only the best children, as run does
 
-        if current_generation < max_generations - 1:
-            best_children = self.filter_population(initial_population)
-            next_population = self.generate_next_population(best_children)
-            children = children + self.run_genetic(next_population,
-                                                   current_generation + 1,
-                                                   max_generations)
-        return children
+        returns:
+            the ELITES best children of the run, best first
+        """
+        warnings.warn("run_genetic is deprecated, use run or generations",
+                      DeprecationWarning, stacklevel = 2)
+        self.history = collections.deque(maxlen = self.HISTORY)
+        self.elites = []
+        return self._run(self.generations(initial_population, max_generations,
+                                          current_generation),
+                         None, None, 1)
 
     def generate_next_population(self, population: List[Child]) -> List[Child]:
         """
         create a new population from the filtered population
         """
-        new_population = []
+        parents = []
         for i in range(len(population)):
 
             parent1 = population[i]
             parent2 = population[-i]
-            child = self.child_from_parents(parent1, parent2)
-            new_population.append(child)
-            child = self.child_from_parents(parent2, parent1)
-            new_population.append(child)
+            parents.append((parent1, parent2))
+            parents.append((parent2, parent1))
+
+        new_population = [self.child_from_parents(*pair) for pair in parents]
+        seen = {self.cache.key(parent.inputs) for parent in population}
+
+        # breed the children that fail the checks or match another child again
+        invalid = np.arange(len(new_population))
+        for _ in range(self.BREEDING_ATTEMPTS):
+            valid = self._keep([new_population[i] for i in invalid], seen)
+            invalid = invalid[~valid]
+            if not len(invalid):
+                break
+            for i in invalid:
+                new_population[i] = self.child_from_parents(*parents[i])
+        else:
+            valid = self._keep([new_population[i] for i in invalid], seen)
+            invalid = invalid[~valid]
+            replacements = self.generate_initial_population(len(invalid))
+            for i, child in zip(invalid, replacements):
+                new_population[i] = child
 
         return new_population
 
+    def _keep(self, children: List[Child], seen: set) -> np.ndarray:
+        """
+        true for valid children whose inputs differ from every other child
+        seen, adding the keys of the new children to seen
+        """
+        unique = np.ones(len(children), dtype = bool)
+        for i, child in enumerate(children):
+            key = self.cache.key(child.inputs)
+            if key in seen:
+                unique[i] = False
+                self.duplicates += 1
+            else:
+                seen.add(key)
+        return self.is_valid_population(children) & unique
+
     def _combine(self, dict1: Dict[str, float],
                        dict2: Dict[str, float]) -> Dict[str, float]:
         """
@@ -151,15 +490,22 @@ class Genetic():
         """
         new_child_dict = {}
         for constraint in self.schema:
-            val = random.uniform(constraint.min, constraint.max)
+            val = self.random.uniform(constraint.min, constraint.max)
             val = round(val, 4)
             new_child_dict[constraint.name] = val
 
         return Child(new_child_dict)
 
-    def __call__(self, generations = 10, store = False, display = False):
-        initial_population = self.generate_initial_population(generations)
-        return self.run_genetic(initial_population, 0, generations)
+    def __call__(self, generations = 10, store = False, display = False,
+                 sink: Callable[[dict], None] = None):
+        """
+        runs a population of generations children for generations
+        generations, keeping only the best children and last generations
+
+        returns:
+            the ELITES best children of the run, best first
+        """
+        return self.run(generations, generations, sink)
 
 
 class PlaneChild(Child):
@@ -168,6 +514,11 @@ class PlaneChild(Child):
 
 class AircraftGenetic(Genetic):
 
+    # least maximum thickness of each aerofoil, as a fraction of its cord
+    MINIMUM_THICKNESS = 0.02
+    # size of the battery and motor cubes
+    COMPONENT_SIZE = 0.1
+
     def fitness(self, child: Child):
         """
         give designs a value between 0 for best and 100 for worse
@@ -183,38 +534,25 @@ class AircraftGenetic(Genetic):
         surface = avl.Surface(name)
         surface.define_mesh(20, 30, 1.0, 1.0)
 
+        aerofoil_parameters = self.aerofoil_parameters(input_dict)
+
         cord1 = input_dict["cord_1"]
         section1 = avl.Section(cord1)
-        thickness = input_dict["aerofoil_1_thickness"]
-        section1.aerofoil = aerofoil.Aerofoil.develop_aerofoil(thickness,
-                                                               -1 * thickness,
-                                                               input_dict["aerofoil_1_thickness"],
-                                                               input_dict["aerofoil_1_thickness_loc"],
-                                                               input_dict["aerofoil_1_camber"])
+        section1.aerofoil = aerofoil.Aerofoil.develop_aerofoil(*aerofoil_parameters[0])
 
         cord2 = input_dict["cord_2"]
         section2 = avl.Section(cord2)
         section2.twist_angle = input_dict["twist_angle_2"]
         wing_shift_1 = input_dict["wing_shift_1"]
         section2.translation_bias(cord1  - cord2 - wing_shift_1, input_dict["span_section_1"], 0)
-        thickness = input_dict["aerofoil_2_thickness"]
-        section2.aerofoil = aerofoil.Aerofoil.develop_aerofoil(thickness,
-                                                               -1 * thickness,
-                                                               input_dict["aerofoil_2_thickness"],
-                                                               input_dict["aerofoil_2_thickness_loc"],
-                                                               input_dict["aerofoil_2_camber"])
+        section2.aerofoil = aerofoil.Aerofoil.develop_aerofoil(*aerofoil_parameters[1])
 
         cord3 = input_dict["cord_3"]
         section3 = avl.Section(cord3)
         section3.twist_angle = input_dict["twist_angle_3"]
         wing_shift_2 = input_dict["wing_shift_2"]
         section3.translation_bias(cord1 - cord3 - wing_shift_1 - wing_shift_2, input_dict["span_section_2"], 0)
-        thickness = input_dict["aerofoil_3_thickness"]
-        section3.aerofoil = aerofoil.Aerofoil.develop_aerofoil(thickness,
-                                                               -1 * thickness,
-                                                               input_dict["aerofoil_3_camber"],
-                                                               input_dict["aerofoil_3_thickness_loc"],
-                                                               input_dict["aerofoil_3_camber"])
+        section3.aerofoil = aerofoil.Aerofoil.develop_aerofoil(*aerofoil_parameters[2])
 
         control_surface = avl.ControlSurface("elevator", input_dict["elevator_size"], [0, 1, 0], avl.ControlDeflectionType.SYMMETRIC)
         surface.add_section(section1, section2, section3)
@@ -237,17 +575,58 @@ class AircraftGenetic(Genetic):
         arrangement = layout.Arrangement("plane arrangement", battery, motor, structural_model, structural_clone)
 
         # create case file -----------------------------------------------------
-        case = avl.TrimCase(surface.area * 2, velocity = 22,
-                            mass = arrangement.total_mass)
+        case = avl.TrimCase.from_arrangement(surface.area * 2, arrangement,
+                                             velocity = 22)
 
         return surface, case, arrangement
 
+    def aerofoil_parameters(self, input_dict):
+        """
+        the Aerofoil.develop_aerofoil parameters of the three sections
+        """
+        parameters = []
+        for number in (1, 2, 3):
+            thickness = input_dict[f"aerofoil_{number}_thickness"]
+            camber = input_dict[f"aerofoil_{number}_camber"]
+            # the tip section is built with its camber as its thickness
+            middle_thickness = thickness if number != 3 else camber
+            parameters.append([thickness, -1 * thickness, middle_thickness,
+                               input_dict[f"aerofoil_{number}_thickness_loc"],
+                               camber])
+        return parameters
+
+    def battery_box(self, input_dict):
+        """
+        x and z extent of the battery in the root aerofoil, relative to the
+        root cord, as x_min, x_max, y_min, y_max
+        """
+        cord = input_dict["cord_1"]
+        x_min = input_dict["battery_x_loc"]
+        size = self.COMPONENT_SIZE / cord
+        return [x_min, x_min + size, -0.5 * size, 0.5 * size]
+
     def is_valid_child(self, child: Child):
         """
         checks the child created
         """
-        # test that the sections fit the aerofoils
-        return True
+        return bool(self.is_valid_population([child])[0])
+
+    def is_valid_population(self, population: List[Child]) -> np.ndarray:
+        """
+        checks the aerofoils of every child at once, that they are closed,
+        do not cross themselves, are thick enough and the battery fits in
+        the root section
+        """
+        if not population:
+            return np.zeros(0, dtype = bool)
+        parameters = np.array([self.aerofoil_parameters(child.inputs)
+                               for child in population]).reshape(-1, 5)
+        family = AerofoilFamily.from_parameters(parameters)
+        valid = family.is_valid(self.MINIMUM_THICKNESS).reshape(-1, 3).all(axis = 1)
+
+        roots = family[::3]
+        boxes = np.array([self.battery_box(child.inputs) for child in population])
+        return valid & roots.fits(boxes)
 
     def analyse(self, child: Child):
         # create temporary folder
@@ -261,12 +640,12 @@ class AircraftGenetic(Genetic):
         layout.create_mass_file(mass_file, arrangement, case)
         avl_input, aerofoil_files = surface.dump_avl_inputs(temp_folder)
 
-        avl_runner = avl.AVLRunner()
-        avl_runner.setup_analysis(avl_file,
-                                  mass,
-                                  case,
-                                  *aero)
-        results = avl_runner.generate_results(self.results_dir)
+        with avl.AVLRunner() as avl_runner:
+            avl_runner.setup_analysis(avl_file,
+                                      mass,
+                                      case,
+                                      *aero)
+            results = avl_runner.generate_results(self.results_dir)
         # delete temporary folder
         shutil.rmtree(temp_folder)
 